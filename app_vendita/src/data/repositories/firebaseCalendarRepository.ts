@@ -17,6 +17,7 @@ import { CalendarEntry } from '../models/CalendarEntry';
 import { User } from '../models/User';
 import { SalesPoint } from '../models/SalesPoint';
 import { PriceReference } from '../models/PriceReference';
+import { exposeTestHook } from '../../utils/testHooks';
 
 export class FirebaseCalendarRepository {
   private readonly COLLECTIONS = {
@@ -382,4 +383,7 @@ export class FirebaseCalendarRepository {
       throw error;
     }
   }
-} 
\ No newline at end of file
+}
+
+// Usata dal benchmark di import Excel del harness (solo build di sviluppo/test)
+exposeTestHook('FirebaseCalendarRepository', FirebaseCalendarRepository);
@@ -6,6 +6,7 @@ import { SalesPoint } from '../models/SalesPoint';
 import { PriceReference } from '../models/PriceReference';
 import { ExcelRow } from '../models/ExcelData';
 import { MasterDataRow } from '../models/MasterData';
+import { exposeTestHook } from '../../utils/testHooks';
 
 export class FirebaseCalendarRepositoryAdapter implements CalendarRepository {
   private firebaseRepository: FirebaseCalendarRepository;
@@ -405,4 +406,7 @@ export class FirebaseCalendarRepositoryAdapter implements CalendarRepository {
   async clearMasterData(): Promise<void> {
     throw new Error('Master data non supportato in Firebase');
   }
-} 
\ No newline at end of file
+} 
+
+// Usato dal rig della chat del harness, stesso percorso di scrittura di TooltipManagement (solo build di sviluppo/test)
+exposeTestHook('FirebaseCalendarRepositoryAdapter', FirebaseCalendarRepositoryAdapter);
@@ -212,6 +212,7 @@ function CustomCalendarCell({
       onPress={() => { if (!disabled) handleCellPress(); }}
       activeOpacity={0.7}
       accessibilityLabel={isWeekView ? getWeekTooltip() : getMonthTooltip()}
+      testID={`calendar-cell-${date}`}
     >
       {/* Vista Settimanale - Struttura a 4 parti */}
       {isWeekView ? (
@@ -240,6 +241,7 @@ function CustomCalendarCell({
               }}
               activeOpacity={0.7}
               hitSlop={{ top: 5, bottom: 5, left: 5, right: 5 }}
+              testID={`calendar-cell-${date}-add`}
             >
               <Text style={styles.addButtonText}>+</Text>
             </TouchableOpacity>
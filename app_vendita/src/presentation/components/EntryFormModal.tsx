@@ -326,6 +326,7 @@ export default function EntryFormModal({
             onPress={handleClose}
             accessibilityLabel="Chiudi"
             accessibilityHint="Chiudi il modal"
+            testID="entry-form-close"
           >
             <Text style={styles.closeButtonText}>✕</Text>
           </SafeTouchableOpacity>
@@ -340,6 +341,7 @@ export default function EntryFormModal({
               onPress={handleDelete}
               accessibilityLabel="Elimina"
               accessibilityHint="Elimina questo entry"
+              testID="entry-form-delete"
             >
               <Text style={styles.deleteButtonText}>🗑️</Text>
             </SafeTouchableOpacity>
@@ -527,6 +529,7 @@ export default function EntryFormModal({
             onPress={handleCancel}
             accessibilityLabel="Annulla"
             accessibilityHint="Annulla le modifiche e chiudi"
+            testID="entry-form-cancel"
           >
             <Text style={styles.cancelButtonText}>Annulla</Text>
           </SafeTouchableOpacity>
@@ -540,6 +543,7 @@ export default function EntryFormModal({
             disabled={isFirebaseLoading}
             accessibilityLabel="Salva"
             accessibilityHint="Salva le modifiche"
+            testID="entry-form-save"
           >
             <Text style={styles.saveButtonText}>
               {isFirebaseLoading ? 'Salvando...' : 'Salva'}
@@ -307,6 +307,7 @@ function FilterComponents({
               <SafeTouchableOpacity
                 style={styles.mobileResetButton}
                 onPress={handleReset}
+                testID="filter-modal-reset"
               >
                 <Text style={styles.mobileResetButtonText}>🔄 Reset</Text>
               </SafeTouchableOpacity>
@@ -324,6 +325,7 @@ function FilterComponents({
                     activeTab === tab && styles.mobileActiveTab
                   ]}
                   onPress={() => handleTabChange(tab)}
+                  testID={`filter-modal-tab-${tab}`}
                 >
                   <Text style={styles.mobileTabIcon}>{getTabIcon(tab)}</Text>
                   <Text style={[
@@ -341,6 +343,7 @@ function FilterComponents({
           <View style={styles.mobileControls}>
             <TextInput
               style={styles.mobileSearchInput}
+              testID="filter-modal-search"
               placeholder="Cerca..."
               value={searchText}
               onChangeText={handleSearchChange}
@@ -406,6 +409,7 @@ function FilterComponents({
               <SafeTouchableOpacity
                 style={styles.mobileCancelButton}
                 onPress={handleClose}
+                testID="filter-modal-cancel"
               >
                 <Text style={styles.mobileCancelButtonText}>❌ Annulla</Text>
               </SafeTouchableOpacity>
@@ -413,6 +417,7 @@ function FilterComponents({
               <SafeTouchableOpacity
                 style={styles.mobileConfirmButton}
                 onPress={handleConfirm}
+                testID="filter-modal-confirm"
               >
                 <Text style={styles.mobileConfirmButtonText}>✅ Conferma</Text>
               </SafeTouchableOpacity>
@@ -434,6 +439,7 @@ function FilterComponents({
             style={styles.resetButton}
             onPress={handleReset}
             accessibilityLabel="Reset filtri"
+            testID="filter-modal-reset"
             accessibilityHint="Rimuovi tutti i filtri applicati"
           >
             <Text style={styles.resetButtonText}>🔄 Reset</Text>
@@ -445,6 +451,7 @@ function FilterComponents({
               onPress={onClose}
               accessibilityLabel="Chiudi"
               accessibilityHint="Chiudi i filtri"
+              testID="filter-modal-close"
             >
               <Text style={styles.closeButtonText}>✕</Text>
             </SafeTouchableOpacity>
@@ -465,6 +472,7 @@ function FilterComponents({
               onPress={() => handleTabChange(tab)}
               accessibilityLabel={`Tab ${getTabTitle(tab)}`}
               accessibilityHint={`Seleziona il tab ${getTabTitle(tab)}`}
+              testID={`filter-modal-tab-${tab}`}
             >
               <Text style={styles.tabIcon}>{getTabIcon(tab)}</Text>
               <Text style={[
@@ -483,6 +491,7 @@ function FilterComponents({
         <View style={styles.searchContainer}>
           <TextInput
             style={styles.searchInput}
+            testID="filter-modal-search"
             placeholder="Cerca..."
             value={searchText}
             onChangeText={handleSearchChange}
@@ -562,6 +571,7 @@ function FilterComponents({
           <SafeTouchableOpacity
             style={styles.cancelButton}
             onPress={handleClose}
+            testID="filter-modal-cancel"
           >
             <Text style={styles.cancelButtonText}>❌ Annulla</Text>
           </SafeTouchableOpacity>
@@ -569,6 +579,7 @@ function FilterComponents({
           <SafeTouchableOpacity
             style={styles.confirmButton}
             onPress={handleConfirm}
+            testID="filter-modal-confirm"
           >
             <Text style={styles.confirmButtonText}>✅ Conferma</Text>
           </SafeTouchableOpacity>
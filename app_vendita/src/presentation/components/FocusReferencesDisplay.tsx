@@ -100,7 +100,7 @@ export const FocusReferencesDisplay: React.FC<FocusReferencesDisplayProps> = Rea
           const acronym = createAcronym(reference.description || '', reference.code);
 
           return (
-            <View key={focusData.referenceId} style={[
+            <View key={focusData.referenceId} testID={`cell-focus-${reference.code}`} style={[
               styles.focusReferenceItem,
               isWeekView && styles.focusReferenceItemWeek,
               { borderColor: getBorderColor(soldPieces, stockPieces) }
@@ -112,14 +112,14 @@ export const FocusReferencesDisplay: React.FC<FocusReferencesDisplayProps> = Rea
                 ]}>{acronym}</Text>
               </View>
               <View style={styles.focusReferenceNumbers}>
-                <Text style={[
+                <Text testID="cell-focus-sold" style={[
                   styles.focusReferenceSold, 
                   soldPieces > 0 && styles.focusReferenceSoldActive,
                   isWeekView && styles.focusReferenceTextWeek
                 ]}>
                   V: {soldPieces}
                 </Text>
-                <Text style={[
+                <Text testID="cell-focus-stock" style={[
                   styles.focusReferenceStock, 
                   stockPieces > 0 && styles.focusReferenceStockActive,
                   isWeekView && styles.focusReferenceTextWeek
@@ -172,7 +172,7 @@ export const FocusReferencesDisplay: React.FC<FocusReferencesDisplayProps> = Rea
         const acronym = createAcronym(reference.description || '', reference.code);
 
         return (
-          <View key={productEntry.productId} style={[
+          <View key={productEntry.productId} testID={`cell-focus-${reference.code}`} style={[
             styles.focusReferenceItem,
             { borderColor: getBorderColor(soldPieces, stockPieces) }
           ]}>
@@ -180,10 +180,10 @@ export const FocusReferencesDisplay: React.FC<FocusReferencesDisplayProps> = Rea
               <Text style={styles.focusReferenceAcronym}>{acronym}</Text>
             </View>
             <View style={styles.focusReferenceNumbers}>
-              <Text style={[styles.focusReferenceSold, soldPieces > 0 && styles.focusReferenceSoldActive]}>
+              <Text testID="cell-focus-sold" style={[styles.focusReferenceSold, soldPieces > 0 && styles.focusReferenceSoldActive]}>
                 V: {soldPieces}
               </Text>
-              <Text style={[styles.focusReferenceStock, stockPieces > 0 && styles.focusReferenceStockActive]}>
+              <Text testID="cell-focus-stock" style={[styles.focusReferenceStock, stockPieces > 0 && styles.focusReferenceStockActive]}>
                 S: {stockPieces}
               </Text>
             </View>
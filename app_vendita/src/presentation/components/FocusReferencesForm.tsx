@@ -242,6 +242,7 @@ const FocusReferencesForm: React.FC<FocusReferencesFormProps> = ({
                                  <TextInput
                   style={styles.inputCell}
                   value={data.orderedPieces}
+                  testID={`focus-ref-ordered-${reference.code}`}
                   onChangeText={(text) => {
                     // Filtra solo numeri e punto decimale, no negativi
                     const filteredText = text.replace(/[^0-9.]/g, '').replace(/(\..*?)\./g, '$1');
@@ -261,6 +262,7 @@ const FocusReferencesForm: React.FC<FocusReferencesFormProps> = ({
                 <TextInput
                   style={styles.inputCell}
                   value={data.soldPieces}
+                  testID={`focus-ref-sold-${reference.code}`}
                   onChangeText={(text) => {
                     // Filtra solo numeri e punto decimale, no negativi
                     const filteredText = text.replace(/[^0-9.]/g, '').replace(/(\..*?)\./g, '$1');
@@ -4,7 +4,7 @@ import { Colors } from '../../constants/Colors';
 
 const InitialLoadingScreen: React.FC = () => {
   return (
-    <View style={styles.container}>
+    <View style={styles.container} testID="initial-loading-screen">
       <View style={styles.brandCard}>
         <Text style={styles.title}>Calendario Vendite</Text>
         <Text style={styles.subtitle}>Preparazione ambiente…</Text>
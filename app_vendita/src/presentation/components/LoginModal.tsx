@@ -127,6 +127,7 @@ export const LoginModal: React.FC<LoginModalProps> = ({
           <TextInput
             style={styles.input}
             placeholder="Email"
+            testID="login-email"
             value={email}
             onChangeText={setEmail}
             keyboardType="email-address"
@@ -137,6 +138,7 @@ export const LoginModal: React.FC<LoginModalProps> = ({
           <TextInput
             style={styles.input}
             placeholder="Password"
+            testID="login-password"
             value={password}
             onChangeText={setPassword}
             secureTextEntry
@@ -147,6 +149,7 @@ export const LoginModal: React.FC<LoginModalProps> = ({
             style={[styles.button, isLoading && styles.buttonDisabled]}
             onPress={handleLogin}
             disabled={isLoading}
+            testID="login-submit"
           >
             {isLoading ? (
               <ActivityIndicator color={Colors.white} />
@@ -178,6 +181,7 @@ export const LoginModal: React.FC<LoginModalProps> = ({
           <SafeTouchableOpacity
             style={styles.cancelButton}
             onPress={onClose}
+            testID="login-cancel"
           >
             <Text style={styles.cancelText}>Annulla</Text>
           </SafeTouchableOpacity>
@@ -32,18 +32,18 @@ export const SalesAndActionsDisplay: React.FC<SalesAndActionsDisplayProps> = Rea
         {totalSales > 0 && (
           <View style={styles.salesSection}>
             <View style={styles.salesTag}>
-              <Text style={styles.salesTagText}>€{totalSales}</Text>
+              <Text style={styles.salesTagText} testID="cell-sales-total">€{totalSales}</Text>
             </View>
-            <Text style={styles.salesCount}>{entry?.sales.length || 0} vendite</Text>
+            <Text style={styles.salesCount} testID="cell-sales-count">{entry?.sales.length || 0} vendite</Text>
           </View>
         )}
 
         {totalActions > 0 && (
           <View style={styles.actionsSection}>
             <View style={styles.actionsTag}>
-              <Text style={styles.actionsTagText}>{totalActions}</Text>
+              <Text style={styles.actionsTagText} testID="cell-actions-total">{totalActions}</Text>
             </View>
-            <Text style={styles.actionsCount}>{entry?.actions.length || 0} tipi</Text>
+            <Text style={styles.actionsCount} testID="cell-actions-count">{entry?.actions.length || 0} tipi</Text>
           </View>
         )}
       </View>
@@ -54,12 +54,12 @@ export const SalesAndActionsDisplay: React.FC<SalesAndActionsDisplayProps> = Rea
   return (
     <View style={styles.monthIndicator}>
       {totalSales > 0 && (
-        <View style={styles.monthSalesDot}>
+        <View style={styles.monthSalesDot} testID="cell-sales-dot">
           <Text style={styles.monthSalesText}>€</Text>
         </View>
       )}
       {totalActions > 0 && (
-        <View style={styles.monthActionsDot}>
+        <View style={styles.monthActionsDot} testID="cell-actions-dot">
           <Text style={styles.monthActionsText}>⚡</Text>
         </View>
       )}
@@ -53,7 +53,7 @@ export const Tag: React.FC<TagProps> = ({
   ];
 
   const TagContent = (
-    <View style={containerStyle}>
+    <View style={containerStyle} testID={`tag-${tag.id}`}>
       {config.fontSize > 0 && <Text style={textStyle}>{tag.acronym}</Text>}
     </View>
   );
@@ -33,6 +33,7 @@ export default function MainTabNavigator() {
         name="Calendario"
         component={MainCalendarPage}
         options={{
+          tabBarTestID: 'tab-calendario',
           tabBarIcon: ({ color, size }) => (
             <Text style={{ color, fontSize: size * 0.7 }}>📅</Text>
           ),
@@ -43,6 +44,7 @@ export default function MainTabNavigator() {
         name="Classifica"
         component={LeaderboardPage}
         options={{
+          tabBarTestID: 'tab-classifica',
           tabBarIcon: ({ color, size }) => (
             <Text style={{ color, fontSize: size * 0.7 }}>🏆</Text>
           ),
@@ -52,6 +54,7 @@ export default function MainTabNavigator() {
         name="Impostazioni"
         component={SettingsPage}
         options={{
+          tabBarTestID: 'tab-impostazioni',
           tabBarIcon: ({ color, size }) => (
             <Text style={{ color, fontSize: size * 0.7 }}>⚙️</Text>
           ),
@@ -51,6 +51,7 @@ export const LoginPage: React.FC<LoginPageProps> = ({ onLoginSuccess }) => {
           <SafeTouchableOpacity
             style={styles.loginButton}
             onPress={handleShowLogin}
+            testID="login-open"
           >
             <Text style={styles.loginButtonText}>Accedi o Registrati</Text>
           </SafeTouchableOpacity>
@@ -1383,6 +1383,7 @@ export default function MainCalendarPage({
                   setCalendarView('week');
                 }}
                 accessibilityLabel="Vista Settimanale"
+                testID="calendar-view-week"
                 accessibilityHint="Passa alla vista settimanale per gestione dettagliata"
               >
                 <Text style={styles.viewButtonPastelText}>
@@ -1399,6 +1400,7 @@ export default function MainCalendarPage({
                   setCalendarView('month');
                 }}
                 accessibilityLabel="Vista Mensile"
+                testID="calendar-view-month"
                 accessibilityHint="Passa alla vista mensile per riepilogo organizzazione"
               >
                 <Text style={styles.viewButtonPastelText}>
@@ -1416,6 +1418,7 @@ export default function MainCalendarPage({
                 }}
                 accessibilityLabel="Filtri"
                 accessibilityHint="Apri i filtri per personalizzare la vista"
+                testID="calendar-filters-open"
               >
                 <Text style={styles.filterButtonPastelText}>🔍</Text>
               </TouchableOpacity>
@@ -1458,6 +1461,7 @@ export default function MainCalendarPage({
                 setCurrentDate(new Date());
               }}
               accessibilityLabel="Oggi"
+              testID="calendar-today"
               accessibilityHint="Torna rapidamente alla data odierna"
             >
               <Text style={styles.todayPillText}>Oggi</Text>
@@ -7,6 +7,7 @@ import { useProgressiveCalculation } from '../../hooks/useProgressiveCalculation
 import { ProgressiveCalculationService } from '../../services/ProgressiveCalculationService';
 import { useCalendarStore } from '../../stores/calendarStore';
 import { logger } from '../../utils/logger';
+import { exposeTestHook } from '../../utils/testHooks';
 import { useBatchedState, useStatePerformanceMonitor } from '../../hooks/useBatchedState';
 
 // Manteniamo le stesse interfacce per compatibilità
@@ -76,6 +77,11 @@ export function CalendarProvider({ children }: CalendarProviderProps) {
   // Crea un'istanza condivisa del servizio progressivo
   const [sharedProgressiveService] = useState(() => new ProgressiveCalculationService());
 
+  // Nei test il harness importa lo stato progressivo con importState
+  useEffect(() => {
+    exposeTestHook('progressiveService', sharedProgressiveService);
+  }, [sharedProgressiveService]);
+
   // Batch state per ottimizzare re-render
   const [providerState, updateProviderState] = useBatchedState({
     lastInitialization: 0,
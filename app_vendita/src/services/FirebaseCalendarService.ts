@@ -6,6 +6,7 @@ import { PriceReference } from '../data/models/PriceReference';
 import { useCalendarStore } from '../stores/calendarStore';
 import { logger } from '../utils/logger';
 import { NetworkErrorHandler } from '../utils/networkErrorHandler';
+import { exposeTestHook } from '../utils/testHooks';
 
 export class FirebaseCalendarService {
   private repository: FirebaseCalendarRepository;
@@ -342,4 +343,7 @@ export class FirebaseCalendarService {
 }
 
 // Istanza singleton del servizio
-export const firebaseCalendarService = new FirebaseCalendarService(); 
\ No newline at end of file
+export const firebaseCalendarService = new FirebaseCalendarService();
+
+// Usato dal harness offline/sync, come fonte di FirebaseSyncIndicator (solo build di sviluppo/test)
+exposeTestHook('firebaseCalendarService', firebaseCalendarService);
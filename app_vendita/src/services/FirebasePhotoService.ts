@@ -10,6 +10,7 @@ import {
 } from 'firebase/firestore';
 import { db } from '../core/services/firebase';
 import { PhotoMetadata } from '../utils/cameraConfig';
+import { exposeTestHook } from '../utils/testHooks';
 
 /**
  * Servizio Firebase per gestire foto con Firestore + base64
@@ -146,4 +147,7 @@ export class FirebasePhotoService {
       return 0;
     }
   }
-}
\ No newline at end of file
+}
+
+// Usato dal benchmark foto del harness (solo build di sviluppo/test)
+exposeTestHook('FirebasePhotoService', FirebasePhotoService);
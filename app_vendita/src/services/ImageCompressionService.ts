@@ -1,6 +1,8 @@
 import { manipulateAsync, SaveFormat } from 'expo-image-manipulator';
 import * as ImagePicker from 'expo-image-picker';
 import { getCameraConfig } from '../utils/cameraConfig';
+import { performanceMonitor } from '../utils/performanceMonitor';
+import { exposeTestHook } from '../utils/testHooks';
 
 /**
  * Servizio per compressione e ottimizzazione immagini
@@ -24,31 +26,43 @@ export class ImageCompressionService {
       
       const config = getCameraConfig();
       
+      const details = { width: asset.width, height: asset.height, fileSize: asset.fileSize || 0 };
+
       // Ridimensiona e comprimi l'immagine principale
-      const compressed = await manipulateAsync(
-        asset.uri,
-        [
-          // Ridimensiona mantenendo proporzioni (max 800px sul lato più lungo)
-          { resize: this.calculateResize(asset.width, asset.height, 800) }
-        ],
-        {
-          compress: config.COMPRESS_QUALITY,
-          format: SaveFormat.JPEG,
-          base64: true
-        }
+      const compressed = await performanceMonitor.measureTimeAsync(
+        'image_compress',
+        () => manipulateAsync(
+          asset.uri,
+          [
+            // Ridimensiona mantenendo proporzioni (max 800px sul lato più lungo)
+            { resize: this.calculateResize(asset.width, asset.height, 800) }
+          ],
+          {
+            compress: config.COMPRESS_QUALITY,
+            format: SaveFormat.JPEG,
+            base64: true
+          }
+        ),
+        'user',
+        details
       );
 
       // Crea thumbnail 60x60
-      const thumbnail = await manipulateAsync(
-        asset.uri,
-        [
-          { resize: { width: 60, height: 60 } }
-        ],
-        {
-          compress: 0.6,
-          format: SaveFormat.JPEG,
-          base64: true
-        }
+      const thumbnail = await performanceMonitor.measureTimeAsync(
+        'image_thumbnail',
+        () => manipulateAsync(
+          asset.uri,
+          [
+            { resize: { width: 60, height: 60 } }
+          ],
+          {
+            compress: 0.6,
+            format: SaveFormat.JPEG,
+            base64: true
+          }
+        ),
+        'user',
+        details
       );
 
       if (!compressed.base64 || !thumbnail.base64) {
@@ -126,4 +140,7 @@ export class ImageCompressionService {
       isGoodCompression: ratio < 50
     };
   }
-}
\ No newline at end of file
+}
+
+// Usato dal benchmark foto del harness (solo build di sviluppo/test)
+exposeTestHook('ImageCompressionService', ImageCompressionService);
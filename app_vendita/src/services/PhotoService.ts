@@ -13,6 +13,7 @@ import {
 } from '../utils/cameraConfig';
 import { IS_WEB, IS_MOBILE } from '../utils/platformConfig';
 import { ImageCompressionService } from './ImageCompressionService';
+import { exposeTestHook } from '../utils/testHooks';
 
 /**
  * Servizio per gestire foto con metadati completi
@@ -376,4 +377,7 @@ export class PhotoService {
       );
     });
   }
-}
\ No newline at end of file
+}
+
+// Usato dal benchmark foto del harness (solo build di sviluppo/test)
+exposeTestHook('PhotoService', PhotoService);
@@ -5,6 +5,7 @@ import { User } from '../data/models/User';
 import { SalesPoint } from '../data/models/SalesPoint';
 import { createStorageAdapter } from '../utils/storageAdapter';
 import { getTagById } from '../constants/Tags';
+import { exposeTestHook } from '../utils/testHooks';
 
 // Utility per logging condizionale (placeholder per futuri debug)
 
@@ -279,4 +280,7 @@ export const useCalendarStore = create<CalendarState>()(
       }),
     }
   )
-); 
\ No newline at end of file
+);
+
+// Leggibile dai test end-to-end (solo build di sviluppo/test)
+exposeTestHook('calendarStore', useCalendarStore);
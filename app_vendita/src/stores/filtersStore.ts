@@ -2,6 +2,7 @@ import { create } from 'zustand';
 import { persist } from 'zustand/middleware';
 import { useMasterDataStore } from './masterDataStore';
 import { createStorageAdapter } from '../utils/storageAdapter';
+import { exposeTestHook } from '../utils/testHooks';
 
 
 
@@ -144,4 +145,7 @@ export const useFiltersStore = create<FiltersState>()(
       }), // Solo dati da persistere
     }
   )
-); 
\ No newline at end of file
+);
+
+// Leggibile dai test end-to-end (solo build di sviluppo/test)
+exposeTestHook('filtersStore', useFiltersStore);
@@ -1,6 +1,7 @@
 import { create } from 'zustand';
 import { getFirestore, doc, getDoc, setDoc } from 'firebase/firestore';
 import listinoData from '../../listino_luglio25.json';
+import { exposeTestHook } from '../utils/testHooks';
 
 // Interfaccia per i dati del listino
 export interface ListinoItem {
@@ -284,4 +285,7 @@ export const useFocusReferencesStore = create<FocusReferencesState>((set, get) =
       throw error;
     }
   },
-})); 
\ No newline at end of file
+}));
+
+// Leggibile dai test end-to-end (solo build di sviluppo/test)
+exposeTestHook('focusReferencesStore', useFocusReferencesStore);
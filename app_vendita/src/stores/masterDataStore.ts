@@ -1,6 +1,7 @@
 import { create } from 'zustand';
 import { persist } from 'zustand/middleware';
 import { MasterDataRow, MasterDataFilters } from '../data/models/MasterData';
+import { exposeTestHook } from '../utils/testHooks';
 
 // Utility per logging condizionale
 const devLog = (message: string, ...args: any[]) => {
@@ -280,4 +281,7 @@ export const useMasterDataStore = create<MasterDataState>()(
       }),
     }
   )
-); 
\ No newline at end of file
+);
+
+// Leggibile dai test end-to-end (solo build di sviluppo/test)
+exposeTestHook('masterDataStore', useMasterDataStore);
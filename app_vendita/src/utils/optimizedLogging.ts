@@ -8,6 +8,7 @@
  */
 
 import { logger } from './logger';
+import { exposeTestHook } from './testHooks';
 
 // Cache globale per throttling
 const logThrottleCache = new Map<string, number>();
@@ -206,3 +207,11 @@ export const throttledLog = OptimizedLogger.throttledLog;
 export const conditionalLog = OptimizedLogger.conditionalLog;
 export const performanceLog = OptimizedLogger.performanceLog;
 export const aggregatedLog = OptimizedLogger.aggregatedLog;
+
+// Nei test il harness verifica throttling e crescita delle cache
+exposeTestHook('optimizedLogging', {
+  OptimizedLogger,
+  throttleCache: logThrottleCache,
+  LOG_THROTTLE_MS,
+  MAX_CACHE_SIZE,
+});
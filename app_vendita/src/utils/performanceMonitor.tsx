@@ -7,6 +7,7 @@
 
 import React from 'react';
 import { logger } from './logger';
+import { TEST_HOOKS_ENABLED, exposeTestHook } from './testHooks';
 
 export interface PerformanceMetric {
   name: string;
@@ -38,6 +39,7 @@ class PerformanceMonitor {
   private componentMetrics = new Map<string, ComponentRenderMetric>();
   private isEnabled: boolean = __DEV__;
   private maxMetrics = 1000; // Limita memoria utilizzata
+  private recordedCount = 0; // Metriche registrate dall'avvio, anche se scartate
   private memoryCheckInterval?: NodeJS.Timeout;
   
   constructor() {
@@ -81,6 +83,7 @@ class PerformanceMonitor {
     };
 
     this.metrics.push(metric);
+    this.recordedCount += 1;
 
     // Mantieni solo le metriche più recenti
     if (this.metrics.length > this.maxMetrics) {
@@ -297,6 +300,27 @@ class PerformanceMonitor {
     };
   }
 
+  /**
+   * Esporta solo le metriche registrate dopo `cursor`.
+   *
+   * Il cursore conta tutte le metriche dall'avvio, quindi chi legge
+   * periodicamente non perde dati quando il buffer supera maxMetrics;
+   * `dropped` indica quante metriche sono uscite dal buffer prima della lettura.
+   */
+  exportMetricsSince(cursor: number): {
+    metrics: PerformanceMetric[];
+    cursor: number;
+    dropped: number;
+  } {
+    const firstAvailable = this.recordedCount - this.metrics.length;
+    const start = Math.max(cursor, firstAvailable);
+    return {
+      metrics: this.metrics.slice(start - firstAvailable),
+      cursor: this.recordedCount,
+      dropped: Math.max(0, Math.min(start, this.recordedCount) - cursor),
+    };
+  }
+
   /**
    * Pulisce tutte le metriche
    */
@@ -377,6 +401,12 @@ class PerformanceMonitor {
 // Istanza singleton del monitor
 export const performanceMonitor = new PerformanceMonitor();
 
+// Nei test end-to-end il monitor è sempre attivo e leggibile dal harness
+if (TEST_HOOKS_ENABLED) {
+  performanceMonitor.setEnabled(true);
+  exposeTestHook('performanceMonitor', performanceMonitor);
+}
+
 /**
  * HOC per monitorare performance di componenti React
  */
@@ -0,0 +1,28 @@
+/**
+ * Hook per i test end-to-end
+ *
+ * Il harness Playwright imposta `window.__APP_TEST_HOOKS__ = true` prima del
+ * caricamento dell'app. Solo in build di sviluppo o di test
+ * (EXPO_PUBLIC_TEST_HOOKS=true) i servizi interni vengono esposti su
+ * `window.__appTestHooks`, così i test possono leggerli con un solo
+ * page.evaluate.
+ */
+
+const isTestBuild = (): boolean =>
+  __DEV__ || process.env.EXPO_PUBLIC_TEST_HOOKS === 'true';
+
+export const TEST_HOOKS_ENABLED: boolean =
+  typeof window !== 'undefined' &&
+  !!(window as any).__APP_TEST_HOOKS__ &&
+  isTestBuild();
+
+/**
+ * Espone un oggetto ai test con il nome indicato (no-op fuori dai test)
+ */
+export function exposeTestHook(name: string, value: unknown): void {
+  if (!TEST_HOOKS_ENABLED) return;
+
+  const w = window as any;
+  w.__appTestHooks = w.__appTestHooks || {};
+  w.__appTestHooks[name] = value;
+}
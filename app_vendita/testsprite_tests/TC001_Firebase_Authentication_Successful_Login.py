@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,13 +48,13 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click the 'Accedi o Registrati' button to go to the login page.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click the login button to attempt login.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -67,7 +68,7 @@ async def run_test():
         # Assert that the page title is 'Calendario' indicating successful login and redirection to main calendar.
         assert await page.locator('text=Calendario').is_visible()
         # Assert that the login screen is not shown after app restart by checking absence of login button or login page elements.
-        login_button = await page.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').count()
+        login_button = await page.locator(selector('login.submit')).count()  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         assert login_button == 0, 'Login button should not be visible after session persistence'
         await asyncio.sleep(5)
     
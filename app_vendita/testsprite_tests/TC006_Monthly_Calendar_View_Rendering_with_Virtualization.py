@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,13 +48,13 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' button to proceed to login or registration.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Accedi' button to submit login form and access the app.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,19 +48,19 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' to proceed to login or registration.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click the 'Accedi' button to log in.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on the '+' button on the current day (August 7) to open the form to add a new calendar entry.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[6]/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=6)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[6]/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -75,24 +76,24 @@ async def run_test():
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Open the form again for the same date and input invalid data (e.g. negative sales value) to test validation error messages and submission blocking.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[6]/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=6)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[6]/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Input invalid data such as a negative sales value in the 'Ordinato (PZ)' field for the first product and attempt to submit the form to verify validation error messages and submission blocking.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input').nth(0)
+        elem = frame.locator(selector('entry_form.ordered_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input
         await page.wait_for_timeout(3000); await elem.fill('-5')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
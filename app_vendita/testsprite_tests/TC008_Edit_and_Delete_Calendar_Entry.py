@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,59 +48,59 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' button to proceed to login or registration.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click the 'Accedi' button to log in.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Select an existing calendar entry to edit.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[4]').nth(0)
+        elem = frame.locator(selector('calendar.day', index=4)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Try selecting a different calendar entry or use the '+' button next to entries to open the edit interface.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=1)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Modify sales or order details and save the changes.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[3]/div[5]/input').nth(0)
+        elem = frame.locator(selector('entry_form.ordered_row', index=2)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[3]/div[5]/input
         await page.wait_for_timeout(3000); await elem.fill('25')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[3]/div[6]/input').nth(0)
+        elem = frame.locator(selector('entry_form.sold_row', index=2)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[3]/div[6]/input
         await page.wait_for_timeout(3000); await elem.fill('12')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Delete the modified calendar entry and confirm deletion.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[4]/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=4)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[4]/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click the 'Elimina' button to initiate deletion and confirm the prompt.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div/div[3]').nth(0)
+        elem = frame.locator(selector('entry_form.delete')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click the 'Elimina' button to initiate deletion and observe if a confirmation prompt appears.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div/div[3]').nth(0)
+        elem = frame.locator(selector('entry_form.delete')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
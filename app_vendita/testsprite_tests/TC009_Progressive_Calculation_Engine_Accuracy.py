@@ -1,5 +1,7 @@
 import asyncio
 from playwright import async_api
+from harness.calendar_grid import extract_grid
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,67 +49,67 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' button to proceed to login or registration.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Accedi' button to login with provided credentials.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on the entry for August 4 (earliest date visible) to modify it.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=1)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Modify the 'Ordinato (PZ)' value for the first product (Codice 3032437) from 10 to 20 and save the changes.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input').nth(0)
+        elem = frame.locator(selector('entry_form.sold_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input
         await page.wait_for_timeout(3000); await elem.fill('20')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on the '+' button on August 10 to add new entries for bulk insertion.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[7]/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=7)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[7]/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Modify 'Ordinato (PZ)' values for multiple products on August 10 to simulate bulk entry insertion and then save.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input').nth(0)
+        elem = frame.locator(selector('entry_form.ordered_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input
         await page.wait_for_timeout(3000); await elem.fill('10')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[3]/div[5]/input').nth(0)
+        elem = frame.locator(selector('entry_form.ordered_row', index=2)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[3]/div[5]/input
         await page.wait_for_timeout(3000); await elem.fill('5')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[4]/div[5]/input').nth(0)
+        elem = frame.locator(selector('entry_form.ordered_row', index=3)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[4]/div[5]/input
         await page.wait_for_timeout(3000); await elem.fill('8')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[5]/div[5]/input').nth(0)
+        elem = frame.locator(selector('entry_form.ordered_row', index=4)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[5]/div[5]/input
         await page.wait_for_timeout(3000); await elem.fill('12')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[6]/div[5]/input').nth(0)
+        elem = frame.locator(selector('entry_form.ordered_row', index=5)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[6]/div[5]/input
         await page.wait_for_timeout(3000); await elem.fill('15')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -121,7 +123,7 @@ async def run_test():
 
         # Navigate to 'Tag Test' tab to continue testing advanced filters and other features.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[2]').nth(0)
+        elem = frame.locator(selector('tabs.leaderboard')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -139,47 +141,30 @@ async def run_test():
 
         # Navigate to 'Calendario Vendite' tab to simulate error scenarios in calendar entry modifications.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a').nth(0)
+        elem = frame.locator(selector('tabs.calendar')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on the '+' button on August 7 to modify an entry and simulate an error scenario by entering invalid data.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[4]/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=4)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[4]/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Assertion: Verify sales metrics update progressively and correctly for all subsequent entries after modifying an earlier entry
         frame = context.pages[-1]
-        # Extract sales data for days 4 to 8 to verify progressive update
-        sales_data = {}
-        for day in range(4, 9):
-            day_str = str(day)
-            locator = frame.locator(f"xpath=//div[contains(text(), '{day_str}')]/following-sibling::div[contains(@class, 'sales_data')]//span")
-            # Assuming sales data spans multiple spans, extract text and convert to int
-            sales_values = await locator.all_text_contents()
-            # Convert sales values to int, fallback to 0 if empty
-            sales_values_int = [int(val) if val.isdigit() else 0 for val in sales_values]
-            sales_data[day_str] = sales_values_int
-        # Check that sales data for day 4 is baseline (unchanged or expected)
-        assert sales_data['4'][1] == 0  # S metric baseline
-        # Check that sales data for day 5 and onwards reflect progressive updates
-        assert sales_data['5'][1] >= sales_data['4'][1]
-        assert sales_data['6'][1] >= sales_data['5'][1]
-        assert sales_data['7'][1] >= sales_data['6'][1]
-        assert sales_data['8'][1] >= sales_data['7'][1]
+        # Read the whole calendar grid in one round-trip instead of one locator per day
+        grid = await extract_grid(frame)
+        # Check that the stock (S) for day 4 is baseline (unchanged or expected)
+        assert grid.day(4).stock_total == 0  # S metric baseline
+        # Check that day 5 and onwards reflect progressive updates
+        for prev, cell in zip(grid.days(4, 7), grid.days(5, 8)):
+            assert cell.stock_total >= prev.stock_total
         # Assertion: Verify batch updates complete without data inconsistencies or performance degradation
-        # Extract sales data for days 10 to 13 after bulk insertion
-        batch_sales_data = {}
-        for day in range(10, 14):
-            day_str = str(day)
-            locator = frame.locator(f"xpath=//div[contains(text(), '{day_str}')]/following-sibling::div[contains(@class, 'sales_data')]//span")
-            sales_values = await locator.all_text_contents()
-            sales_values_int = [int(val) if val.isdigit() else 0 for val in sales_values]
-            batch_sales_data[day_str] = sales_values_int
-        # Check that batch sales data is consistent and non-zero for bulk inserted days
-        for day in range(10, 14):
-            assert all(val >= 0 for val in batch_sales_data[str(day)])
+        # Check that batch sales data is consistent and non-negative for bulk inserted days
+        for cell in grid.days(10, 13):
+            assert all(f.sold >= 0 and f.stock >= 0 for f in cell.focus)
+            assert (cell.sales_total or 0) >= 0
         # Optionally, check UI responsiveness or performance metrics if available
         # This can be done by measuring response times or checking for loading indicators
         # Here we just assert that the page is still visible and interactive
@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,35 +48,35 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' to proceed to login.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Accedi' button to login.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Open filters panel by clicking the filter icon.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Select multiple agents, sales points, and products from the filter options.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div[4]').nth(0)
+        elem = frame.locator(selector('filter_modal.tab', tab='agente')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div[5]').nth(0)
+        elem = frame.locator(selector('filter_modal.tab', tab='insegna')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div[5]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div').nth(0)
+        elem = frame.locator(selector('filter_modal.tab', tab='linea')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -86,13 +87,13 @@ async def run_test():
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div').nth(0)
+        elem = frame.locator(selector('filter_modal.cancel')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Reopen the Linea filter, select multiple options, and confirm the selection to apply filters.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -103,13 +104,13 @@ async def run_test():
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div').nth(0)
+        elem = frame.locator(selector('filter_modal.cancel')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Open filters panel by clicking the filter icon to start multi-selection filter application.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -120,7 +121,7 @@ async def run_test():
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div').nth(0)
+        elem = frame.locator(selector('filter_modal.cancel')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,13 +48,13 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' to proceed to login or registration.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Accedi' button to log in.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -65,28 +66,28 @@ async def run_test():
 
         # Click on the '+' button to add a new calendar entry for offline editing test.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=1)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Edit some fields in the entry form to simulate local changes before going offline.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input').nth(0)
+        elem = frame.locator(selector('entry_form.ordered_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input
         await page.wait_for_timeout(3000); await elem.fill('25')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input').nth(0)
+        elem = frame.locator(selector('entry_form.sold_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input
         await page.wait_for_timeout(3000); await elem.fill('12')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[3]/div[5]/input').nth(0)
+        elem = frame.locator(selector('entry_form.ordered_row', index=2)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[3]/div[5]/input
         await page.wait_for_timeout(3000); await elem.fill('18')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,25 +48,25 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' button to proceed to login or registration.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Accedi' button to login.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on a '+' button to open the interface for adding a new calendar entry, which should include media upload options.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=1)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Close the current modification dialog and click the 📷 camera icon next to a calendar entry to open the media upload interface.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div/div').nth(0)
+        elem = frame.locator(selector('entry_form.close')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div/div
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
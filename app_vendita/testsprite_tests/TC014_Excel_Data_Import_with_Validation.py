@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,19 +48,19 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' button to proceed to login or registration.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click the 'Accedi' button to log in.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Navigate to 'Impostazioni' (Settings) to find Excel import options.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[3]').nth(0)
+        elem = frame.locator(selector('tabs.settings')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
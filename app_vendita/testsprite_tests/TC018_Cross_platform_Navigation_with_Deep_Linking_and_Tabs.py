@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,25 +48,25 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' button to proceed to login/authentication.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Accedi' button to submit login form and proceed to app main interface.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Tag Test' tab to verify tab switching and state persistence.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[2]').nth(0)
+        elem = frame.locator(selector('tabs.leaderboard')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Calendario' tab to verify tab switching and state persistence on web platform.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a').nth(0)
+        elem = frame.locator(selector('tabs.calendar')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -75,7 +76,7 @@ async def run_test():
 
         # Click on 'Tag Test' tab to verify tab switching and state persistence on iOS platform.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -87,13 +88,13 @@ async def run_test():
 
         # Click on 'Tag Test' tab (index 50) to verify tab switching and state persistence on iOS platform.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[2]').nth(0)
+        elem = frame.locator(selector('tabs.leaderboard')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Impostazioni' tab (index 31) to verify tab switching and state persistence on iOS platform.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[3]').nth(0)
+        elem = frame.locator(selector('tabs.settings')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -103,13 +104,13 @@ async def run_test():
 
         # Click on 'Tag Test' tab (index 50) to verify tab switching and state persistence on Android platform.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[2]').nth(0)
+        elem = frame.locator(selector('tabs.leaderboard')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Impostazioni' tab (index 31) to verify tab switching and state persistence on Android platform.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[3]').nth(0)
+        elem = frame.locator(selector('tabs.settings')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -123,9 +124,9 @@ async def run_test():
 
         # Assert tab navigation and state persistence on web platform
         frame = context.pages[-1]
-        calendario_tab = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a')
-        tag_test_tab = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[2]')
-        impostazioni_tab = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[3]')
+        calendario_tab = frame.locator(selector('tabs.calendar'))  # xpath=html/body/div/div/div/div[2]/div[2]/a
+        tag_test_tab = frame.locator(selector('tabs.leaderboard'))  # xpath=html/body/div/div/div/div[2]/div[2]/a[2]
+        impostazioni_tab = frame.locator(selector('tabs.settings'))  # xpath=html/body/div/div/div/div[2]/div[2]/a[3]
         await expect(calendario_tab).to_have_text('Calendario')
         await expect(tag_test_tab).to_have_text('Tag Test')
         await expect(impostazioni_tab).to_have_text('Impostazioni')
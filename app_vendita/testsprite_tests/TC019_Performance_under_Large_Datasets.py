@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,13 +48,13 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' button to proceed to login.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Accedi' button to login.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -65,7 +66,7 @@ async def run_test():
 
         # Attempt to load a large dataset by interacting with available UI elements or filters to simulate thousands of calendar entries.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -76,13 +77,13 @@ async def run_test():
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div').nth(0)
+        elem = frame.locator(selector('filter_modal.cancel')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Reopen the filter modal and apply multiple filters without canceling to load a large dataset for performance testing.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -93,13 +94,13 @@ async def run_test():
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div').nth(0)
+        elem = frame.locator(selector('filter_modal.cancel')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on the 'Filtri' (Filters) button to open the advanced filter modal and apply filters to simulate loading a large dataset.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -110,7 +111,7 @@ async def run_test():
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div').nth(0)
+        elem = frame.locator(selector('filter_modal.cancel')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -122,7 +123,7 @@ async def run_test():
 
         # Open the advanced filter modal to apply filters and load a large dataset with thousands of calendar entries for performance testing.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -133,19 +134,19 @@ async def run_test():
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div').nth(0)
+        elem = frame.locator(selector('filter_modal.cancel')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Select multiple filters in the advanced filter modal and confirm to load a large dataset for performance testing.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day', index=2)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click the 'Salva' button to confirm filter selection and load the large dataset for performance testing.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -1,5 +1,7 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
+from harness.store_probe import StoreProbe
 
 async def run_test():
     pw = None
@@ -23,6 +25,9 @@ async def run_test():
         
         # Create a new browser context (like an incognito window)
         context = await browser.new_context()
+        # Diff the Zustand stores in the page between steps
+        stores = StoreProbe()
+        await stores.attach(context)
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
@@ -47,19 +52,20 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' button to proceed to login or registration.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Accedi' button to login with provided credentials.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Filtri' (Filters) to modify filters first.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        await stores.step(page, "logged in")  # baseline
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -70,46 +76,59 @@ async def run_test():
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div/div').nth(0)
+        elem = frame.locator(selector('filter_modal.cancel')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div/div
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # Cancelling the modal must leave the filter store untouched
+        (await stores.step(page, "cancel filters")).assert_unchanged("filtersStore", "masterDataStore")
         
 
         # Click on 'Filtri' button (index 3) to reopen filter modal and modify filters again.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click 'Conferma' button (index 14) to apply the filter changes.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div[2]').nth(0)
+        elem = frame.locator(selector('filter_modal.confirm')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Reload the app or page to verify that the filter changes persist and UI updates accordingly.
         await page.goto('http://localhost:8081/', timeout=10000)
+        await page.wait_for_timeout(3000)
+        await stores.step(page, "reload")  # new page, new baseline
         
 
         # Click on a calendar entry to modify it, then save changes and verify persistence after reload.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=1)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Modify 'Ordinato (PZ)' for the first product to 25 and 'Venduto (PZ)' to 15, then click 'Salva' button (index 35) to save changes.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input').nth(0)
+        elem = frame.locator(selector('entry_form.ordered_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input
         await page.wait_for_timeout(3000); await elem.fill('25')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input').nth(0)
+        elem = frame.locator(selector('entry_form.sold_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input
         await page.wait_for_timeout(3000); await elem.fill('15')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # Saving one entry touches exactly one calendar entry and no master data
+        await page.wait_for_timeout(1000)
+        saved = await stores.step(page, "save entry")
+        saved.assert_unchanged("masterDataStore", "filtersStore")
+        entries = saved.get("calendarStore", "entries")
+        assert entries is not None, "Saving the entry did not update calendarStore.entries"
+        assert entries.added + entries.changed == 1 and entries.removed == 0, (
+            f"Expected one entry to be written, got +{entries.added} ~{entries.changed} -{entries.removed}"
+        )
         
 
         # Click on 'Gestione Stock' button (index 8) to modify master data.
@@ -132,14 +151,14 @@ async def run_test():
 
         # Assert that the filter changes persist after app reload by checking the filter UI state remains consistent.
         frame = context.pages[-1]
-        filter_confirm_button = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div[2]').nth(0)
+        filter_confirm_button = frame.locator(selector('filter_modal.confirm')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div[2]
         assert await filter_confirm_button.is_visible(), 'Filter confirm button should be visible indicating filters are applied and persisted'
           
         # Assert that the calendar entry modifications persist after reload by checking the updated values.
-        calendar_entry = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]').nth(0)
+        calendar_entry = frame.locator(selector('calendar.day_add', index=1)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]
         assert await calendar_entry.is_visible(), 'Calendar entry should be visible after reload'
-        ord_input = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input').nth(0)
-        vend_input = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input').nth(0)
+        ord_input = frame.locator(selector('entry_form.ordered_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input
+        vend_input = frame.locator(selector('entry_form.sold_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input
         ord_value = await ord_input.input_value()
         vend_value = await vend_input.input_value()
         assert ord_value == '25', f"Expected 'Ordinato (PZ)' to be '25' but got {ord_value}"
@@ -154,6 +173,7 @@ async def run_test():
         assert await images_tab.is_visible(), 'Images tab should be visible for photo upload and management'
         uploaded_photos_text = await frame.locator('text=No photos uploaded for this day').text_content()
         assert 'No photos uploaded for this day' in uploaded_photos_text, 'Expected no photos uploaded message to be present'
+        print(stores.report())
         await asyncio.sleep(5)
     
     finally:
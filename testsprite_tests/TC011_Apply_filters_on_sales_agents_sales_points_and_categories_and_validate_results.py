@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,43 +48,43 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' to proceed to login or registration page
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Accedi' button to login
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on the filter controls section to open filter options
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on the 'Agente' tab to select filter by sales agent
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div[4]').nth(0)
+        elem = frame.locator(selector('filter_modal.tab', tab='agente')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Conferma' button to apply the sales agent filter
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div[2]').nth(0)
+        elem = frame.locator(selector('filter_modal.confirm')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on filter controls to open filter modal and add filter by sales point
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on the 'Insegna' tab to select filter by sales point
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div[5]').nth(0)
+        elem = frame.locator(selector('filter_modal.tab', tab='insegna')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div[5]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -100,7 +101,7 @@ async def run_test():
 
         # Click on 'Conferma' button to apply combined filters and verify filtered entries
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div[2]').nth(0)
+        elem = frame.locator(selector('filter_modal.confirm')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
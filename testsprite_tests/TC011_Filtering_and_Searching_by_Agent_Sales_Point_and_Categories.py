@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,30 +48,30 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' to proceed to login.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Accedi' button to login.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Open filtering panel by clicking the filter icon.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Select filters for agents, sales points, and categories and then apply filters by clicking 'Conferma'.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div[4]').nth(0)
+        elem = frame.locator(selector('filter_modal.tab', tab='agente')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div[5]').nth(0)
+        elem = frame.locator(selector('filter_modal.tab', tab='insegna')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[2]/div/div[5]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -81,7 +82,7 @@ async def run_test():
 
         # Click 'Conferma' to apply the selected filters and verify the filtered calendar data.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div[2]').nth(0)
+        elem = frame.locator(selector('filter_modal.confirm')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
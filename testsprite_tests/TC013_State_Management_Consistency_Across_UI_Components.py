@@ -1,5 +1,17 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
+from harness.store_probe import StoreProbe
+
+
+def assert_one_entry_written(diff):
+    """Saving the entry form writes exactly one calendar entry and nothing else."""
+    diff.assert_unchanged("masterDataStore", "filtersStore")
+    entries = diff.get("calendarStore", "entries")
+    assert entries is not None, f"{diff.label}: calendarStore.entries did not change"
+    assert entries.added + entries.changed == 1 and entries.removed == 0, (
+        f"{diff.label}: expected one entry written, got +{entries.added} ~{entries.changed} -{entries.removed}"
+    )
 
 async def run_test():
     pw = None
@@ -23,6 +35,9 @@ async def run_test():
         
         # Create a new browser context (like an incognito window)
         context = await browser.new_context()
+        # Diff the Zustand stores in the page between steps
+        stores = StoreProbe()
+        await stores.attach(context)
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
@@ -47,48 +62,56 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' to go to login page
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Accedi' button to login
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on a day cell to add or modify a calendar entry to trigger state change
+        await stores.step(page, "logged in")  # baseline
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[6]').nth(0)
+        elem = frame.locator(selector('calendar.day', index=6)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div[6]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Input new values into 'Ordinato (PZ)' and 'Venduto (PZ)' fields for the first product and save the changes
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input').nth(0)
+        elem = frame.locator(selector('entry_form.ordered_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input
         await page.wait_for_timeout(3000); await elem.fill('5')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input').nth(0)
+        elem = frame.locator(selector('entry_form.sold_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input
         await page.wait_for_timeout(3000); await elem.fill('3')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
+        # Typing in the form is local state: no calendar entry is written before saving
+        typed = await stores.step(page, "first entry typed")
+        assert typed.get("calendarStore", "entries") is None, "calendarStore.entries changed before saving"
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await page.wait_for_timeout(1000)
+        assert_one_entry_written(await stores.step(page, "first entry saved"))
         
 
         # Test another state change in a different component (e.g., filter selection) and verify related components update correctly
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]').nth(0)
+        elem = frame.locator(selector('calendar.filters_open')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click the 'Conferma' button (index 14) to apply the selected filter and trigger state update
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div[2]').nth(0)
+        elem = frame.locator(selector('filter_modal.confirm')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]/div[5]/div[2]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # Applying filters must not rewrite calendar entries or master data
+        (await stores.step(page, "filters applied")).assert_unchanged("calendarStore", "masterDataStore")
         
 
         # Click on a different day cell (e.g., August 7, 2025) to add or modify a calendar entry and verify related components update correctly
@@ -99,22 +122,29 @@ async def run_test():
 
         # Input new values into 'Ordinato (PZ)' and 'Venduto (PZ)' fields for the first product and save the changes
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input').nth(0)
+        elem = frame.locator(selector('entry_form.ordered_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input
         await page.wait_for_timeout(3000); await elem.fill('7')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input').nth(0)
+        elem = frame.locator(selector('entry_form.sold_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input
         await page.wait_for_timeout(3000); await elem.fill('4')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
+        # Typing in the form is local state: no calendar entry is written before saving
+        typed = await stores.step(page, "second entry typed")
+        assert typed.get("calendarStore", "entries") is None, "calendarStore.entries changed before saving"
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await page.wait_for_timeout(1000)
+        assert_one_entry_written(await stores.step(page, "second entry saved"))
         
 
         # Perform a page refresh to check if the updated state appears after reload, then verify the calendar day cell and summary widgets for updated values
         await page.goto('http://localhost:8081/', timeout=10000)
+        await page.wait_for_timeout(3000)
+        await stores.step(page, "reload")  # new page, new baseline
         
 
         # Complete the test by validating that all related UI components reflect the updated state immediately without inconsistencies and finalize the task.
@@ -123,7 +153,11 @@ async def run_test():
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
-        assert False, 'Generic failure assertion: Expected result unknown, marking test as failed.'
+        # The persisted calendar store still holds the saved entries after the reload
+        shape = await stores.shape(page)
+        assert shape.get("calendarStore", {}).get("entries", {}).get("len", 0) > 0, (
+            f"calendarStore.entries is empty after reload: {shape.get('calendarStore')}"
+        )
         await asyncio.sleep(5)
     
     finally:
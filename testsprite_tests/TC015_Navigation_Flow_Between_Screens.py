@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,37 +48,37 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' to open login form
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Accedi' button to login
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Switch from week view to month view
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.view_month')).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Tag Test' tab to navigate to account page
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[2]').nth(0)
+        elem = frame.locator(selector('tabs.leaderboard')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Navigate to settings page via tab navigation
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[3]').nth(0)
+        elem = frame.locator(selector('tabs.settings')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Navigate back to calendar page via tab navigation to verify state preservation
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a').nth(0)
+        elem = frame.locator(selector('tabs.calendar')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -86,7 +87,7 @@ async def run_test():
         assert await frame.locator('text=agosto 2025').is_visible()
         assert await frame.locator('text=Vista Mensile').is_visible()
         # Assert switching views changes calendar view appropriately
-        assert await frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[2]').is_visible()  # Month view button visible
+        assert await frame.locator(selector('calendar.view_month')).is_visible()  # Month view button visible  # xpath=html/body/div/div/div/div/div/div/div/div/div/div/div[2]/div[2]
         # Assert navigation to account page shows account info
         assert await frame.locator('text=demo@testsprite.com').is_visible()
         assert await frame.locator('text=Disconnetti da demo@testsprite.com').is_visible()
@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,90 +48,90 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' to navigate to the login or registration form.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Clear the email field to test empty required field validation.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/input').nth(0)
+        elem = frame.locator(selector('login.email')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/input
         await page.wait_for_timeout(3000); await elem.fill('')
         
 
         # Click the 'Accedi' button to attempt form submission with empty email field.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Enter an invalid email format in the email field and attempt to submit the form.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/input').nth(0)
+        elem = frame.locator(selector('login.email')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/input
         await page.wait_for_timeout(3000); await elem.fill('invalid-email-format')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Navigate to the create or update entry form to test validation of other input types.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[5]').nth(0)
+        elem = frame.locator(selector('login.cancel')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[5]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click 'Accedi o Registrati' to navigate back to login or registration options, then find and navigate to create or update entry form.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Navigate to the create or update entry form to test validation of other input types.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[5]').nth(0)
+        elem = frame.locator(selector('login.cancel')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[5]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click 'Accedi o Registrati' to navigate to login or registration options and find create or update entry form.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Navigate to the create or update entry form to test validation of other input types like dates and file uploads.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[5]').nth(0)
+        elem = frame.locator(selector('login.cancel')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[5]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click 'Accedi o Registrati' to navigate to login or registration options and find create or update entry form.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Navigate to the create or update entry form to test validation of other input types like dates and file uploads.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[5]').nth(0)
+        elem = frame.locator(selector('login.cancel')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[5]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click 'Accedi o Registrati' to navigate to login or registration options and find create or update entry form.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click 'Annulla' to close the login form and navigate to main page, then find and navigate to create or update entry form.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[5]').nth(0)
+        elem = frame.locator(selector('login.cancel')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[5]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click 'Accedi o Registrati' to navigate to login or registration options and find create or update entry form.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
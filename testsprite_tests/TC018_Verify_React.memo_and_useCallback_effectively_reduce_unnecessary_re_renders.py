@@ -1,5 +1,12 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
+from harness.render_counter import RenderCounter
+
+# Typing in the entry form must not re-render the calendar behind it.
+TYPING_BUDGETS = {"CustomCalendarCell": 0, "WeekCalendar": 0}
+# Saving an entry re-renders at most the edited day (plus one for the selection change).
+SAVE_BUDGETS = {"CustomCalendarCell": 2}
 
 async def run_test():
     pw = None
@@ -24,6 +31,9 @@ async def run_test():
         # Create a new browser context (like an incognito window)
         context = await browser.new_context()
         context.set_default_timeout(5000)
+        # Count React renders per component from before the app loads
+        renders = RenderCounter()
+        await renders.attach(context)
         
         # Open a new page in the browser context
         page = await context.new_page()
@@ -47,19 +57,19 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Click on 'Accedi o Registrati' to proceed to login or registration page.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Accedi' button to login.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Perform UI actions that update state repetitively to trigger re-renders and profile performance.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=1)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -71,13 +81,15 @@ async def run_test():
 
         # Use profiling tools to measure number of component re-renders and validate that memoized components do not re-render unnecessarily.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
+        await page.wait_for_timeout(3000)
+        async with renders.measure(page, "save entry", budgets=SAVE_BUDGETS):
+            await elem.click(timeout=5000)
         
 
         # Perform additional repetitive UI actions on calendar entries to trigger re-renders and profile component updates.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=1)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -93,23 +105,29 @@ async def run_test():
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('5')
+        elem = frame.locator(selector('entry_form.ordered_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input
+        await page.wait_for_timeout(3000)
+        async with renders.measure(page, "type ordered 5", budgets=TYPING_BUDGETS):
+            await elem.fill('5')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('5')
+        elem = frame.locator(selector('entry_form.sold_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input
+        await page.wait_for_timeout(3000)
+        async with renders.measure(page, "type sold 5", budgets=TYPING_BUDGETS):
+            await elem.fill('5')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
+        await page.wait_for_timeout(3000)
+        async with renders.measure(page, "save entry", budgets=SAVE_BUDGETS):
+            await elem.click(timeout=5000)
         
 
         # Perform UI actions that update state repetitively on calendar entries to trigger re-renders and profile rendering performance.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=1)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -125,23 +143,29 @@ async def run_test():
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('3')
+        elem = frame.locator(selector('entry_form.ordered_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input
+        await page.wait_for_timeout(3000)
+        async with renders.measure(page, "type ordered 3", budgets=TYPING_BUDGETS):
+            await elem.fill('3')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('3')
+        elem = frame.locator(selector('entry_form.sold_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input
+        await page.wait_for_timeout(3000)
+        async with renders.measure(page, "type sold 3", budgets=TYPING_BUDGETS):
+            await elem.fill('3')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
+        await page.wait_for_timeout(3000)
+        async with renders.measure(page, "save entry", budgets=SAVE_BUDGETS):
+            await elem.click(timeout=5000)
         
 
         # Perform UI actions that update state repetitively on calendar entries to trigger re-renders and profile rendering performance.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('calendar.day_add', index=1)).nth(0)  # xpath=html/body/div/div/div/div/div/div/div/div/div[2]/div/div[2]/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -157,35 +181,29 @@ async def run_test():
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('4')
+        elem = frame.locator(selector('entry_form.ordered_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[5]/input
+        await page.wait_for_timeout(3000)
+        async with renders.measure(page, "type ordered 4", budgets=TYPING_BUDGETS):
+            await elem.fill('4')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('4')
+        elem = frame.locator(selector('entry_form.sold_row', index=1)).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[2]/div/div[3]/div[2]/div[2]/div/div[2]/div[6]/input
+        await page.wait_for_timeout(3000)
+        async with renders.measure(page, "type sold 4", budgets=TYPING_BUDGETS):
+            await elem.fill('4')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = frame.locator(selector('entry_form.save')).nth(0)  # xpath=html/body/div[4]/div/div[2]/div/div/div/div[3]/div[2]
+        await page.wait_for_timeout(3000)
+        async with renders.measure(page, "save entry", budgets=SAVE_BUDGETS):
+            await elem.click(timeout=5000)
         
 
-        # Assertion: Validate that memoized components do not re-render unnecessarily by checking a performance indicator or render count element on the page.
-        # Since direct profiling tools are not accessible via Playwright, we check for UI indicators or logs that reflect render counts or performance metrics.
-        # Example: Check if a specific element that shows render count or performance score is present and within expected limits.
-        frame = context.pages[-1]
-        render_count_elem = frame.locator('xpath=//div[contains(text(), "render count") or contains(text(), "re-render")]')
-        assert await render_count_elem.count() <= 1, "Memoized components are re-rendering more than expected."
-        # Alternatively, check for a performance score element if available
-        performance_score_elem = frame.locator('xpath=//div[contains(text(), "performance score") or contains(text(), "profiling score")]')
-        if await performance_score_elem.count() > 0:
-            score_text = await performance_score_elem.inner_text()
-            score_value = int(''.join(filter(str.isdigit, score_text)))
-            assert 15 <= score_value <= 18, f"Performance score {score_value} is outside expected range 15-18."
-        # If no direct UI indicators, log a warning (could be replaced with actual profiling integration)
-        else:
-            print("Warning: No UI performance indicators found to validate memoization and re-renders.")
+        # Assertion: memoized components stayed within their render budgets for every measured interaction
+        # (RenderCounter.measure raises RenderBudgetExceeded with the offending components otherwise).
+        assert renders.interactions, "No interactions were measured."
         await asyncio.sleep(5)
     
     finally:
@@ -1,5 +1,6 @@
 import asyncio
 from playwright import async_api
+from harness.locators import selector
 
 async def run_test():
     pw = None
@@ -47,37 +48,37 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # Use tab navigation to switch between main sections
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[4]').nth(0)
+        elem = frame.locator(selector('login.open')).nth(0)  # xpath=html/body/div/div/div/div/div[4]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click 'Accedi' button to log in and access main app sections
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]').nth(0)
+        elem = frame.locator(selector('login.submit')).nth(0)  # xpath=html/body/div[3]/div/div[2]/div/div/div/div/div[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Tag Test' tab to switch view and validate navigation
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[2]').nth(0)
+        elem = frame.locator(selector('tabs.leaderboard')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Impostazioni' tab to switch view and validate navigation and content
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[3]').nth(0)
+        elem = frame.locator(selector('tabs.settings')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Calendario Vendite' tab to switch view and validate navigation and content
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a').nth(0)
+        elem = frame.locator(selector('tabs.calendar')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Trigger a deep link to open a specific calendar entry or tag detail page and verify correct navigation and content loading
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[2]').nth(0)
+        elem = frame.locator(selector('tabs.leaderboard')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a[2]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -87,7 +88,7 @@ async def run_test():
 
         # Click on 'Calendario Vendite' tab to switch view and validate navigation and content
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a').nth(0)
+        elem = frame.locator(selector('tabs.calendar')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -97,13 +98,13 @@ async def run_test():
 
         # Click on 'Impostazioni' tab to switch view and validate navigation and content after deep linking
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a[3]').nth(0)
+        elem = frame.locator(selector('tabs.settings')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a[3]
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # Click on 'Calendario Vendite' tab to switch view and validate navigation and content
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/a').nth(0)
+        elem = frame.locator(selector('tabs.calendar')).nth(0)  # xpath=html/body/div/div/div/div[2]/div[2]/a
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
@@ -0,0 +1 @@
+"""Execution harness around the generated TestSprite Playwright scripts."""
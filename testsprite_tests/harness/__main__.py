@@ -0,0 +1,176 @@
+"""Command line interface: ``python -m harness <command>``.
+
+Run from ``testsprite_tests/`` (or put it on ``PYTHONPATH``).
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from . import (
+    app_metrics,
+    config,
+    console_log,
+    dev_server,
+    flaky,
+    instrument,
+    network_profiles,
+    runner,
+    snapshots,
+    timeouts,
+)
+from .results import ResultsStore
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    dirs = [Path(d) for d in args.suite] if args.suite else list(config.SUITE_DIRS)
+    return runner.run_suite(
+        dirs,
+        pattern=args.pattern,
+        workers=args.workers,
+        quarantine_workers=args.quarantine_workers,
+        retries=args.retries,
+        adaptive_timeouts=not args.fixed_timeouts,
+        snapshot=snapshots.ensure(args.snapshot) if args.snapshot else None,
+        camera=args.fake_camera,
+        network=args.network,
+        serve=args.dev_server,
+    )
+
+
+def _cmd_flaky(args: argparse.Namespace) -> int:
+    with ResultsStore() as store:
+        if args.update:
+            flaky.update_quarantine(store, threshold=args.threshold)
+        sys.stdout.write(flaky.report(store, args.limit))
+    return 0
+
+
+def _cmd_timeouts(args: argparse.Namespace) -> int:
+    with ResultsStore() as store:
+        learned = timeouts.learn(store, q=args.percentile)
+    timeouts.save(learned)
+    sys.stdout.write(timeouts.report(learned, args.limit))
+    return 0
+
+
+def _cmd_heals(args: argparse.Namespace) -> int:
+    with ResultsStore() as store:
+        rows = store.heal_summary()
+    print("| Test | Selector | Healed selector | Heals | Avg score |")
+    print("|---|---|---|---|---|")
+    for row in rows[: args.limit]:
+        print(
+            f"| {row['test_id']} | `{row['selector']}` | `{row['healed_selector']}`"
+            f" | {row['heals']} | {row['score']:.2f} |"
+        )
+    return 0
+
+
+def _cmd_metrics(args: argparse.Namespace) -> int:
+    with ResultsStore() as store:
+        rows = store.app_metric_rows(args.test)
+        by_step = store.render_by_step(args.test)
+    sys.stdout.write(app_metrics.report(rows, by_step, args.limit))
+    return 0
+
+
+def _cmd_logs(args: argparse.Namespace) -> int:
+    with ResultsStore() as store:
+        sys.stdout.write(console_log.volume_report(store.log_volume_rows(args.test), args.limit))
+        if args.level:
+            print()
+            for row in store.log_lines(args.test, args.level)[-args.limit:]:
+                print(f"{row['test_id']} step {row['step_idx']} [{row['module'] or '-'}] {row['message']}")
+    return 0
+
+
+def _cmd_selfcheck(args: argparse.Namespace) -> int:
+    try:
+        selector = asyncio.run(instrument.check_selector_of())
+    except AssertionError as exc:
+        print(f"step keys broken: {exc}", file=sys.stderr)
+        return 1
+    print(f"locator steps are keyed by their selector ({selector})")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="harness")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run TestSprite scripts and record results")
+    run.add_argument("--suite", action="append", help="suite directory (repeatable)")
+    run.add_argument("--pattern", default="TC*.py")
+    run.add_argument("--workers", type=int, default=4)
+    run.add_argument("--quarantine-workers", type=int, default=2)
+    run.add_argument("--retries", type=int, default=1)
+    run.add_argument(
+        "--fixed-timeouts",
+        action="store_true",
+        help="keep the scripts' own timeouts instead of learned ones",
+    )
+    run.add_argument(
+        "--snapshot",
+        choices=sorted(snapshots.SNAPSHOTS),
+        help="start every browser context from this storage snapshot (built if missing)",
+    )
+    run.add_argument(
+        "--fake-camera",
+        action="store_true",
+        help="use a generated camera clip and grant/deny the camera per test",
+    )
+    run.add_argument(
+        "--network",
+        choices=sorted(network_profiles.PROFILES),
+        help="throttle every page with this network profile",
+    )
+    run.add_argument(
+        "--dev-server",
+        choices=dev_server.MODES,
+        default="auto",
+        help="attach to the Expo web server and wait for the bundle before testing; with the default"
+        " 'auto', runs 'npx expo start' when nothing answers on the BASE_URL port",
+    )
+    run.set_defaults(func=_cmd_run)
+
+    rep = sub.add_parser("flaky", help="flakiness scores and top flaky steps")
+    rep.add_argument("--limit", type=int, default=10)
+    rep.add_argument("--threshold", type=float, default=flaky.QUARANTINE_THRESHOLD)
+    rep.add_argument("--update", action="store_true", help="refresh quarantine first")
+    rep.set_defaults(func=_cmd_flaky)
+
+    tmo = sub.add_parser("timeouts", help="learn and show per-step timeouts")
+    tmo.add_argument("--percentile", type=float, default=timeouts.PERCENTILE)
+    tmo.add_argument("--limit", type=int, default=50)
+    tmo.set_defaults(func=_cmd_timeouts)
+
+    heal = sub.add_parser("heals", help="selectors healed from the fingerprint index")
+    heal.add_argument("--limit", type=int, default=50)
+    heal.set_defaults(func=_cmd_heals)
+
+    met = sub.add_parser("metrics", help="render/network/memory series from the app monitor")
+    met.add_argument("--test", help="only this test id")
+    met.add_argument("--limit", type=int, default=20)
+    met.set_defaults(func=_cmd_metrics)
+
+    logs = sub.add_parser("logs", help="console log volume per step")
+    logs.add_argument("--test", help="only this test id")
+    logs.add_argument("--level", choices=("debug", "info", "warn", "error"), help="also list lines")
+    logs.add_argument("--limit", type=int, default=20)
+    logs.set_defaults(func=_cmd_logs)
+
+    check = sub.add_parser("selfcheck", help="check that locator steps are keyed by their selector")
+    check.set_defaults(func=_cmd_selfcheck)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Harvest the app's own ``performanceMonitor`` into the results store.
+
+Every browser context created by an instrumented script gets an init
+script that sets ``window.__APP_TEST_HOOKS__``; development and test
+builds of the app then enable the monitor and expose it on
+``window.__appTestHooks``. After each step the instrumentation drains
+``exportMetricsSince(cursor)``. The cursor lives in the page, so a
+navigation starts over with the new app instance, and because it counts
+every metric ever recorded, the monitor's 1000-entry buffer cannot drop
+anything between two steps without it being reported as ``dropped``.
+
+Metrics are stored per run with the index of the step that was running,
+next to the step timings.
+"""
+
+import statistics
+from typing import Any, Callable, Dict, List, Optional
+
+TEST_HOOKS_JS = "window.__APP_TEST_HOOKS__ = true;"
+
+DRAIN_JS = """
+() => {
+  const hooks = window.__appTestHooks;
+  const monitor = hooks && hooks.performanceMonitor;
+  if (!monitor || !monitor.exportMetricsSince) return null;
+  const out = monitor.exportMetricsSince(window.__harnessMetricsCursor || 0);
+  window.__harnessMetricsCursor = out.cursor;
+  return {
+    dropped: out.dropped,
+    metrics: out.metrics.map((m) => [m.name, m.category, m.unit, m.value, m.timestamp]),
+  };
+}
+"""
+
+SERIES = ("render", "network", "memory", "user", "bundle")
+
+
+def page_of(target: Any) -> Optional[Any]:
+    """The Page behind a Page, Frame or Locator, if it is still open."""
+    page = target if hasattr(target, "main_frame") else getattr(target, "page", None)
+    if page is None or page.is_closed():
+        return None
+    return page
+
+
+async def drain(page: Any, emit: Callable[..., None]) -> int:
+    """Read new monitor metrics from one page and emit them; returns the count."""
+    try:
+        out = await page.evaluate(DRAIN_JS)
+    except Exception:
+        # Page mid-navigation or closing; the next drain catches up.
+        return 0
+    if not out or not (out["metrics"] or out["dropped"]):
+        return 0
+    emit("app_metrics", metrics=out["metrics"], dropped=out["dropped"])
+    return len(out["metrics"])
+
+
+def summarize(rows: List[Any]) -> List[Dict[str, Any]]:
+    """Aggregate ``app_metrics`` rows per (category, name)."""
+    groups: Dict[tuple, List[float]] = {}
+    units: Dict[tuple, str] = {}
+    for row in rows:
+        key = (row["category"], row["name"])
+        groups.setdefault(key, []).append(row["value"])
+        units[key] = row["unit"]
+    out = []
+    for (category, name), values in groups.items():
+        values.sort()
+        out.append(
+            {
+                "category": category,
+                "name": name,
+                "unit": units[(category, name)],
+                "n": len(values),
+                "median": statistics.median(values),
+                "p95": values[min(len(values) - 1, int(0.95 * len(values)))],
+                "max": values[-1],
+            }
+        )
+    out.sort(key=lambda r: (SERIES.index(r["category"]) if r["category"] in SERIES else 99, -r["n"]))
+    return out
+
+
+def report(rows: List[Any], step_rows: List[Any], limit: int = 20) -> str:
+    lines = ["| Series | Metric | n | median | p95 | max |", "|---|---|---|---|---|---|"]
+    for r in summarize(rows)[:limit]:
+        u = r["unit"]
+        lines.append(
+            f"| {r['category']} | {r['name']} | {r['n']}"
+            f" | {r['median']:.1f}{u} | {r['p95']:.1f}{u} | {r['max']:.1f}{u} |"
+        )
+    if step_rows:
+        lines += [
+            "",
+            "Render time by step:",
+            "",
+            "| Test | Step | Renders | Render ms |",
+            "|---|---|---|---|",
+        ]
+        for r in step_rows[:limit]:
+            lines.append(f"| {r['test_id']} | {r['step_key']} | {r['renders']} | {r['render_ms']:.1f} |")
+    return "\n".join(lines) + "\n"
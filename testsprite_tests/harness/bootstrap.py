@@ -0,0 +1,25 @@
+"""Entry point the runner uses to execute one generated script.
+
+    python -m harness.bootstrap path/to/TC001_....py
+
+Installs the step instrumentation and then runs the script unchanged as
+``__main__`` so its module-level ``asyncio.run(run_test())`` fires.
+"""
+
+import runpy
+import sys
+
+from . import instrument
+
+
+def main(argv: list) -> None:
+    if len(argv) != 1:
+        raise SystemExit("usage: python -m harness.bootstrap SCRIPT")
+    script = argv[0]
+    instrument.install()
+    sys.argv = [script]
+    runpy.run_path(script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,426 @@
+"""Which JS the app loads, when, and which source modules it is made of.
+
+    python -m harness.bundle_profile [--routes Classifica,Impostazioni,Calendario,"Nuova voce"] [--top 15]
+
+``LazyComponents.tsx`` and ``useLazyComponents`` are meant to keep heavy
+screens out of the initial bundle; TC019 only checks their placeholders.
+This logs in once (the session stays in the context's IndexedDB), then
+opens the app in a fresh page with the browser cache cleared and disabled
+over CDP, and records every script request with its transfer size,
+decoded size and timing:
+
+* ``initial``: from navigation until the first calendar cell receives
+  clicks (:mod:`harness.startup`), i.e. what is loaded before the first
+  interaction;
+* then one phase per route: a tab (Classifica, Impostazioni, back to
+  Calendario) or "Nuova voce", the calendar's "+" that opens
+  ``EntryFormModal``. A phase ends when no script request has started or
+  finished for ``QUIET_S``.
+
+Each script is mapped to its source modules through its source map (the
+``sourceMappingURL`` Metro appends; dev bundles are served with one).
+Generated bytes are attributed to the source of the mapping segment they
+fall in, ``node_modules`` grouped per package; bytes without a mapping
+(Metro's prelude and module wrappers) count as ``[unmapped]``. A module
+is listed under the phase whose scripts first contained it.
+
+The lazy-loading table shows, for each target of ``LazyComponents.tsx``
+and ``setupLazyComponents``, the phase it first arrived in: ``initial``
+means it was not deferred. "Tag Test" is not a route: ``TagTestPage`` is
+commented out of ``MainTabNavigator``.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import sys
+import time
+import urllib.request
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin
+
+from . import config, session, startup
+from .locators import selector
+
+INITIAL = "initial"
+QUIET_S = 1.5
+UNMAPPED = "[unmapped]"
+APP_DIR = config.REPO_ROOT / "app_vendita"
+
+# Modules LazyComponents.tsx and setupLazyComponents() load through import().
+LAZY_TARGETS = (
+    "src/presentation/components/TooltipModal.tsx",
+    "src/presentation/components/EntryFormModal.tsx",
+    "src/presentation/components/FilterComponents.tsx",
+    "src/presentation/components/optimized/MemoizedWeekCalendar.tsx",
+    "src/presentation/components/optimized/VirtualizedMonthCalendar.tsx",
+    "src/presentation/containers/FilterManagementContainer.tsx",
+    "src/presentation/containers/EntryManagementContainer.tsx",
+    "src/presentation/containers/DataLoadingContainer.tsx",
+)
+
+_B64 = {c: i for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")}
+
+
+@dataclass(frozen=True)
+class Route:
+    name: str
+    # Locator clicked to get there, with its parameters.
+    click: str
+    params: Tuple[Tuple[str, Any], ...] = ()
+    # Locator clicked afterwards to leave the route again, if any.
+    close: Optional[str] = None
+
+
+# Asked about, but not reachable from the UI.
+NOT_ROUTES = {"Tag Test": "TagTestPage is commented out of MainTabNavigator"}
+
+ROUTES = (
+    Route("Classifica", "tabs.leaderboard"),
+    Route("Impostazioni", "tabs.settings"),
+    Route("Calendario", "tabs.calendar"),
+    Route("Nuova voce", "calendar.day_add", (("index", 1),), close="entry_form.cancel"),
+)
+
+
+@dataclass
+class Script:
+    url: str
+    phase: str
+    started: float
+    transfer_bytes: int = 0
+    decoded_bytes: int = 0
+    duration_ms: Optional[float] = None
+    body: str = ""
+    failed: Optional[str] = None
+    modules: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class Profile:
+    phases: List[str] = field(default_factory=list)
+    scripts: List[Script] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    def in_phase(self, phase: str) -> List[Script]:
+        return [s for s in self.scripts if s.phase == phase]
+
+    def first_seen(self) -> Dict[str, Tuple[str, int]]:
+        """Module -> (phase it first arrived in, bytes it brought there)."""
+        seen: Dict[str, Tuple[str, int]] = {}
+        for phase in self.phases:
+            sizes: Counter = Counter()
+            for script in self.in_phase(phase):
+                sizes.update(script.modules)
+            for module, size in sizes.items():
+                if module not in seen:
+                    seen[module] = (phase, size)
+        return seen
+
+
+# -- source maps ---------------------------------------------------------
+
+
+def _vlq(segment: str) -> List[int]:
+    values, value, shift = [], 0, 0
+    for ch in segment:
+        digit = _B64[ch]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+        else:
+            values.append(-(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+    return values
+
+
+def _segments(
+    source_map: Dict[str, Any], line0: int = 0, col0: int = 0
+) -> Iterator[Tuple[int, int, Optional[str]]]:
+    """(generated line, generated column, source) for every mapping segment."""
+    if "sections" in source_map:
+        for section in source_map["sections"]:
+            offset = section.get("offset", {})
+            yield from _segments(section["map"], line0 + offset.get("line", 0), offset.get("column", 0))
+        return
+    sources = source_map.get("sources", [])
+    root = source_map.get("sourceRoot") or ""
+    src = 0
+    for line, text in enumerate(source_map.get("mappings", "").split(";")):
+        col = col0 if line == 0 else 0
+        for segment in text.split(","):
+            if not segment:
+                continue
+            values = _vlq(segment)
+            col += values[0]
+            if len(values) > 1:
+                src += values[1]
+                name = root + sources[src] if 0 <= src < len(sources) else None
+                yield line0 + line, col, name
+            else:
+                yield line0 + line, col, None
+
+
+def module_name(source: Optional[str]) -> str:
+    """Path relative to ``app_vendita/``, with ``node_modules`` folded per package."""
+    if not source:
+        return UNMAPPED
+    path = source.split("?")[0].replace("\\", "/")
+    if path.startswith("file://"):
+        path = path[len("file://"):]
+    parts = [p for p in path.split("/") if p]
+    if "node_modules" in parts:
+        i = len(parts) - 1 - parts[::-1].index("node_modules")
+        scoped = i + 1 < len(parts) and parts[i + 1].startswith("@")
+        return "node_modules/" + "/".join(parts[i + 1: i + (3 if scoped else 2)])
+    # The bundle may come from another checkout, so match the folder name only.
+    if APP_DIR.name in parts:
+        i = len(parts) - 1 - parts[::-1].index(APP_DIR.name)
+        return "/".join(parts[i + 1:])
+    return "/".join(parts)
+
+
+def attribute(code: str, source_map: Dict[str, Any]) -> Dict[str, int]:
+    """UTF-8 bytes of ``code`` per source module, by mapping segment."""
+    by_line: Dict[int, List[Tuple[int, Optional[str]]]] = defaultdict(list)
+    for line, col, source in _segments(source_map):
+        by_line[line].append((col, source))
+    sizes: Counter = Counter()
+    names: Dict[Optional[str], str] = {}
+    lines = code.split("\n")
+    for i, text in enumerate(lines):
+        newline = 1 if i < len(lines) - 1 else 0
+        segments = by_line.get(i)
+        if not segments:
+            sizes[UNMAPPED] += len(text.encode("utf-8")) + newline
+            continue
+        segments.sort(key=lambda s: s[0])
+        if segments[0][0] > 0:
+            sizes[UNMAPPED] += len(text[: segments[0][0]].encode("utf-8"))
+        for j, (col, source) in enumerate(segments):
+            end = segments[j + 1][0] if j + 1 < len(segments) else len(text)
+            if source not in names:
+                names[source] = module_name(source)
+            last = j == len(segments) - 1
+            sizes[names[source]] += len(text[col:end].encode("utf-8")) + (newline if last else 0)
+    return dict(sizes)
+
+
+def source_map_url(script: Script) -> Optional[str]:
+    tail = script.body[-2000:]
+    marker = "//# sourceMappingURL="
+    at = tail.rfind(marker)
+    if at < 0:
+        return None
+    ref = tail[at + len(marker):].split()[0]
+    if ref.startswith("data:"):
+        return ref
+    if ref.startswith("//"):
+        ref = "http:" + ref
+    return urljoin(script.url, ref)
+
+
+def load_source_map(url: str, timeout_s: float) -> Dict[str, Any]:
+    if url.startswith("data:"):
+        header, _, payload = url.partition(",")
+        data = base64.b64decode(payload) if header.endswith(";base64") else payload.encode()
+        return json.loads(data)
+    with urllib.request.urlopen(url, timeout=timeout_s) as resp:
+        return json.loads(resp.read())
+
+
+def map_modules(profile: Profile, timeout_s: float) -> None:
+    maps: Dict[str, Dict[str, Any]] = {}
+    for script in profile.scripts:
+        if script.failed or not script.body:
+            continue
+        url = source_map_url(script)
+        try:
+            if url is None:
+                raise ValueError("no sourceMappingURL")
+            if url not in maps:
+                maps[url] = load_source_map(url, timeout_s)
+            script.modules = attribute(script.body, maps[url])
+        except Exception as exc:
+            script.modules = {f"[no source map] {script.url.split('?')[0]}": script.decoded_bytes}
+            profile.errors.append(f"source map for {script.url[:80]}: {type(exc).__name__}: {str(exc)[:80]}")
+        script.body = ""
+
+
+# -- recording -----------------------------------------------------------
+
+
+class ScriptRecorder:
+    """Every script request of a page, tagged with the phase it started in."""
+
+    def __init__(self, profile: Profile):
+        self.profile = profile
+        self.phase = INITIAL
+        self._open: Dict[Any, Script] = {}
+        self._last_event = time.perf_counter()
+        self._tasks: List["asyncio.Task[None]"] = []
+
+    def attach(self, page: Any) -> None:
+        page.on("request", self._on_request)
+        page.on("requestfinished", lambda r: self._track(self._on_finished(r)))
+        page.on("requestfailed", self._on_failed)
+
+    def start_phase(self, phase: str) -> None:
+        self.phase = phase
+        self.profile.phases.append(phase)
+
+    def _track(self, coro: Any) -> None:
+        self._tasks.append(asyncio.ensure_future(coro))
+
+    def _on_request(self, request: Any) -> None:
+        if request.resource_type != "script":
+            return
+        self._last_event = time.perf_counter()
+        script = Script(request.url, self.phase, time.time())
+        self._open[request] = script
+        self.profile.scripts.append(script)
+
+    async def _on_finished(self, request: Any) -> None:
+        script = self._open.pop(request, None)
+        if script is None:
+            return
+        try:
+            response = await request.response()
+            body = await response.body() if response else b""
+            sizes = await request.sizes()
+            script.body = body.decode("utf-8", "replace")
+            script.decoded_bytes = len(body)
+            script.transfer_bytes = sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
+            timing = request.timing
+            if timing.get("responseEnd", -1) >= 0:
+                script.duration_ms = timing["responseEnd"]
+        except Exception as exc:
+            script.failed = f"{type(exc).__name__}: {str(exc)[:80]}"
+        self._last_event = time.perf_counter()
+
+    def _on_failed(self, request: Any) -> None:
+        script = self._open.pop(request, None)
+        if script is not None:
+            script.failed = request.failure or "failed"
+            self._last_event = time.perf_counter()
+
+    async def settle(self, timeout_s: float, quiet_s: float = QUIET_S) -> None:
+        """Wait until no script is in flight and none started or ended for ``quiet_s``."""
+        deadline = time.perf_counter() + timeout_s
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(0.1)
+            if not self._open and time.perf_counter() - self._last_event >= quiet_s:
+                break
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+async def profile(routes: Sequence[Route], timeout_s: float) -> Profile:
+    result = Profile()
+    recorder = ScriptRecorder(result)
+    timeout_ms = timeout_s * 1000
+    async with session.browser_session(default_timeout_ms=timeout_ms) as s:
+        await session.open_app(s.page)
+        await session.login(s.page, timeout_ms=timeout_ms)
+        await s.context.add_init_script(startup.observer_script())
+        page = await s.context.new_page()
+        cdp = await s.context.new_cdp_session(page)
+        await cdp.send("Network.enable")
+        await cdp.send("Network.clearBrowserCache")
+        await cdp.send("Network.setCacheDisabled", {"cacheDisabled": True})
+        recorder.attach(page)
+
+        recorder.start_phase(INITIAL)
+        await page.goto(config.BASE_URL, wait_until="commit", timeout=timeout_ms)
+        await page.wait_for_function(startup.READY_JS, timeout=timeout_ms)
+        await recorder.settle(timeout_s)
+        for route in routes:
+            recorder.start_phase(route.name)
+            try:
+                await page.locator(selector(route.click, **dict(route.params))).click()
+                await recorder.settle(timeout_s)
+                if route.close:
+                    await page.locator(selector(route.close)).click()
+                    await recorder.settle(timeout_s)
+            except Exception as exc:
+                result.errors.append(f"{route.name}: {type(exc).__name__}: {str(exc)[:120]}")
+        await page.close()
+    map_modules(result, timeout_s)
+    return result
+
+
+# -- report --------------------------------------------------------------
+
+
+def _kib(n: Optional[float]) -> str:
+    return "-" if n is None else f"{n / 1024:,.1f}"
+
+
+def report(result: Profile, top: int) -> str:
+    first = result.first_seen()
+    lines = [
+        "| Phase | Scripts | Transfer KiB | Decoded KiB | Slowest script ms | New modules | New module KiB |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for phase in result.phases:
+        scripts = result.in_phase(phase)
+        new = {m: size for m, (p, size) in first.items() if p == phase and m != UNMAPPED}
+        durations = [s.duration_ms for s in scripts if s.duration_ms is not None]
+        lines.append(
+            f"| {phase} | {len(scripts)} | {_kib(sum(s.transfer_bytes for s in scripts))}"
+            f" | {_kib(sum(s.decoded_bytes for s in scripts))}"
+            f" | {f'{max(durations):,.0f}' if durations else '-'} | {len(new)} | {_kib(sum(new.values()))} |"
+        )
+    initial = result.in_phase(INITIAL)
+    lines.append("")
+    lines.append(
+        f"Before first interaction: {_kib(sum(s.transfer_bytes for s in initial))} KiB transferred,"
+        f" {_kib(sum(s.decoded_bytes for s in initial))} KiB of script ({len(initial)} requests)."
+    )
+
+    lines += ["", "| Lazy target | First loaded in | KiB |", "|---|---|---|"]
+    for target in LAZY_TARGETS:
+        phase, size = first.get(target, ("never", None))
+        lines.append(f"| {target} | {phase} | {_kib(size)} |")
+
+    for phase in result.phases:
+        new = sorted(
+            ((m, size) for m, (p, size) in first.items() if p == phase), key=lambda x: x[1], reverse=True
+        )
+        if not new:
+            continue
+        lines += ["", f"Largest modules first loaded in {phase}:", "", "| Module | KiB |", "|---|---|"]
+        lines.extend(f"| {m} | {_kib(size)} |" for m, size in new[:top])
+
+    failed = [f"{s.phase}: {s.url[:100]}: {s.failed}" for s in result.scripts if s.failed]
+    notes = failed + result.errors
+    if notes:
+        lines.append("")
+        lines.extend(f"* {n}" for n in notes)
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.bundle_profile")
+    parser.add_argument("--routes", default=",".join(r.name for r in ROUTES), help="route names, in order")
+    parser.add_argument("--top", type=int, default=15, help="largest modules listed per phase")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds per phase")
+    args = parser.parse_args(argv)
+    known = {r.name: r for r in ROUTES}
+    names = [n.strip() for n in args.routes.split(",") if n.strip()]
+    for name in names:
+        if name in NOT_ROUTES:
+            parser.error(f"{name}: {NOT_ROUTES[name]}")
+    unknown = [n for n in names if n not in known]
+    if unknown:
+        parser.error(f"unknown routes {', '.join(unknown)}; known: {', '.join(known)}")
+
+    result = asyncio.run(profile([known[n] for n in names], args.timeout))
+    sys.stdout.write(report(result, args.top))
+    return 1 if result.errors or any(s.failed for s in result.scripts) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Whole-grid calendar extraction in a single ``page.evaluate``.
+
+Scripts used to build one locator per day and call ``all_text_contents``
+on it, paying a protocol round-trip per cell. :func:`extract_grid` reads
+every rendered ``CustomCalendarCell`` at once (sales and actions badges,
+focus reference sell-out/stock, tags, tooltip icons) into dataclasses, so
+assertions over a whole month cost one round-trip.
+
+    grid = await extract_grid(page)
+    assert grid.day(5).stock_total >= grid.day(4).stock_total
+"""
+
+import datetime as dt
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+EXTRACT_JS = """
+() => {
+  const byId = (root, id) => root.querySelector(`[data-testid="${id}"]`);
+  const text = (el) => (el ? (el.innerText || el.textContent || '').trim() : null);
+  const leaves = (el) => Array.from(el.querySelectorAll('*'))
+    .filter((e) => e.children.length === 0)
+    .map(text)
+    .filter(Boolean);
+  const cells = document.querySelectorAll(
+    '[data-testid^="calendar-cell-"]:not([data-testid$="-add"])'
+  );
+  return Array.from(cells).map((cell) => {
+    const rect = cell.getBoundingClientRect();
+    const focus = Array.from(cell.querySelectorAll('[data-testid^="cell-focus-"]'))
+      .filter((el) => !/^cell-focus-(sold|stock)$/.test(el.getAttribute('data-testid')))
+      .map((el) => ({
+        code: el.getAttribute('data-testid').slice('cell-focus-'.length),
+        acronym: leaves(el)[0] || '',
+        sold: text(byId(el, 'cell-focus-sold')),
+        stock: text(byId(el, 'cell-focus-stock')),
+      }));
+    return {
+      date: cell.getAttribute('data-testid').slice('calendar-cell-'.length),
+      visible: rect.width > 0 && rect.height > 0 && rect.bottom > 0 && rect.top < innerHeight,
+      salesTotal: text(byId(cell, 'cell-sales-total')),
+      salesCount: text(byId(cell, 'cell-sales-count')),
+      actionsTotal: text(byId(cell, 'cell-actions-total')),
+      actionsCount: text(byId(cell, 'cell-actions-count')),
+      salesDot: !!byId(cell, 'cell-sales-dot'),
+      actionsDot: !!byId(cell, 'cell-actions-dot'),
+      focus,
+      tags: Array.from(cell.querySelectorAll('[data-testid^="tag-"]'))
+        .map((el) => el.getAttribute('data-testid').slice('tag-'.length)),
+      icons: Array.from(cell.querySelectorAll('[aria-label]')).map((el) => {
+        const parts = leaves(el);
+        return {label: el.getAttribute('aria-label'), icon: parts[0] || '', badge: parts.slice(1).join('')};
+      }),
+    };
+  });
+}
+"""
+
+_NUMBER = re.compile(r"-?\d+(?:[.,]\d+)?")
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    m = _NUMBER.search(value)
+    return float(m.group(0).replace(",", ".")) if m else None
+
+
+@dataclass
+class FocusCell:
+    code: str
+    acronym: str
+    sold: float
+    stock: float
+
+
+@dataclass
+class CellIcon:
+    label: str
+    icon: str
+    badge: str = ""
+
+
+@dataclass
+class CalendarCell:
+    date: dt.date
+    visible: bool
+    # Sell-in: the euro badge and number of sales; week view only.
+    sales_total: Optional[float] = None
+    sales_count: Optional[int] = None
+    actions_total: Optional[float] = None
+    actions_count: Optional[int] = None
+    # Month view shows dots instead of numbers.
+    has_sales: bool = False
+    has_actions: bool = False
+    focus: List[FocusCell] = field(default_factory=list)
+    tags: List[str] = field(default_factory=list)
+    icons: List[CellIcon] = field(default_factory=list)
+
+    @property
+    def day(self) -> int:
+        return self.date.day
+
+    @property
+    def sold_total(self) -> float:
+        """Sell-out: pieces sold over all focus references (``V:``)."""
+        return sum(f.sold for f in self.focus)
+
+    @property
+    def stock_total(self) -> float:
+        """Stock over all focus references (``S:``)."""
+        return sum(f.stock for f in self.focus)
+
+    def icon(self, label: str) -> Optional[CellIcon]:
+        return next((i for i in self.icons if i.label == label), None)
+
+
+@dataclass
+class CalendarGrid:
+    cells: List[CalendarCell]
+
+    def __iter__(self) -> Iterator[CalendarCell]:
+        return iter(self.cells)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    @property
+    def by_date(self) -> Dict[dt.date, CalendarCell]:
+        return {c.date: c for c in self.cells}
+
+    def get(self, date: Union[dt.date, str]) -> Optional[CalendarCell]:
+        if isinstance(date, str):
+            date = dt.date.fromisoformat(date)
+        return self.by_date.get(date)
+
+    def day(self, day: int) -> CalendarCell:
+        """Cell for a day of the month; visible cells win over overflow days."""
+        matches = sorted(
+            (c for c in self.cells if c.day == day), key=lambda c: not c.visible
+        )
+        if not matches:
+            raise KeyError(f"day {day} is not rendered")
+        return matches[0]
+
+    def days(self, first: int, last: int) -> List[CalendarCell]:
+        return [self.day(d) for d in range(first, last + 1)]
+
+
+def _cell(raw: Dict[str, Any]) -> CalendarCell:
+    sales_count = _number(raw["salesCount"])
+    actions_count = _number(raw["actionsCount"])
+    return CalendarCell(
+        date=dt.date.fromisoformat(raw["date"]),
+        visible=raw["visible"],
+        sales_total=_number(raw["salesTotal"]),
+        sales_count=int(sales_count) if sales_count is not None else None,
+        actions_total=_number(raw["actionsTotal"]),
+        actions_count=int(actions_count) if actions_count is not None else None,
+        has_sales=raw["salesDot"] or raw["salesTotal"] is not None,
+        has_actions=raw["actionsDot"] or raw["actionsTotal"] is not None,
+        focus=[
+            FocusCell(f["code"], f["acronym"], _number(f["sold"]) or 0.0, _number(f["stock"]) or 0.0)
+            for f in raw["focus"]
+        ],
+        tags=list(raw["tags"]),
+        icons=[CellIcon(i["label"], i["icon"], i["badge"]) for i in raw["icons"]],
+    )
+
+
+def parse_grid(raw: List[Dict[str, Any]]) -> CalendarGrid:
+    return CalendarGrid([_cell(r) for r in raw])
+
+
+async def extract_grid(target: Any) -> CalendarGrid:
+    """Read every rendered calendar cell of a Page or Frame in one call."""
+    return parse_grid(await target.evaluate(EXTRACT_JS))
@@ -0,0 +1,345 @@
+"""Seed the calendar with generated entries in one ``page.evaluate``.
+
+Typing quantities through EntryFormModal costs seconds per field. Instead,
+entries are generated here as ``CalendarEntry`` JSON and the matching
+``ProgressiveState`` is computed with the same rules as
+``ProgressiveCalculationService``. Both go into the page in one round-trip:
+``calendarStore.setEntries`` and ``progressiveService.importState``, through
+the test hooks (see ``src/utils/testHooks.ts``).
+
+    entries = generate_entries(dt.date(2025, 6, 2), days=90, sales_point_id="SP001",
+                               references=["3032437", "3032438"])
+    seeded = await seed_calendar(page, entries, sales_point_id="SP001")
+    seeded.check()                     # the app's own recalculation agrees
+    grid = await extract_grid(page)
+
+Seeding replaces the calendar's entries, and the calendar store persists
+them like any other change. Seed after login, once the initial sync has
+loaded, or the sync overwrites the seeded entries.
+"""
+
+import datetime as dt
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# DataAdapter.calendarEntryToProductEntries: price used when netPrice is empty.
+DEFAULT_NET_PRICE = 2.0
+TOTALS = ("venditeTotali", "scorteTotali", "ordinatiTotali", "sellIn")
+
+FOCUS_JS = """
+() => {
+  const store = (window.__appTestHooks || {}).focusReferencesStore;
+  if (!store) return null;
+  const s = store.getState();
+  return {references: s.focusReferences, netPrices: s.netPrices};
+}
+"""
+
+SEED_JS = """
+async ({entries, salesPointId, state}) => {
+  const hooks = window.__appTestHooks || {};
+  const calendar = hooks.calendarStore;
+  const progressive = hooks.progressiveService;
+  if (!calendar || !progressive) return null;
+  const t0 = performance.now();
+  const store = calendar.getState();
+  const userId = store.activeFilters.userId;
+  const toDate = (v) => (v ? new Date(v) : v);
+  const revived = entries.map((e) => ({
+    ...e,
+    userId: e.userId == null ? userId : e.userId,
+    date: toDate(e.date),
+    createdAt: toDate(e.createdAt),
+    updatedAt: toDate(e.updatedAt),
+    chatNotes: (e.chatNotes || []).map((n) => ({...n, timestamp: toDate(n.timestamp)})),
+  }));
+  store.setEntries(revived);
+  if (salesPointId) store.updateFilters({salesPointId});
+  progressive.importState({
+    entries: new Map(state.entries),
+    progressiveTotals: new Map(state.progressiveTotals),
+    calculationConfig: state.calculationConfig || progressive.exportState().calculationConfig,
+    lastUpdated: state.lastUpdated,
+  });
+  const ms = performance.now() - t0;
+  // Let CalendarProvider's effects re-initialise for the sales point.
+  await new Promise((r) => requestAnimationFrame(() => requestAnimationFrame(r)));
+  return {ms, entries: revived.length};
+}
+"""
+
+EXPORT_JS = """
+() => {
+  const progressive = (window.__appTestHooks || {}).progressiveService;
+  if (!progressive) return null;
+  const s = progressive.exportState();
+  return {
+    entries: Array.from(s.entries),
+    progressiveTotals: Array.from(s.progressiveTotals),
+    calculationConfig: s.calculationConfig,
+    lastUpdated: s.lastUpdated,
+    firstDateWithData: s.firstDateWithData || null,
+  };
+}
+"""
+
+_FLOAT = re.compile(r"^\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+
+def _parse_float(value: Any) -> float:
+    """JavaScript ``parseFloat(value) || 0``."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    m = _FLOAT.match(str(value or ""))
+    return float(m.group(0)) if m else 0.0
+
+
+def _iso(moment: dt.datetime) -> str:
+    # No offset: the page parses it as local time, like the app's own dates.
+    return moment.isoformat(timespec="seconds")
+
+
+def focus_data(
+    reference_id: str,
+    ordered: float,
+    sold: float,
+    stock: float,
+    net_price: Optional[str] = None,
+) -> Dict[str, str]:
+    """One ``FocusReferenceData``; quantities are strings in the app too."""
+    return {
+        "referenceId": reference_id,
+        "orderedPieces": f"{ordered:g}",
+        "soldPieces": f"{sold:g}",
+        "stockPieces": f"{stock:g}",
+        "soldVsStockPercentage": f"{sold / stock * 100:.1f}" if stock else "0.0",
+        "netPrice": net_price or "",
+    }
+
+
+def calendar_entry(
+    day: dt.date,
+    sales_point_id: str,
+    focus: Sequence[Mapping[str, str]],
+    user_id: Optional[str] = None,
+    entry_id: Optional[str] = None,
+    tags: Iterable[str] = (),
+    notes: str = "",
+) -> Dict[str, Any]:
+    """A ``CalendarEntry`` as JSON. ``user_id=None`` takes the active user filter."""
+    # Noon, so the local date key is the same in every timezone.
+    moment = _iso(dt.datetime.combine(day, dt.time(12)))
+    return {
+        "id": entry_id or f"seed_{sales_point_id}_{day.isoformat()}",
+        "date": moment,
+        "userId": user_id,
+        "salesPointId": sales_point_id,
+        "actions": [],
+        "sales": [],
+        "hasProblem": False,
+        "notes": notes,
+        "chatNotes": [],
+        "tags": list(tags),
+        "focusReferencesData": [dict(f) for f in focus],
+        "createdAt": moment,
+        "updatedAt": moment,
+    }
+
+
+def generate_entries(
+    start: dt.date,
+    days: int,
+    sales_point_id: str,
+    references: Sequence[str],
+    net_prices: Optional[Mapping[str, str]] = None,
+    seed: int = 0,
+    density: float = 1.0,
+    weekdays_only: bool = True,
+    user_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Deterministic entries for ``days`` calendar days from ``start``.
+
+    ``density`` is the share of eligible days that get an entry.
+    """
+    rng = random.Random(seed)
+    prices = net_prices or {}
+    out = []
+    for offset in range(days):
+        day = start + dt.timedelta(days=offset)
+        if weekdays_only and day.weekday() >= 5:
+            continue
+        if rng.random() >= density:
+            continue
+        focus = [
+            focus_data(ref, rng.randint(0, 20), rng.randint(0, 15), rng.randint(0, 30), prices.get(ref))
+            for ref in references
+        ]
+        out.append(calendar_entry(day, sales_point_id, focus, user_id=user_id))
+    return out
+
+
+def product_entries(entry: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """``DataAdapter.calendarEntryToProductEntries``."""
+    out = []
+    for f in entry.get("focusReferencesData") or []:
+        net = _parse_float(f["netPrice"]) if f.get("netPrice") else DEFAULT_NET_PRICE
+        out.append(
+            {
+                "productId": f["referenceId"],
+                "vendite": _parse_float(f["soldPieces"]),
+                "scorte": _parse_float(f["stockPieces"]),
+                "ordinati": _parse_float(f["orderedPieces"]),
+                "prezzoNetto": net,
+                "categoria": "Prodotto",
+                "colore": "green",
+                "tooltip": f"V: {f['soldPieces']}, S: {f['stockPieces']}, O: {f['orderedPieces']}",
+            }
+        )
+    return out
+
+
+def _daily_totals(products: List[Dict[str, Any]]) -> Dict[str, float]:
+    totals = dict.fromkeys(TOTALS, 0.0)
+    for p in products:
+        totals["venditeTotali"] += p["vendite"]
+        totals["scorteTotali"] += p["scorte"]
+        totals["ordinatiTotali"] += p["ordinati"]
+        totals["sellIn"] += p["ordinati"] * p["prezzoNetto"]
+    return totals
+
+
+def _progressive_totals(daily: Dict[str, float], previous: Optional[Dict[str, float]]) -> Dict[str, float]:
+    if previous is None:
+        return {
+            "venditeTotali": daily["venditeTotali"],
+            "ordinatiTotali": daily["ordinatiTotali"],
+            "scorteTotali": daily["ordinatiTotali"] - daily["venditeTotali"],
+            "sellIn": daily["sellIn"],
+        }
+    return {
+        "venditeTotali": previous["venditeTotali"] + daily["venditeTotali"],
+        "ordinatiTotali": previous["ordinatiTotali"] + daily["ordinatiTotali"],
+        "scorteTotali": previous["scorteTotali"] + (daily["ordinatiTotali"] - daily["venditeTotali"]),
+        "sellIn": previous["sellIn"] + daily["sellIn"],
+    }
+
+
+def progressive_state(
+    entries: Sequence[Mapping[str, Any]],
+    sales_point_id: Optional[str] = None,
+    calculation_config: Optional[Mapping[str, float]] = None,
+) -> Dict[str, Any]:
+    """``ProgressiveState`` for ``entries``, Maps as ``[key, value]`` pairs.
+
+    Mirrors CalendarProvider: only the selected sales point's entries with
+    focus data, accumulated by date from the first day with data.
+    """
+    by_date: Dict[str, List[Dict[str, Any]]] = {}
+    for e in entries:
+        if sales_point_id and e["salesPointId"] != sales_point_id:
+            continue
+        products = product_entries(e)
+        if products:
+            # Later entries for the same day replace earlier ones, as updateCell does.
+            by_date[e["date"][:10]] = products
+    state_entries = []
+    totals = []
+    previous = None
+    for date in sorted(by_date):
+        daily = _daily_totals(by_date[date])
+        progressive = _progressive_totals(daily, previous)
+        entry = {
+            "date": date,
+            "entries": by_date[date],
+            "dailyTotals": daily,
+            "progressiveTotals": progressive,
+        }
+        if previous is not None:
+            entry["previousDayTotals"] = previous
+        state_entries.append([date, entry])
+        totals.append([date, progressive])
+        previous = progressive
+    return {
+        "entries": state_entries,
+        "progressiveTotals": totals,
+        "calculationConfig": dict(calculation_config) if calculation_config else None,
+        "lastUpdated": dt.datetime.now(dt.timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+        "firstDateWithData": state_entries[0][0] if state_entries else None,
+    }
+
+
+def compare(expected: Mapping[str, Any], actual: Mapping[str, Any], tolerance: float = 1e-6) -> List[str]:
+    """Differences in progressive totals between two states, one line each."""
+    want = dict(expected["progressiveTotals"])
+    got = dict(actual["progressiveTotals"])
+    out = []
+    for date in sorted(set(want) | set(got)):
+        if date not in got:
+            out.append(f"{date}: missing in page")
+        elif date not in want:
+            out.append(f"{date}: not seeded")
+        else:
+            for key in TOTALS:
+                if abs(want[date][key] - got[date][key]) > tolerance:
+                    out.append(f"{date}: {key} expected {want[date][key]:g}, got {got[date][key]:g}")
+    return out
+
+
+@dataclass
+class SeedResult:
+    entries: int
+    dates: int
+    # In-page time for setEntries + importState.
+    elapsed_ms: float
+    # Differences between the seeded state and the app's state afterwards.
+    mismatches: List[str] = field(default_factory=list)
+
+    def check(self) -> None:
+        if self.mismatches:
+            raise AssertionError(
+                f"progressive state differs after seeding ({len(self.mismatches)}): "
+                + "; ".join(self.mismatches[:10])
+            )
+
+
+async def focus_references(page: Any) -> Tuple[List[str], Dict[str, str]]:
+    """The app's active focus reference ids and net prices."""
+    out = await page.evaluate(FOCUS_JS)
+    if out is None:
+        raise RuntimeError("app test hooks not available; is this a dev or test build?")
+    return list(out["references"]), dict(out["netPrices"] or {})
+
+
+async def export_progressive(page: Any) -> Dict[str, Any]:
+    out = await page.evaluate(EXPORT_JS)
+    if out is None:
+        raise RuntimeError("progressiveService test hook not available; is the calendar mounted?")
+    return out
+
+
+async def seed_calendar(
+    page: Any,
+    entries: Sequence[Mapping[str, Any]],
+    sales_point_id: Optional[str] = None,
+    state: Optional[Mapping[str, Any]] = None,
+    verify: bool = True,
+) -> SeedResult:
+    """Replace the calendar's entries and import their progressive state.
+
+    ``sales_point_id`` also selects that client in the calendar filters.
+    With ``verify``, the app's progressive state is read back after its own
+    effects have run and compared with the imported one.
+    """
+    if state is None:
+        state = progressive_state(entries, sales_point_id)
+    out = await page.evaluate(
+        SEED_JS, {"entries": list(entries), "salesPointId": sales_point_id, "state": state}
+    )
+    if out is None:
+        raise RuntimeError("calendarStore/progressiveService test hooks not available")
+    result = SeedResult(out["entries"], len(state["progressiveTotals"]), out["ms"])
+    if verify:
+        result.mismatches = compare(state, await export_progressive(page))
+    return result
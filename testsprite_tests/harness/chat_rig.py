@@ -0,0 +1,302 @@
+"""Chat throughput and delivery latency between sender/receiver pairs (TC016).
+
+    python -m harness.chat_rig [--pairs 2] [--rates 1,2,5,10,20] [--burst 20] [--budget-ms 1000]
+
+TC016 sends a chat note and checks that it shows up, not how fast or in
+what order. Here one browser holds N sender/receiver pairs, each context
+logged in as a user from ``TEST_USERS``. Every pair gets its own calendar
+entry (harness ``userId``, so pairs don't see each other's traffic):
+
+* the receiver syncs the way the calendar does:
+  ``firebaseCalendarService.subscribeToEntries`` feeds each ``onSnapshot``
+  into ``calendarStore``. A store listener stamps the first time each
+  message id is in the entry's ``chatNotes`` and stamps it again on the
+  next animation frame, which is when ``TooltipModal`` would paint it;
+* the sender writes like ``TooltipModal.handleSendMessage``: it appends
+  the note to its copy of ``chatNotes`` and saves the whole array with
+  ``FirebaseCalendarRepositoryAdapter.updateCalendarEntry``, without
+  waiting for the previous save (the modal doesn't either);
+* each step sends a ``--burst`` of messages per pair at one rate. Rates
+  go up until the p95 latency passes ``--budget-ms`` or a message goes
+  missing.
+
+Latency is from the send on the sender to the paint on the receiver; all
+contexts share one machine's wall clock. A message that reaches the
+receiver after a later one from the same sender is an ordering violation.
+After ``--drain`` seconds the entry is read back: a message missing there
+was lost by an overlapping save of the array (a lost write), one present
+there but never painted is a dropped notification. The app has no push
+notifications, so the real-time listener is the delivery path measured.
+
+Message ids carry the pair and a sequence number next to the app's
+``note_<Date.now()>``, which alone collides at these rates. The entries
+are deleted at the end; the writes go to the Firebase project the app is
+configured for, so run this against a test project.
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import session
+from .calendar_seed import calendar_entry
+from .firestore_helpers import create_entry, delete_entry
+from .tables import ms
+from .timeouts import percentile
+
+RATES = (1, 2, 5, 10, 20)
+BENCH_SALES_POINT = "harness_chat"
+HOOKS_READY_JS = (
+    "() => !!(window.__appTestHooks && window.__appTestHooks.FirebaseCalendarRepositoryAdapter"
+    " && window.__appTestHooks.firebaseCalendarService && window.__appTestHooks.calendarStore)"
+)
+
+RECEIVE_JS = """
+({userId, entryId}) => {
+  const hooks = window.__appTestHooks;
+  const now = () => performance.timeOrigin + performance.now();
+  const state = window.__harnessChat = {received: {}, painted: {}, maxSeq: -1, late: [], stop: null};
+  const onEntries = (entries) => {
+    const entry = (entries || []).find((e) => e.id === entryId);
+    if (!entry) return;
+    const t = now();
+    const fresh = [];
+    for (const note of entry.chatNotes || []) {
+      if (note.id in state.received) continue;
+      state.received[note.id] = t;
+      fresh.push(note.id);
+      const seq = Number(note.id.split('_').pop());
+      if (seq < state.maxSeq) state.late.push(note.id);
+      state.maxSeq = Math.max(state.maxSeq, seq);
+    }
+    if (fresh.length) {
+      requestAnimationFrame(() => {
+        const painted = now();
+        for (const id of fresh) state.painted[id] = painted;
+      });
+    }
+  };
+  const unsubscribeStore = hooks.calendarStore.subscribe((s) => onEntries(s.entries));
+  hooks.firebaseCalendarService.subscribeToEntries(userId);
+  state.stop = () => {
+    unsubscribeStore();
+    hooks.firebaseCalendarService.unsubscribeFromEntries();
+  };
+}
+"""
+
+PAINTED_JS = """
+(ids) => {
+  const state = window.__harnessChat;
+  return !!state && ids.every((id) => id in state.painted);
+}
+"""
+
+COLLECT_JS = """
+(ids) => {
+  const state = window.__harnessChat;
+  const painted = {};
+  for (const id of ids) if (id in state.painted) painted[id] = state.painted[id];
+  const late = state.late.filter((id) => ids.includes(id));
+  return {painted, late};
+}
+"""
+
+STOP_JS = """
+() => {
+  const state = window.__harnessChat;
+  if (state && state.stop) state.stop();
+  window.__harnessChat = null;
+}
+"""
+
+SEND_JS = """
+async ({entryId, pair, count, intervalMs}) => {
+  const repo = new window.__appTestHooks.FirebaseCalendarRepositoryAdapter();
+  const state = window.__harnessChatSender = window.__harnessChatSender || {notes: [], seq: 0};
+  const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+  const sent = [];
+  const errors = [];
+  const saves = [];
+  const t0 = performance.now();
+  for (let i = 0; i < count; i++) {
+    const wait = t0 + i * intervalMs - performance.now();
+    if (wait > 0) await sleep(wait);
+    const seq = state.seq++;
+    const note = {
+      id: `note_${Date.now()}_${pair}_${seq}`,
+      userId: 'harness',
+      userName: 'Harness',
+      message: `harness chat ${pair} ${seq}`,
+      timestamp: new Date(),
+    };
+    state.notes.push(note);
+    sent.push({id: note.id, at: performance.timeOrigin + performance.now()});
+    saves.push(repo.updateCalendarEntry(entryId, {chatNotes: state.notes.slice(), updatedAt: new Date()})
+      .catch((e) => { errors.push(String(e && e.message || e)); }));
+  }
+  await Promise.all(saves);
+  return {sent, errors: errors.slice(0, 5), failed: errors.length};
+}
+"""
+
+STORED_JS = """
+async (entryId) => {
+  const entry = await new window.__appTestHooks.FirebaseCalendarRepository().getEntryById(entryId);
+  return entry ? (entry.chatNotes || []).map((note) => note.id) : [];
+}
+"""
+
+
+@dataclass
+class RateResult:
+    rate: float
+    pairs: int
+    sent: int = 0
+    latencies_ms: List[float] = field(default_factory=list)
+    out_of_order: int = 0
+    dropped: int = 0
+    lost: int = 0
+    failed_saves: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def percentile(self, q: float) -> Optional[float]:
+        values = sorted(self.latencies_ms)
+        return percentile(values, q) if values else None
+
+    def within(self, budget_ms: float) -> bool:
+        p95 = self.percentile(0.95)
+        return p95 is not None and p95 <= budget_ms and not (self.dropped or self.lost)
+
+
+@dataclass
+class Pair:
+    index: int
+    sender: Any
+    receiver: Any
+    entry_id: str = ""
+
+
+async def _open_pair(pair: Pair) -> None:
+    user_id = f"harness_chat_{pair.index}"
+    entry = calendar_entry(dt.date.today(), BENCH_SALES_POINT, [], user_id=user_id)
+    # addEntry stamps these itself.
+    for key in ("id", "createdAt", "updatedAt"):
+        entry.pop(key)
+    pair.entry_id = await create_entry(pair.sender, entry)
+    await pair.receiver.evaluate(RECEIVE_JS, {"userId": user_id, "entryId": pair.entry_id})
+
+
+async def _step(pair: Pair, rate: float, burst: int, drain_s: float, result: RateResult) -> None:
+    params = {"entryId": pair.entry_id, "pair": pair.index, "count": burst, "intervalMs": 1000.0 / rate}
+    out = await pair.sender.evaluate(SEND_JS, params)
+    sent: Dict[str, float] = {s["id"]: s["at"] for s in out["sent"]}
+    ids = list(sent)
+    result.sent += len(ids)
+    result.failed_saves += out["failed"]
+    result.errors.extend(f"pair {pair.index}: {e}" for e in out["errors"])
+    try:
+        await pair.receiver.wait_for_function(PAINTED_JS, arg=ids, timeout=drain_s * 1000)
+    except Exception:
+        pass
+    seen = await pair.receiver.evaluate(COLLECT_JS, ids)
+    stored = set(await pair.sender.evaluate(STORED_JS, pair.entry_id))
+    for msg_id, at in sent.items():
+        if msg_id in seen["painted"]:
+            result.latencies_ms.append(seen["painted"][msg_id] - at)
+        elif msg_id in stored:
+            result.dropped += 1
+        else:
+            result.lost += 1
+    result.out_of_order += len(seen["late"])
+
+
+async def run(
+    pairs: int, rates: Sequence[float], burst: int, budget_ms: float, drain_s: float, timeout_s: float
+) -> List[RateResult]:
+    results: List[RateResult] = []
+    timeout_ms = timeout_s * 1000
+    async with session.browser_session(default_timeout_ms=timeout_ms) as s:
+        logins = (
+            session.logged_in_context(s.browser, i, timeout_ms, HOOKS_READY_JS) for i in range(2 * pairs)
+        )
+        opened = await asyncio.gather(*logins, return_exceptions=True)
+        contexts = [o[0] for o in opened if not isinstance(o, BaseException)]
+        try:
+            failed = [o for o in opened if isinstance(o, BaseException)]
+            if failed:
+                result = RateResult(rates[0], pairs)
+                result.errors.append(f"login: {type(failed[0]).__name__}: {str(failed[0])[:120]}")
+                return [result]
+            rig = [Pair(i, opened[2 * i][1], opened[2 * i + 1][1]) for i in range(pairs)]
+            try:
+                await asyncio.gather(*(_open_pair(p) for p in rig))
+                for rate in rates:
+                    result = RateResult(rate, pairs)
+                    try:
+                        await asyncio.gather(*(_step(p, rate, burst, drain_s, result) for p in rig))
+                    except Exception as exc:
+                        result.errors.append(f"{type(exc).__name__}: {str(exc)[:120]}")
+                    results.append(result)
+                    if not result.within(budget_ms):
+                        break
+            finally:
+                for p in rig:
+                    await p.receiver.evaluate(STOP_JS)
+                    if p.entry_id:
+                        await delete_entry(p.sender, p.entry_id)
+        finally:
+            for context in contexts:
+                await context.close()
+    return results
+
+
+def report(results: Sequence[RateResult], budget_ms: float) -> str:
+    lines = [
+        "| Msg/s per pair | Msg/s total | Sent | Painted | p50 ms | p95 ms | Max ms"
+        " | Out of order | Dropped | Lost writes | Failed saves |",
+        "|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        lines.append(
+            f"| {r.rate:g} | {r.rate * r.pairs:g} | {r.sent} | {len(r.latencies_ms)}"
+            f" | {ms(r.percentile(0.5))} | {ms(r.percentile(0.95))} | {ms(r.percentile(1.0))}"
+            f" | {r.out_of_order} | {r.dropped} | {r.lost} | {r.failed_saves} |"
+        )
+    ok = [r.rate for r in results if r.within(budget_ms)]
+    budget = f"p95 <= {budget_ms:g} ms, nothing missing"
+    lines.append("")
+    if ok:
+        lines.append(f"Highest rate within budget ({budget}): {max(ok):g} msg/s per pair.")
+    else:
+        lines.append(f"No rate stayed within budget ({budget}).")
+    notes = [f"{r.rate:g} msg/s: {e}" for r in results for e in r.errors]
+    if notes:
+        lines.append("")
+        lines.extend(f"* {n}" for n in notes)
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.chat_rig")
+    parser.add_argument("--pairs", type=int, default=2, help="sender/receiver context pairs")
+    parser.add_argument("--rates", default=",".join(map(str, RATES)), help="messages per second per pair")
+    parser.add_argument("--burst", type=int, default=20, help="messages per pair at each rate")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="p95 send-to-paint budget")
+    parser.add_argument("--drain", type=float, default=15.0, help="seconds to wait for a burst to arrive")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds per login and per call")
+    args = parser.parse_args(argv)
+    rates = sorted(float(x) for x in args.rates.split(",") if x.strip())
+    if args.pairs < 1 or args.burst < 1 or not rates or rates[0] <= 0:
+        parser.error("--pairs, --burst and every rate must be positive")
+
+    results = asyncio.run(run(args.pairs, rates, args.burst, args.budget_ms, args.drain, args.timeout))
+    sys.stdout.write(report(results, args.budget_ms))
+    return 0 if results and results[0].within(args.budget_ms) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
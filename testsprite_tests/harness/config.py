@@ -0,0 +1,47 @@
+"""Shared paths and settings for the TestSprite harness.
+
+Everything here can be overridden through ``HARNESS_*`` environment
+variables so the same scripts work on a developer machine and in CI.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+HARNESS_DIR = Path(__file__).resolve().parent
+SUITE_DIR = HARNESS_DIR.parent
+REPO_ROOT = SUITE_DIR.parent
+
+# Both generated suites live in the repo; the runner accepts either.
+SUITE_DIRS = (SUITE_DIR, REPO_ROOT / "app_vendita" / "testsprite_tests")
+
+BASE_URL = os.environ.get("HARNESS_BASE_URL", "http://localhost:8081")
+STATE_DIR = Path(os.environ.get("HARNESS_STATE_DIR", SUITE_DIR / ".harness"))
+RESULTS_DB = Path(os.environ.get("HARNESS_RESULTS_DB", STATE_DIR / "results.sqlite3"))
+
+# Environment variables used to talk to an instrumented test subprocess.
+ENV_EVENTS = "HARNESS_EVENTS"
+ENV_TEST_ID = "HARNESS_TEST_ID"
+ENV_TIMEOUTS = "HARNESS_TIMEOUTS"
+ENV_FINGERPRINTS = "HARNESS_FINGERPRINTS"
+ENV_SNAPSHOT = "HARNESS_SNAPSHOT"
+ENV_CAMERA = "HARNESS_CAMERA"
+ENV_NETWORK = "HARNESS_NETWORK"
+
+
+def app_commit() -> str:
+    """Return the commit the app under test was built from."""
+    override = os.environ.get("HARNESS_APP_COMMIT")
+    if override:
+        return override
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return out.stdout.strip() or "unknown"
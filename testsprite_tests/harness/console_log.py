@@ -0,0 +1,265 @@
+"""Console capture with structured parsing of the app's log formats.
+
+The app logs in three shapes, all on the browser console:
+
+* ``logger`` (and ``OptimizedLogger``, which goes through it):
+  ``"🐛 [12:34:56][CATEGORY] message"`` plus an optional data argument;
+* ``debugLog`` and plain ``console.*`` calls: ``"✅ Module: message"``;
+* anything else, kept as-is with the console type as level.
+
+:class:`LogCollector` listens to ``page.on("console")`` and parses each
+line into a :class:`LogRecord` (level, module, message, payload) in a
+bounded ring buffer. Per-step line counts are kept exactly even when the
+ring overflows, so a log storm on a hot path shows up as volume even if
+its lines are dropped. Under ``harness run`` every page is attached
+automatically and records are flushed as ``logs`` events after each step.
+"""
+
+import asyncio
+import itertools
+import re
+import time
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+CAPACITY = 5000
+# Payload arguments are fetched with one round-trip each; during a storm
+# only this many fetches are kept in flight and the rest go without.
+MAX_PENDING_PAYLOADS = 50
+MESSAGE_CHARS = 500
+
+DEBUG, INFO, WARN, ERROR = "debug", "info", "warn", "error"
+
+# Leading emoji -> level, for lines that do not come from ``logger``.
+EMOJI_LEVELS = {
+    "🐛": DEBUG,
+    "🔍": DEBUG,
+    "🔄": DEBUG,
+    "📊": DEBUG,
+    "🏷️": DEBUG,
+    "ℹ️": INFO,
+    "✅": INFO,
+    "🚀": INFO,
+    "💾": INFO,
+    "📥": INFO,
+    "📤": INFO,
+    "🔥": INFO,
+    "⚠️": WARN,
+    "❌": ERROR,
+    "🚨": ERROR,
+    "💥": ERROR,
+}
+CONSOLE_LEVELS = {"debug": DEBUG, "log": DEBUG, "info": INFO, "warning": WARN, "error": ERROR}
+
+LOGGER_LINE = re.compile(
+    r"^(?P<emoji>\S+)\s+\[\d\d:\d\d:\d\d\]\[(?P<module>[^\]]+)\]\s?(?P<message>.*)$", re.S
+)
+PREFIXED_LINE = re.compile(
+    r"^(?P<emoji>[^\w\s\[\]\"'(]+)\s*(?P<module>[A-Za-z][\w.\-]*(?: [A-Za-z][\w.\-]*){0,2}):\s+(?P<message>.*)$",
+    re.S,
+)
+EMOJI_ONLY = re.compile(r"^(?P<emoji>[^\w\s\[\]\"'(]+)\s+(?P<message>.*)$", re.S)
+
+
+@dataclass
+class LogRecord:
+    seq: int
+    step: Optional[int]
+    logged_at: float
+    level: str
+    module: str
+    message: str
+    # "logger", "prefixed" or "raw": which format the line was parsed as.
+    source: str
+    payload: Any = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.module}:{self.message}"
+
+
+def parse_line(text: str, console_type: str = "log") -> Tuple[str, str, str, str]:
+    """(level, module, message, source) for one console line."""
+    fallback = CONSOLE_LEVELS.get(console_type, DEBUG)
+    m = LOGGER_LINE.match(text)
+    if m:
+        level = EMOJI_LEVELS.get(m.group("emoji"), fallback)
+        return level, m.group("module"), m.group("message").strip(), "logger"
+    m = PREFIXED_LINE.match(text)
+    if m:
+        level = EMOJI_LEVELS.get(m.group("emoji"), fallback)
+        return level, m.group("module"), m.group("message").strip(), "prefixed"
+    m = EMOJI_ONLY.match(text)
+    if m and m.group("emoji") in EMOJI_LEVELS:
+        return EMOJI_LEVELS[m.group("emoji")], "", m.group("message").strip(), "prefixed"
+    return fallback, "", text.strip(), "raw"
+
+
+def _preview(handle: Any) -> Optional[str]:
+    """Playwright's preview string for a console argument, if exposed."""
+    preview = getattr(getattr(handle, "_impl_obj", handle), "_preview", None)
+    return preview if isinstance(preview, str) else None
+
+
+def _first_arg_text(msg: Any, args: List[Any]) -> str:
+    """The console line without the previews of its extra arguments.
+
+    ``msg.text`` joins the preview of every argument, so
+    ``console.info(line, data)`` would carry ``data`` in the message; the
+    extra arguments are fetched into ``payload`` instead.
+    """
+    text = msg.text
+    if len(args) <= 1:
+        return text
+    first = _preview(args[0])
+    if first is not None and text.startswith(first):
+        return first
+    rest = [_preview(a) for a in args[1:]]
+    if None not in rest:
+        tail = " " + " ".join(rest)
+        if text.endswith(tail):
+            return text[: -len(tail)]
+    return text
+
+
+@dataclass
+class LogCollector:
+    capacity: int = CAPACITY
+    # Index of the step that is running; set by the instrumentation.
+    current_step: Callable[[], Optional[int]] = lambda: None
+    records: Deque[LogRecord] = field(init=False)
+    # Exact counts, unaffected by the ring buffer: (step, module, level) -> lines.
+    volume: Counter = field(default_factory=Counter, init=False)
+    dropped: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.records = deque(maxlen=self.capacity)
+        self._seq = itertools.count()
+        self._flushed = -1
+        self._pages: Set[int] = set()
+        self._pending: Set[asyncio.Task] = set()
+
+    def attach(self, page: Any) -> "LogCollector":
+        """Start collecting a page's console; calling it twice is harmless."""
+        if id(page) not in self._pages:
+            self._pages.add(id(page))
+            page.on("console", self._on_console)
+        return self
+
+    def _on_console(self, msg: Any) -> None:
+        args = msg.args
+        level, module, message, source = parse_line(_first_arg_text(msg, args), msg.type)
+        record = LogRecord(
+            seq=next(self._seq),
+            step=self.current_step(),
+            logged_at=time.time(),
+            level=level,
+            module=module,
+            message=message[:MESSAGE_CHARS],
+            source=source,
+        )
+        self.volume[(record.step, module, level)] += 1
+        if len(self.records) == self.records.maxlen and self.records[0].seq > self._flushed:
+            self.dropped += 1
+        self.records.append(record)
+        if len(args) > 1 and len(self._pending) < MAX_PENDING_PAYLOADS:
+            task = asyncio.ensure_future(self._payload(record, args[1:]))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _payload(self, record: LogRecord, args: List[Any]) -> None:
+        values = []
+        for arg in args:
+            try:
+                values.append(await arg.json_value())
+            except Exception:
+                values.append(None)
+        values = [v for v in values if v not in (None, "")]
+        record.payload = values[0] if len(values) == 1 else (values or None)
+
+    async def settle(self) -> None:
+        """Wait for in-flight payload fetches."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    async def flush(self, emit: Callable[..., None]) -> None:
+        """Emit records and volume not yet flushed as one ``logs`` event."""
+        await self.settle()
+        fresh = [r for r in self.records if r.seq > self._flushed]
+        if not fresh and not self.volume and not self.dropped:
+            return
+        if fresh:
+            self._flushed = fresh[-1].seq
+        emit(
+            "logs",
+            records=[asdict(r) for r in fresh],
+            volume=[[step, module, level, n] for (step, module, level), n in self.volume.items()],
+            dropped=self.dropped,
+        )
+        self.volume.clear()
+        self.dropped = 0
+
+    # -- queries for scripts ---------------------------------------------
+
+    def query(
+        self,
+        level: Optional[str] = None,
+        module: Optional[str] = None,
+        contains: Optional[str] = None,
+    ) -> List[LogRecord]:
+        return [
+            r
+            for r in self.records
+            if (level is None or r.level == level)
+            and (module is None or r.module == module)
+            and (contains is None or contains in r.message)
+        ]
+
+
+def volume_by_step(rows: List[Any]) -> List[Dict[str, Any]]:
+    """Average lines per run for each (test, step), loudest first.
+
+    ``rows`` come from :meth:`ResultsStore.log_volume_rows`.
+    """
+    runs: Dict[Tuple[str, Optional[str]], Set[int]] = {}
+    lines: Counter = Counter()
+    modules: Dict[Tuple[str, Optional[str]], Counter] = {}
+    durations: Dict[Tuple[str, Optional[str]], Dict[int, float]] = {}
+    for r in rows:
+        key = (r["test_id"], r["step_key"])
+        runs.setdefault(key, set()).add(r["run_id"])
+        lines[key] += r["lines"]
+        modules.setdefault(key, Counter())[r["module"] or "(unparsed)"] += r["lines"]
+        if r["duration_ms"] is not None:
+            durations.setdefault(key, {})[r["run_id"]] = r["duration_ms"]
+    out = []
+    for key, total in lines.items():
+        n = len(runs[key])
+        per_run = durations.get(key, {})
+        out.append(
+            {
+                "test_id": key[0],
+                "step_key": key[1],
+                "lines": total / n,
+                "duration_ms": sum(per_run.values()) / len(per_run) if per_run else None,
+                "top_module": modules[key].most_common(1)[0][0],
+            }
+        )
+    out.sort(key=lambda r: -r["lines"])
+    return out
+
+
+def volume_report(rows: List[Any], limit: int = 20) -> str:
+    """Markdown table of log lines per step, loudest first."""
+    lines = [
+        "| Test | Step | Lines/run | Lines/s | Top module |",
+        "|---|---|---|---|---|",
+    ]
+    for r in volume_by_step(rows)[:limit]:
+        rate = f"{r['lines'] / (r['duration_ms'] / 1000.0):.0f}" if r["duration_ms"] else "-"
+        lines.append(
+            f"| {r['test_id']} | {r['step_key'] or '(between steps)'} | {r['lines']:.0f}"
+            f" | {rate} | {r['top_module']} |"
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,285 @@
+"""Start or attach to the Expo web dev server and wait until the bundle is built.
+
+    python -m harness.dev_server up        # start (or attach) and leave it running
+    python -m harness.dev_server status
+    python -m harness.dev_server down      # stop a server started by ``up``
+    python -m harness.dev_server history   # readiness timings of past runs
+
+Every script opens ``BASE_URL`` first. While Metro is still building the
+web bundle that first load can take minutes, so the first scripts of a
+batch time out or catch the app half loaded. ``harness run`` therefore
+gets the server ready once per batch, before any worker starts:
+
+1. attach to whatever answers Metro's ``/status`` on the ``BASE_URL``
+   port, or start ``npx expo start --web`` in ``app_vendita/``;
+2. fetch the index page and the ``*.bundle`` script it references, the
+   same URL the browser requests. Metro holds that request until the
+   bundle is built, so its duration is the build time; an error page
+   (HTTP 500 with Metro's message) fails the batch before any test runs;
+3. fetch the bundle again: it now comes from Metro's cache, and every
+   worker shares that one warm server.
+
+The timings go to the ``dev_server`` table next to the wall time of the
+tests, so build time never counts as test time. A server started by the
+runner is stopped after the batch; one started with ``up`` (or by hand)
+is attached to and left running, which keeps it warm between batches.
+"""
+
+import argparse
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from . import config
+from .results import ResultsStore
+
+APP_DIR = config.REPO_ROOT / "app_vendita"
+LOG_PATH = config.STATE_DIR / "dev_server.log"
+PID_PATH = config.STATE_DIR / "dev_server.pid"
+MODES = ("auto", "attach", "off")
+BUILD_TIMEOUT_S = 600.0
+POLL_S = 0.5
+STOP_TIMEOUT_S = 10.0
+STATUS_OK = b"packager-status:running"
+BUNDLE_SRC = re.compile(r"""<script[^>]*\ssrc=["']([^"']*\.bundle[^"']*)["']""", re.IGNORECASE)
+
+
+class DevServerError(RuntimeError):
+    pass
+
+
+@dataclass
+class Readiness:
+    base_url: str
+    # "started" when this process launched the server, else "attached".
+    mode: str
+    started_at: float
+    up_ms: float
+    build_ms: float
+    cached_ms: float
+    bundle_url: str
+    bundle_bytes: int
+
+    def summary(self) -> str:
+        return (
+            f"dev server {self.mode} at {self.base_url}: up in {self.up_ms / 1000:.1f}s,"
+            f" bundle built in {self.build_ms / 1000:.1f}s ({self.bundle_bytes / 2**20:.1f} MiB),"
+            f" cached fetch {self.cached_ms / 1000:.2f}s"
+        )
+
+
+def _get(url: str, timeout_s: float) -> Tuple[int, bytes]:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout_s) as resp:
+            return resp.status, resp.read()
+    except urllib.error.HTTPError as exc:
+        return exc.code, exc.read()
+
+
+def is_running(base_url: str = config.BASE_URL) -> bool:
+    try:
+        code, body = _get(urljoin(base_url, "/status"), 2.0)
+    except (OSError, ValueError):
+        return False
+    return code == 200 and STATUS_OK in body
+
+
+def bundle_url(base_url: str, html: str) -> str:
+    match = BUNDLE_SRC.search(html)
+    if not match:
+        raise DevServerError(f"no *.bundle script in the page at {base_url}")
+    return urljoin(base_url, match.group(1))
+
+
+def _log_tail(lines: int = 20) -> str:
+    try:
+        text = LOG_PATH.read_text(encoding="utf-8", errors="replace")
+    except FileNotFoundError:
+        return ""
+    return "\n".join(text.splitlines()[-lines:])
+
+
+def start(base_url: str = config.BASE_URL) -> subprocess.Popen:
+    """Launch ``expo start --web`` on the ``base_url`` port, output to ``LOG_PATH``."""
+    npx = shutil.which("npx")
+    if npx is None:
+        raise DevServerError("npx not found; install Node.js or start the dev server yourself")
+    port = urlparse(base_url).port or 80
+    env = dict(os.environ)
+    # Non-interactive, and no browser window of its own.
+    env.setdefault("CI", "1")
+    env["BROWSER"] = "none"
+    config.STATE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOG_PATH, "ab") as log:
+        return subprocess.Popen(
+            [npx, "expo", "start", "--web", "--port", str(port)],
+            cwd=str(APP_DIR),
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            # Own process group, so stop() also takes down Metro's workers.
+            start_new_session=True,
+        )
+
+
+def stop(pid: int) -> None:
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(pid, signal.SIGTERM)
+        else:
+            os.kill(pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _stop_process(proc: subprocess.Popen) -> None:
+    stop(proc.pid)
+    try:
+        proc.wait(STOP_TIMEOUT_S)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def wait_ready(
+    base_url: str = config.BASE_URL,
+    timeout_s: float = BUILD_TIMEOUT_S,
+    proc: Optional[subprocess.Popen] = None,
+    mode: str = "attached",
+) -> Readiness:
+    """Block until the server answers and the web bundle is built and cached."""
+    started_at = time.time()
+    t0 = time.perf_counter()
+    deadline = t0 + timeout_s
+    while not is_running(base_url):
+        if proc is not None and proc.poll() is not None:
+            raise DevServerError(f"dev server exited with {proc.returncode}\n{_log_tail()}")
+        if time.perf_counter() > deadline:
+            raise DevServerError(f"no dev server at {base_url} after {timeout_s:.0f}s")
+        time.sleep(POLL_S)
+    up_ms = (time.perf_counter() - t0) * 1000.0
+
+    try:
+        code, html = _get(base_url, max(1.0, deadline - time.perf_counter()))
+        if code != 200:
+            raise DevServerError(f"{base_url} answered HTTP {code}")
+        url = bundle_url(base_url, html.decode("utf-8", "replace"))
+
+        t1 = time.perf_counter()
+        code, body = _get(url, max(1.0, deadline - t1))
+        build_ms = (time.perf_counter() - t1) * 1000.0
+        if code != 200:
+            message = body[:500].decode("utf-8", "replace")
+            raise DevServerError(f"bundle failed to build (HTTP {code}): {message}")
+
+        t2 = time.perf_counter()
+        _get(url, max(1.0, deadline - t2))
+        cached_ms = (time.perf_counter() - t2) * 1000.0
+    except OSError as exc:
+        raise DevServerError(f"bundle not ready after {timeout_s:.0f}s: {exc}") from exc
+    return Readiness(base_url, mode, started_at, up_ms, build_ms, cached_ms, url, len(body))
+
+
+@contextmanager
+def serve(
+    mode: str = "auto", base_url: str = config.BASE_URL, timeout_s: float = BUILD_TIMEOUT_S
+) -> Iterator[Optional[Readiness]]:
+    """Ready dev server for the body of the ``with``; ``None`` when ``mode`` is "off".
+
+    "attach" requires a running server; "auto" starts one if there is none
+    and stops it again on exit.
+    """
+    if mode == "off":
+        yield None
+        return
+    proc = None
+    if not is_running(base_url):
+        if mode == "attach":
+            raise DevServerError(f"no dev server at {base_url}")
+        proc = start(base_url)
+    try:
+        yield wait_ready(base_url, timeout_s, proc, "started" if proc else "attached")
+    finally:
+        if proc is not None:
+            _stop_process(proc)
+
+
+def _seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value / 1000:,.1f}"
+
+
+def history_report(rows) -> str:
+    lines = [
+        "| Batch | Started | Mode | Up s | Build s | Cached s | Bundle MiB | Tests s | Error |",
+        "|---|---|---|---|---|---|---|---|---|",
+    ]
+    for row in rows:
+        size = "-" if row["bundle_bytes"] is None else f"{row['bundle_bytes'] / 2**20:.1f}"
+        started = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["started_at"]))
+        lines.append(
+            f"| {row['batch_id']} | {started} | {row['mode']} | {_seconds(row['up_ms'])}"
+            f" | {_seconds(row['build_ms'])} | {_seconds(row['cached_ms'])} | {size}"
+            f" | {_seconds(row['tests_ms'])}"
+            f" | {row['error'][:60]} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.dev_server")
+    parser.add_argument("command", choices=("up", "status", "down", "history"))
+    parser.add_argument("--url", default=config.BASE_URL)
+    parser.add_argument(
+        "--timeout", type=float, default=BUILD_TIMEOUT_S, help="seconds to wait for the bundle"
+    )
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        running = is_running(args.url)
+        print(f"{args.url}: {'running' if running else 'not running'}")
+        return 0 if running else 1
+    if args.command == "history":
+        with ResultsStore() as store:
+            sys.stdout.write(history_report(store.dev_server_rows(args.limit)))
+        return 0
+    if args.command == "down":
+        if not PID_PATH.exists():
+            print("no server started by `up`")
+            return 1
+        stop(int(PID_PATH.read_text().strip()))
+        PID_PATH.unlink()
+        return 0
+
+    proc = None
+    if not is_running(args.url):
+        proc = start(args.url)
+        PID_PATH.write_text(str(proc.pid))
+    try:
+        ready = wait_ready(args.url, args.timeout, proc, "started" if proc else "attached")
+    except DevServerError as exc:
+        if proc is not None:
+            _stop_process(proc)
+            PID_PATH.unlink()
+        print(exc, file=sys.stderr)
+        return 1
+    print(ready.summary())
+    if proc is not None:
+        print(f"left running (pid {proc.pid}, log {LOG_PATH})")
+        print("stop it with `python -m harness.dev_server down`")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
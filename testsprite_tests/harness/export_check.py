@@ -0,0 +1,422 @@
+"""Streaming validation of downloaded Excel exports.
+
+TC014 clicks "Esporta Dati" but nothing ever looks at the file. Under
+``harness run`` every download is now saved to
+``.harness/downloads/<test>/`` and read back as it streams: the sheet XML
+goes through ``iterparse`` one ``<row>`` at a time, so a 500k-row export
+costs the memory of one row plus the shared-string table, never the whole
+workbook. Each download is recorded with its row count, header and
+errors (see ``ResultsStore.downloads``).
+
+Scripts that know what the file should contain compare it with an oracle
+computed here from the same data::
+
+    report = validate(path, SALES_SCHEMA, sales_oracle(entries))
+    assert report.ok, report.errors
+
+The app's export is still a placeholder ("Funzionalità in sviluppo"), so
+:data:`CLIENTS_SCHEMA` (the agenti_clienti import layout) and
+:data:`SALES_SCHEMA` (one row per focus reference per day, as
+``DataAdapter`` produces them) are the contract the export is checked
+against until it exists.
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import posixpath
+import re
+import sys
+import time
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+from xml.etree.ElementTree import iterparse
+
+from . import config
+from .calendar_seed import product_entries
+
+DOWNLOAD_DIR = config.STATE_DIR / "downloads"
+TOLERANCE = 1e-6
+
+_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_CELL_REF = re.compile(r"([A-Z]+)")
+
+
+@dataclass(frozen=True)
+class ExportSchema:
+    name: str
+    columns: Tuple[str, ...]
+    # Columns summed while streaming, for comparison with the oracle.
+    totals: Tuple[str, ...] = ()
+    # Sheet to read; None means the first one.
+    sheet: Optional[str] = None
+
+
+CLIENTS_SCHEMA = ExportSchema(
+    "clients",
+    (
+        "Linea",
+        "Codice Area Manager",
+        "Codice Nam",
+        "Codige Agente",
+        "Nome Agente",
+        "Mail Agente",
+        "Cell Agente",
+        "Insegna",
+        "Codice Cliente",
+        "Cliente",
+        "Cap",
+        "Indirizzo",
+        "Provincia",
+        "Codice provincia",
+        "Latitudine",
+        "Longitudine",
+    ),
+)
+SALES_SCHEMA = ExportSchema(
+    "sales",
+    ("Data", "Punto Vendita", "Referenza", "Venduti", "Scorte", "Ordinati", "Prezzo Netto", "Sell-In"),
+    totals=("Venduti", "Scorte", "Ordinati", "Sell-In"),
+)
+
+
+@dataclass
+class Expected:
+    rows: int
+    totals: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class ExportReport:
+    path: str
+    bytes: int
+    sheet: str = ""
+    columns: List[str] = field(default_factory=list)
+    rows: int = 0
+    totals: Dict[str, float] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+# -- streaming reader ---------------------------------------------------------
+
+
+def _column_index(ref: str) -> int:
+    letters = _CELL_REF.match(ref).group(1)  # type: ignore[union-attr]
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n - 1
+
+
+def sheet_part(zf: zipfile.ZipFile, sheet: Optional[str]) -> Tuple[str, str]:
+    """(sheet name, part path) of ``sheet`` or of the first sheet."""
+    sheets = []
+    with zf.open("xl/workbook.xml") as fh:
+        for _, elem in iterparse(fh):
+            if elem.tag == f"{_MAIN}sheet":
+                sheets.append((elem.get("name"), elem.get(f"{_REL}id")))
+    targets = {}
+    with zf.open("xl/_rels/workbook.xml.rels") as fh:
+        for _, elem in iterparse(fh):
+            if elem.tag == f"{_PKG_REL}Relationship":
+                # Targets are relative to xl/ unless they start at the package root.
+                target = elem.get("Target", "")
+                part = target[1:] if target.startswith("/") else posixpath.join("xl", target)
+                targets[elem.get("Id")] = part
+    for name, rid in sheets:
+        if sheet is None or name == sheet:
+            return name, posixpath.normpath(targets[rid])
+    raise KeyError(f"sheet {sheet!r} not found; workbook has {[n for n, _ in sheets]}")
+
+
+def _si_text(si: Any) -> str:
+    # Plain <t>, or rich-text <r><t> runs; phonetic <rPh> runs are not part of the value.
+    parts = []
+    for child in si:
+        if child.tag == f"{_MAIN}t":
+            parts.append(child.text or "")
+        elif child.tag == f"{_MAIN}r":
+            parts.extend(t.text or "" for t in child.iter(f"{_MAIN}t"))
+    return "".join(parts)
+
+
+def _shared_strings(zf: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    out = []
+    with zf.open("xl/sharedStrings.xml") as fh:
+        for _, elem in iterparse(fh):
+            if elem.tag == f"{_MAIN}si":
+                out.append(_si_text(elem))
+                elem.clear()
+    return out
+
+
+def _number(text: str) -> Any:
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _cell_value(cell: Any, strings: List[str]) -> Any:
+    kind = cell.get("t", "n")
+    if kind == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(f"{_MAIN}t"))
+    v = cell.find(f"{_MAIN}v")
+    if v is None or v.text is None:
+        return None
+    if kind == "s":
+        return strings[int(v.text)]
+    if kind == "b":
+        return v.text == "1"
+    if kind in ("str", "e"):
+        return v.text
+    return _number(v.text)
+
+
+def _iter_sheet(fh: IO[bytes], strings: List[str]) -> Iterator[List[Any]]:
+    sheet_data = None
+    for event, elem in iterparse(fh, events=("start", "end")):
+        if event == "start":
+            if elem.tag == f"{_MAIN}sheetData":
+                sheet_data = elem
+            continue
+        if elem.tag != f"{_MAIN}row":
+            continue
+        values: List[Any] = []
+        for i, cell in enumerate(elem.iter(f"{_MAIN}c")):
+            ref = cell.get("r")
+            col = _column_index(ref) if ref else i
+            values.extend([None] * (col - len(values)))
+            values.append(_cell_value(cell, strings))
+        yield values
+        # Drop the finished row so memory does not grow with the sheet.
+        if sheet_data is not None:
+            sheet_data.clear()
+        else:
+            elem.clear()
+
+
+def iter_rows(path: Path, sheet: Optional[str] = None) -> Iterator[List[Any]]:
+    """Rows of one sheet as value lists, header included, read as a stream."""
+    with zipfile.ZipFile(path) as zf:
+        _, part = sheet_part(zf, sheet)
+        strings = _shared_strings(zf)
+        with zf.open(part) as fh:
+            yield from _iter_sheet(fh, strings)
+
+
+# -- validation ---------------------------------------------------------------
+
+
+def _as_float(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def validate(
+    path: Path,
+    schema: Optional[ExportSchema] = None,
+    expected: Optional[Expected] = None,
+    tolerance: float = TOLERANCE,
+    max_errors: int = 20,
+) -> ExportReport:
+    """Stream ``path`` and check it against ``schema`` and ``expected``.
+
+    Without a schema only the container is checked: a readable workbook
+    with a header row. Numeric errors are reported per row up to
+    ``max_errors``; the count of the rest is appended.
+    """
+    path = Path(path)
+    result = ExportReport(str(path), path.stat().st_size if path.exists() else 0)
+    extra = 0
+
+    def error(message: str) -> None:
+        nonlocal extra
+        if len(result.errors) < max_errors:
+            result.errors.append(message)
+        else:
+            extra += 1
+
+    try:
+        with zipfile.ZipFile(path) as zf:
+            result.sheet, part = sheet_part(zf, schema.sheet if schema else None)
+            strings = _shared_strings(zf)
+            with zf.open(part) as fh:
+                rows = _iter_sheet(fh, strings)
+                header = next(rows, None)
+                if header is None:
+                    error("sheet is empty")
+                    return result
+                result.columns = [str(h) if h is not None else "" for h in header]
+                summed: Dict[str, Tuple[int, List[float]]] = {}
+                if schema:
+                    if tuple(result.columns) != schema.columns:
+                        missing = [c for c in schema.columns if c not in result.columns]
+                        unexpected = [c for c in result.columns if c not in schema.columns]
+                        error(f"columns differ from {schema.name}: missing {missing}, extra {unexpected}")
+                    summed = {
+                        c: (result.columns.index(c), []) for c in schema.totals if c in result.columns
+                    }
+                for n, row in enumerate(rows, start=2):
+                    if not any(v not in (None, "") for v in row):
+                        continue
+                    result.rows += 1
+                    for name, (idx, parts) in summed.items():
+                        raw = row[idx] if idx < len(row) else None
+                        value = _as_float(raw)
+                        if value is None:
+                            error(f"row {n}: {name} is not a number ({raw!r})")
+                            continue
+                        parts.append(value)
+                        # Fold partial sums so memory stays flat on long sheets.
+                        if len(parts) >= 4096:
+                            parts[:] = [math.fsum(parts)]
+                result.totals = {name: math.fsum(parts) for name, (_, parts) in summed.items()}
+    except (zipfile.BadZipFile, KeyError, ValueError, SyntaxError) as exc:
+        error(f"not a readable xlsx: {type(exc).__name__}: {exc}")
+        return result
+
+    if expected is not None:
+        if result.rows != expected.rows:
+            error(f"rows: expected {expected.rows}, got {result.rows}")
+        for name, want in expected.totals.items():
+            got = result.totals.get(name)
+            if got is None:
+                error(f"{name}: column missing, expected total {want:.2f}")
+            elif abs(got - want) > tolerance * max(1.0, abs(want)):
+                error(f"{name}: expected total {want:.6f}, got {got:.6f}")
+    if extra:
+        result.errors.append(f"... and {extra} more")
+    return result
+
+
+# -- oracles ------------------------------------------------------------------
+
+
+def clients_oracle(rows: Sequence[Mapping[str, Any]]) -> Expected:
+    """A clients export has one row per master-data row."""
+    return Expected(len(rows))
+
+
+def sales_oracle(entries: Sequence[Mapping[str, Any]]) -> Expected:
+    """Rows and totals of a sales export of ``entries`` (calendar entry dicts).
+
+    One row per focus reference per entry, valued like the progressive
+    calculation: sell-in is ordered pieces times net price.
+    """
+    rows = 0
+    parts: Dict[str, List[float]] = {c: [] for c in SALES_SCHEMA.totals}
+    for entry in entries:
+        for p in product_entries(entry):
+            rows += 1
+            parts["Venduti"].append(p["vendite"])
+            parts["Scorte"].append(p["scorte"])
+            parts["Ordinati"].append(p["ordinati"])
+            parts["Sell-In"].append(p["ordinati"] * p["prezzoNetto"])
+    return Expected(rows, {c: math.fsum(v) for c, v in parts.items()})
+
+
+# -- download hook ------------------------------------------------------------
+
+
+@dataclass
+class DownloadWatcher:
+    """Saves and validates every download of the pages it is attached to."""
+
+    directory: Path = DOWNLOAD_DIR
+    current_step: Callable[[], Optional[int]] = lambda: None
+    records: List[Dict[str, Any]] = field(default_factory=list, init=False)
+
+    def __post_init__(self) -> None:
+        self._pages: Set[int] = set()
+        self._pending: Set[asyncio.Task] = set()
+        self._flushed = 0
+
+    def attach(self, page: Any) -> "DownloadWatcher":
+        if id(page) not in self._pages:
+            self._pages.add(id(page))
+            page.on("download", self._on_download)
+        return self
+
+    def _on_download(self, download: Any) -> None:
+        task = asyncio.ensure_future(self._save(download, self.current_step()))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _save(self, download: Any, step: Optional[int]) -> None:
+        name = download.suggested_filename or "download"
+        target = self.directory / f"{int(time.time() * 1000)}-{name}"
+        record: Dict[str, Any] = {"step": step, "filename": name, "path": str(target)}
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            await download.save_as(str(target))
+            if target.suffix.lower() in (".xlsx", ".xlsm"):
+                # Parsing is CPU-bound; keep the page's event loop free.
+                result = await asyncio.get_running_loop().run_in_executor(None, validate, target)
+                record.update(
+                    bytes=result.bytes, rows=result.rows, columns=result.columns, errors=result.errors
+                )
+            else:
+                record.update(bytes=target.stat().st_size, rows=None, columns=[], errors=[])
+        except Exception as exc:
+            record.update(bytes=0, rows=None, columns=[], errors=[f"{type(exc).__name__}: {exc}"])
+        self.records.append(record)
+
+    async def settle(self) -> None:
+        """Wait for downloads still being saved or validated."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    async def flush(self, emit: Callable[..., None]) -> None:
+        """Emit one ``download`` event per download not yet flushed."""
+        await self.settle()
+        for record in self.records[self._flushed :]:
+            emit("download", **record)
+        self._flushed = len(self.records)
+
+
+def downloads_dir(test_id: Optional[str] = None) -> Path:
+    return DOWNLOAD_DIR / (test_id or os.environ.get(config.ENV_TEST_ID) or "adhoc")
+
+
+def report(reports: Sequence[ExportReport]) -> str:
+    lines = ["| File | Sheet | Rows | Columns | Errors |", "|---|---|---|---|---|"]
+    for r in reports:
+        lines.append(
+            f"| {Path(r.path).name} | {r.sheet} | {r.rows:,} | {len(r.columns)} | "
+            f"{'; '.join(r.errors) if r.errors else 'ok'} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+SCHEMAS = {s.name: s for s in (CLIENTS_SCHEMA, SALES_SCHEMA)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.export_check")
+    parser.add_argument("files", nargs="+", type=Path)
+    parser.add_argument("--schema", choices=sorted(SCHEMAS), help="expected column layout")
+    args = parser.parse_args(argv)
+
+    reports = [validate(path, SCHEMAS.get(args.schema)) for path in args.files]
+    sys.stdout.write(report(reports))
+    return 1 if any(not r.ok for r in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
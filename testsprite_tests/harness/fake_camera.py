@@ -0,0 +1,229 @@
+"""Fake camera for photo tests: a generated Y4M clip and per-test permissions.
+
+    python -m harness.fake_camera build [--width 640 --height 480 --frames 30] [--force]
+    python -m harness.fake_camera probe
+
+Chromium replaces every capture device with a file when launched with
+``--use-fake-device-for-media-stream`` and
+``--use-file-for-fake-video-capture=<clip.y4m>``. No device driver is
+involved and no OS prompt shows up, so camera flows run headless,
+side by side and give the same frames every time. The clip is written by
+:func:`write_y4m` without any imaging library: colour bars with a white
+bar that moves one step per frame, plus a block row that encodes the
+frame number. It is cached under ``.harness/fake_camera/``.
+
+Whether the page may use the camera is decided per browser context:
+``grant`` calls ``context.grant_permissions(["camera"])`` and ``deny``
+clears the permissions. Chromium headless then refuses the request, the
+way a user tapping "Block" would. ``--use-fake-ui-for-media-stream`` is
+deliberately not passed, because it would accept every prompt.
+
+``harness run --fake-camera`` turns this on for every script. The
+policy for each test comes from :func:`policy_for`: tests about denied
+permissions (TC010) get ``deny``, all others get ``grant``. Tools that
+drive the app themselves use :func:`camera_session`.
+
+On web ``PhotoService`` takes photos from the file chooser
+(``supportsCameraCapture`` is mobile-only), so the fake device serves
+``getUserMedia`` and the permission checks, not ``selectPhoto``.
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, List, Optional, Sequence, Tuple
+
+from . import config, session
+
+CAMERA_DIR = config.STATE_DIR / "fake_camera"
+WIDTH, HEIGHT = 640, 480
+FPS = 30
+FRAMES = 30
+GRANT = "grant"
+DENY = "deny"
+POLICIES = (GRANT, DENY)
+# Test ids that exercise the denied-permission path.
+DENY_PATTERN = re.compile(r"denied|without_permission|permission_denied", re.IGNORECASE)
+
+# (Y, U, V) of the usual eight colour bars in BT.601 limited range (Y 16-235,
+# U/V 16-240). C420jpeg in the header only sets the chroma siting.
+BARS = (
+    (235, 128, 128),
+    (210, 16, 146),
+    (170, 166, 16),
+    (145, 54, 34),
+    (106, 202, 222),
+    (81, 90, 240),
+    (41, 240, 110),
+    (16, 128, 128),
+)
+# Frame-number blocks along the top edge: one bit per block, white is 1.
+COUNTER_BITS = 8
+COUNTER_ROWS = 16
+
+PROBE_JS = """
+async () => {
+  let state = 'unsupported';
+  try {
+    state = (await navigator.permissions.query({name: 'camera'})).state;
+  } catch (e) {}
+  const t0 = performance.now();
+  try {
+    const stream = await navigator.mediaDevices.getUserMedia({video: true});
+    const track = stream.getVideoTracks()[0];
+    const settings = track.getSettings();
+    track.stop();
+    return {state, ok: true, ms: performance.now() - t0, label: track.label,
+            width: settings.width, height: settings.height};
+  } catch (e) {
+    return {state, ok: false, ms: performance.now() - t0, error: e.name};
+  }
+}
+"""
+
+
+def _frame(width: int, height: int, idx: int) -> bytes:
+    """One 4:2:0 frame: bars, the moving bar and the frame-number blocks."""
+    bar_w = width // len(BARS)
+    moving = (idx * bar_w // 4) % width
+    luma = bytearray()
+    for x in range(width):
+        luma.append(235 if moving <= x < moving + bar_w // 4 else BARS[min(x // bar_w, len(BARS) - 1)][0])
+    block = width // COUNTER_BITS
+    counter = bytearray(width)
+    for bit in range(COUNTER_BITS):
+        value = 235 if idx >> (COUNTER_BITS - 1 - bit) & 1 else 16
+        counter[bit * block:(bit + 1) * block] = bytes([value]) * block
+    rows = min(COUNTER_ROWS, height)
+    y_plane = bytes(counter) * rows + bytes(luma) * (height - rows)
+
+    cw, ch = (width + 1) // 2, (height + 1) // 2
+    planes = []
+    for channel in (1, 2):
+        row = bytes(BARS[min(2 * x // bar_w, len(BARS) - 1)][channel] for x in range(cw))
+        crows = min((rows + 1) // 2, ch)
+        planes.append(bytes([128]) * cw * crows + row * (ch - crows))
+    return y_plane + planes[0] + planes[1]
+
+
+def write_y4m(path: Path, width: int = WIDTH, height: int = HEIGHT, frames: int = FRAMES,
+              fps: int = FPS) -> Path:
+    """Write a looping ``frames``-long clip to ``path`` (atomically)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(f"YUV4MPEG2 W{width} H{height} F{fps}:1 Ip A1:1 C420jpeg\n".encode("ascii"))
+        for idx in range(frames):
+            fh.write(b"FRAME\n")
+            fh.write(_frame(width, height, idx))
+    tmp.replace(path)
+    return path
+
+
+def clip_path(width: int = WIDTH, height: int = HEIGHT, frames: int = FRAMES, fps: int = FPS) -> Path:
+    return CAMERA_DIR / f"camera_{width}x{height}_{frames}f_{fps}fps.y4m"
+
+
+def ensure(width: int = WIDTH, height: int = HEIGHT, frames: int = FRAMES, fps: int = FPS,
+           force: bool = False) -> Path:
+    """Return the cached clip, writing it first if needed."""
+    path = clip_path(width, height, frames, fps)
+    if force or not path.exists():
+        write_y4m(path, width, height, frames, fps)
+    return path
+
+
+def launch_args(clip: Optional[Path] = None) -> Tuple[str, ...]:
+    """Chromium flags that replace the capture devices with ``clip``."""
+    return (
+        "--use-fake-device-for-media-stream",
+        f"--use-file-for-fake-video-capture={clip or ensure()}",
+    )
+
+
+def policy_for(test_id: str) -> str:
+    return DENY if DENY_PATTERN.search(test_id) else GRANT
+
+
+async def apply(context: Any, policy: str, origin: str = config.BASE_URL) -> None:
+    """Grant or deny the camera to ``origin`` in ``context``."""
+    if policy not in POLICIES:
+        raise ValueError(f"unknown camera policy {policy!r}; expected one of {', '.join(POLICIES)}")
+    if policy == GRANT:
+        await context.grant_permissions(["camera"], origin=origin)
+    else:
+        await context.clear_permissions()
+
+
+@asynccontextmanager
+async def camera_session(
+    policy: str = GRANT,
+    clip: Optional[Path] = None,
+    args: Sequence[str] = (),
+    **kwargs: Any,
+) -> AsyncIterator[session.Session]:
+    """:func:`harness.session.browser_session` with the fake camera."""
+    async with session.browser_session(args=[*launch_args(clip), *args], **kwargs) as s:
+        await apply(s.context, policy)
+        yield s
+
+
+@dataclass
+class Probe:
+    policy: str
+    state: str
+    ok: bool
+    ms: float
+    detail: str
+
+
+async def probe(policies: Sequence[str] = POLICIES) -> List[Probe]:
+    results = []
+    for policy in policies:
+        async with camera_session(policy, default_timeout_ms=30000) as s:
+            await session.open_app(s.page)
+            out = await s.page.evaluate(PROBE_JS)
+        detail = (
+            f"{out['label']} {out['width']}x{out['height']}" if out["ok"] else out["error"]
+        )
+        results.append(Probe(policy, out["state"], out["ok"], out["ms"], detail))
+    return results
+
+
+def report(results: Sequence[Probe]) -> str:
+    lines = ["| Policy | Permission | getUserMedia | ms | Detail |", "|---|---|---|---|---|"]
+    for r in results:
+        outcome = "stream" if r.ok else "rejected"
+        lines.append(f"| {r.policy} | {r.state} | {outcome} | {r.ms:,.0f} | {r.detail} |")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.fake_camera")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="write the Y4M clip (cached)")
+    build.add_argument("--width", type=int, default=WIDTH)
+    build.add_argument("--height", type=int, default=HEIGHT)
+    build.add_argument("--frames", type=int, default=FRAMES)
+    build.add_argument("--fps", type=int, default=FPS)
+    build.add_argument("--force", action="store_true", help="rewrite even if cached")
+    sub.add_parser("probe", help="open the app with each policy and call getUserMedia")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if args.width % 2 or args.height % 2:
+            parser.error("width and height must be even for 4:2:0")
+        print(ensure(args.width, args.height, args.frames, args.fps, args.force))
+        return 0
+    results = asyncio.run(probe())
+    sys.stdout.write(report(results))
+    expected = {GRANT: True, DENY: False}
+    return 0 if all(r.ok == expected[r.policy] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Calendar entries written to Firestore through the app's repository.
+
+The seeding in ``calendar_seed`` goes through the store only; the tools
+that measure sync (``multi_user``, ``chat_rig``) need real documents.
+These go through ``FirebaseCalendarRepository`` from the test hooks, so
+the page must be logged in and the hooks loaded.
+"""
+
+from typing import Any, Mapping
+
+CREATE_ENTRY_JS = """
+async (entry) => {
+  const repo = new window.__appTestHooks.FirebaseCalendarRepository();
+  // Stored as a Date: getEntries and the listeners read it back with toDate().
+  return repo.addEntry({...entry, date: new Date(entry.date)});
+}
+"""
+
+DELETE_ENTRY_JS = "async (id) => new window.__appTestHooks.FirebaseCalendarRepository().deleteEntry(id)"
+
+
+async def create_entry(page: Any, entry: Mapping[str, Any]) -> str:
+    """Add ``entry`` to Firestore with ``addEntry`` and return its id.
+
+    Drop ``id``, ``createdAt`` and ``updatedAt`` first: ``addEntry`` stamps
+    them itself.
+    """
+    return await page.evaluate(CREATE_ENTRY_JS, dict(entry))
+
+
+async def delete_entry(page: Any, entry_id: str) -> None:
+    await page.evaluate(DELETE_ENTRY_JS, entry_id)
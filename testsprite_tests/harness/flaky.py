@@ -0,0 +1,156 @@
+"""Flakiness scoring over stored run history.
+
+A test is *flaky* when its outcome changes without the app changing.
+Two signals are combined:
+
+* flip rate: pass/fail transitions between consecutive runs of the same
+  app commit, divided by the number of transitions observed;
+* retry-pass rate: share of batches where the first attempt failed and a
+  later attempt in the same batch passed.
+
+The score is the larger of the two, so either symptom alone is enough to
+quarantine a test. Tests are released once they drop below a lower
+threshold, which keeps a borderline test from bouncing between lanes.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List
+
+from .results import PASSED, ResultsStore
+
+QUARANTINE_THRESHOLD = 0.2
+RELEASE_THRESHOLD = 0.05
+MIN_RUNS = 3
+
+
+@dataclass
+class FlakinessScore:
+    test_id: str
+    runs: int
+    flips: int
+    transitions: int
+    retry_passes: int
+    retried_batches: int
+
+    @property
+    def flip_rate(self) -> float:
+        return self.flips / self.transitions if self.transitions else 0.0
+
+    @property
+    def retry_pass_rate(self) -> float:
+        return self.retry_passes / self.retried_batches if self.retried_batches else 0.0
+
+    @property
+    def score(self) -> float:
+        return max(self.flip_rate, self.retry_pass_rate)
+
+
+@dataclass
+class FlakyStep:
+    test_id: str
+    step_key: str
+    passes: int
+    failures: int
+
+    @property
+    def failure_rate(self) -> float:
+        total = self.passes + self.failures
+        return self.failures / total if total else 0.0
+
+
+def score_tests(store: ResultsStore) -> Dict[str, FlakinessScore]:
+    by_commit: Dict[tuple, List[bool]] = defaultdict(list)
+    by_batch: Dict[tuple, List[tuple]] = defaultdict(list)
+    counts: Dict[str, int] = defaultdict(int)
+
+    for row in store.runs():
+        passed = row["status"] == PASSED
+        by_commit[(row["test_id"], row["app_commit"])].append(passed)
+        by_batch[(row["test_id"], row["batch_id"])].append((row["attempt"], passed))
+        counts[row["test_id"]] += 1
+
+    scores = {
+        test_id: FlakinessScore(test_id, runs, 0, 0, 0, 0)
+        for test_id, runs in counts.items()
+    }
+    for (test_id, _commit), outcomes in by_commit.items():
+        s = scores[test_id]
+        s.transitions += max(len(outcomes) - 1, 0)
+        s.flips += sum(1 for a, b in zip(outcomes, outcomes[1:]) if a != b)
+    for (test_id, _batch), attempts in by_batch.items():
+        attempts.sort()
+        if len(attempts) < 2 or attempts[0][1]:
+            continue
+        s = scores[test_id]
+        s.retried_batches += 1
+        if any(passed for _attempt, passed in attempts[1:]):
+            s.retry_passes += 1
+    return scores
+
+
+def update_quarantine(
+    store: ResultsStore,
+    threshold: float = QUARANTINE_THRESHOLD,
+    release: float = RELEASE_THRESHOLD,
+    min_runs: int = MIN_RUNS,
+) -> Dict[str, List[str]]:
+    """Move tests in and out of quarantine. Returns what changed."""
+    scores = score_tests(store)
+    current = store.quarantined()
+    changes: Dict[str, List[str]] = {"added": [], "released": []}
+    for test_id, s in scores.items():
+        if s.runs < min_runs:
+            continue
+        reason = f"flip_rate={s.flip_rate:.2f} retry_pass_rate={s.retry_pass_rate:.2f}"
+        if s.score >= threshold:
+            if test_id not in current:
+                changes["added"].append(test_id)
+            store.set_quarantine(test_id, s.score, reason)
+        elif test_id in current and s.score < release:
+            store.release_quarantine(test_id)
+            changes["released"].append(test_id)
+    return changes
+
+
+def flaky_steps(store: ResultsStore, limit: int = 10) -> List[FlakyStep]:
+    """Steps that both passed and failed on the same app commit."""
+    tally: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0])
+    for row in store.step_rows():
+        key = (row["test_id"], row["app_commit"], row["step_key"])
+        tally[key][0 if row["status"] == PASSED else 1] += 1
+
+    merged: Dict[tuple, FlakyStep] = {}
+    for (test_id, _commit, step_key), (passes, failures) in tally.items():
+        if not passes or not failures:
+            continue
+        step = merged.setdefault(
+            (test_id, step_key), FlakyStep(test_id, step_key, 0, 0)
+        )
+        step.passes += passes
+        step.failures += failures
+    ranked = sorted(
+        merged.values(), key=lambda s: (s.failures, s.failure_rate), reverse=True
+    )
+    return ranked[:limit]
+
+
+def report(store: ResultsStore, limit: int = 10) -> str:
+    scores = sorted(score_tests(store).values(), key=lambda s: s.score, reverse=True)
+    quarantined = store.quarantined()
+    lines = ["# Flaky test report", "", "| Test | Runs | Flip rate | Retry-pass rate | Score | Lane |"]
+    lines.append("|---|---|---|---|---|---|")
+    for s in scores[:limit]:
+        lane = "quarantine" if s.test_id in quarantined else "blocking"
+        lines.append(
+            f"| {s.test_id} | {s.runs} | {s.flip_rate:.2f} | {s.retry_pass_rate:.2f}"
+            f" | {s.score:.2f} | {lane} |"
+        )
+    lines += ["", "## Top flaky steps", "", "| Test | Step | Failures | Failure rate |"]
+    lines.append("|---|---|---|---|")
+    for step in flaky_steps(store, limit):
+        lines.append(
+            f"| {step.test_id} | `{step.step_key}` | {step.failures}"
+            f" | {step.failure_rate:.2f} |"
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,214 @@
+"""Self-healing locators backed by a DOM fingerprint index.
+
+On passing runs the instrumentation records a fingerprint of each element
+a step acted on (tag, text, role, testID, a few attributes and the
+ancestor chain). When a selector later stops matching, one
+``page.evaluate`` scores every element in the document against the stored
+fingerprint and, if the best candidate is close enough, the step is
+retried on it. Every heal is reported so the script or registry can be
+fixed for real.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .config import ENV_FINGERPRINTS, ENV_TEST_ID, STATE_DIR
+from .results import is_type_name
+
+FINGERPRINTS_FILE = STATE_DIR / "fingerprints.json"
+
+# Interactions worth healing; reads such as all_text_contents are not.
+HEALABLE = frozenset(
+    {"click", "dblclick", "fill", "type", "press", "check", "uncheck", "hover", "select_option"}
+)
+MIN_SCORE = 0.6
+# Fingerprints older than this are captured again on the next pass.
+REFRESH_S = 7 * 24 * 3600.0
+
+FINGERPRINT_JS = """
+(el) => {
+  const attr = (e, name) => (e.getAttribute && e.getAttribute(name)) || '';
+  const sig = (e) => ({
+    tag: e.tagName.toLowerCase(),
+    testid: attr(e, 'data-testid'),
+    role: attr(e, 'role'),
+    aria: attr(e, 'aria-label'),
+  });
+  const ancestors = [];
+  for (let p = el.parentElement; p && p !== document.body && ancestors.length < 5; p = p.parentElement) {
+    ancestors.push(sig(p));
+  }
+  return {
+    ...sig(el),
+    text: (el.innerText || el.value || '').trim().slice(0, 120),
+    placeholder: attr(el, 'placeholder'),
+    type: attr(el, 'type'),
+    name: attr(el, 'name'),
+    ancestors,
+  };
+}
+"""
+
+# Scores every element against the fingerprint in a single pass and returns
+# the best candidate with a selector that addresses it.
+HEAL_JS = """
+([fp, minScore]) => {
+  const attr = (e, name) => (e.getAttribute && e.getAttribute(name)) || '';
+  const words = (s) => new Set(s.toLowerCase().split(/\\s+/).filter(Boolean));
+  const jaccard = (a, b) => {
+    if (!a.size && !b.size) return 1;
+    let n = 0; a.forEach((w) => { if (b.has(w)) n++; });
+    return n / (a.size + b.size - n);
+  };
+  const fpWords = words(fp.text || '');
+  const sameSig = (a, b) => a.tag === b.tag && a.testid === b.testid && a.role === b.role && a.aria === b.aria;
+
+  const weights = [];
+  const add = (w, present) => { if (present) weights.push(w); };
+  add(5, fp.testid); add(3, fp.aria); add(3, fp.text); add(2, fp.placeholder);
+  add(1, fp.role); add(1, fp.type); add(1, fp.name); add(1, true); add(2, fp.ancestors.length);
+  const maxScore = weights.reduce((a, b) => a + b, 0);
+
+  let best = null, bestScore = 0;
+  for (const el of document.body.querySelectorAll('*')) {
+    const rect = el.getBoundingClientRect();
+    if (!rect.width || !rect.height) continue;
+    let s = 0;
+    if (el.tagName.toLowerCase() === fp.tag) s += 1;
+    if (fp.testid && attr(el, 'data-testid') === fp.testid) s += 5;
+    if (fp.aria && attr(el, 'aria-label') === fp.aria) s += 3;
+    if (fp.role && attr(el, 'role') === fp.role) s += 1;
+    if (fp.placeholder && attr(el, 'placeholder') === fp.placeholder) s += 2;
+    if (fp.type && attr(el, 'type') === fp.type) s += 1;
+    if (fp.name && attr(el, 'name') === fp.name) s += 1;
+    if (fp.text) {
+      const text = (el.innerText || el.value || '').trim().slice(0, 120);
+      s += text === fp.text ? 3 : 2 * jaccard(fpWords, words(text));
+    }
+    if (fp.ancestors.length) {
+      let p = el.parentElement, hits = 0;
+      for (const a of fp.ancestors) {
+        if (!p) break;
+        if (sameSig(a, {tag: p.tagName.toLowerCase(), testid: attr(p, 'data-testid'),
+                        role: attr(p, 'role'), aria: attr(p, 'aria-label')})) hits++;
+        p = p.parentElement;
+      }
+      s += 2 * hits / fp.ancestors.length;
+    }
+    if (s > bestScore) { best = el; bestScore = s; }
+  }
+  const score = maxScore ? bestScore / maxScore : 0;
+  if (!best || score < minScore) return null;
+
+  const testid = attr(best, 'data-testid');
+  if (testid && document.querySelectorAll(`[data-testid="${testid}"]`).length === 1) {
+    return {selector: `[data-testid="${testid}"]`, score};
+  }
+  const steps = [];
+  for (let e = best; e && e.nodeType === 1; e = e.parentElement) {
+    let i = 1;
+    for (let s = e.previousElementSibling; s; s = s.previousElementSibling) {
+      if (s.tagName === e.tagName) i++;
+    }
+    steps.unshift(`${e.tagName.toLowerCase()}[${i}]`);
+  }
+  return {selector: 'xpath=/' + steps.join('/'), score};
+}
+"""
+
+
+class FingerprintIndex:
+    """Selector -> fingerprint map for one test, handed over by the runner."""
+
+    def __init__(self, entries: Optional[Dict[str, dict]] = None):
+        self.entries = entries or {}
+        self._fresh: set = set()
+
+    @classmethod
+    def from_env(cls) -> "FingerprintIndex":
+        path = os.environ.get(ENV_FINGERPRINTS)
+        test_id = os.environ.get(ENV_TEST_ID)
+        if not path or not test_id:
+            return cls()
+        try:
+            with open(path, encoding="utf-8") as fh:
+                return cls(json.load(fh).get(test_id))
+        except (OSError, ValueError, AttributeError):
+            return cls()
+
+    def get(self, selector: str) -> Optional[dict]:
+        """The fingerprint captured for exactly ``selector``, if any.
+
+        A type-name key (``Locator``) is shared by unrelated elements, and an
+        entry recorded for another selector describes another element;
+        neither is used to heal.
+        """
+        if is_type_name(selector):
+            return None
+        entry = self.entries.get(selector)
+        if not entry or entry.get("selector", selector) != selector:
+            return None
+        return entry["fingerprint"]
+
+    def needs_capture(self, selector: str) -> bool:
+        if is_type_name(selector) or selector in self._fresh:
+            return False
+        entry = self.entries.get(selector)
+        return entry is None or time.time() - entry["updated_at"] > REFRESH_S
+
+    def remember(self, selector: str, fingerprint: dict) -> None:
+        self.entries[selector] = {
+            "selector": selector,
+            "fingerprint": fingerprint,
+            "updated_at": time.time(),
+        }
+        self._fresh.add(selector)
+
+
+def save_index(entries: Dict[str, Dict[str, dict]], path: Path = FINGERPRINTS_FILE) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(entries, fh)
+    return path
+
+
+async def guarded(
+    locator: Any,
+    selector: str,
+    method: Callable,
+    args: tuple,
+    kwargs: dict,
+    index: FingerprintIndex,
+    emit: Callable[..., None],
+) -> Any:
+    """Run one locator action, fingerprinting on success and healing a miss."""
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    timeout = kwargs.get("timeout")
+    miss: Optional[BaseException] = None
+    if index.needs_capture(selector):
+        # Doubles as the existence check: a missing element times out here.
+        try:
+            fingerprint = await locator.evaluate(FINGERPRINT_JS, timeout=timeout)
+        except PlaywrightTimeoutError as exc:
+            miss = exc
+        else:
+            index.remember(selector, fingerprint)
+            emit("fingerprint", selector=selector, fingerprint=fingerprint)
+    if miss is None:
+        try:
+            return await method(locator, *args, **kwargs)
+        except PlaywrightTimeoutError as exc:
+            miss = exc
+
+    fingerprint = index.get(selector)
+    if fingerprint is None:
+        raise miss
+    candidate = await locator.page.evaluate(HEAL_JS, [fingerprint, MIN_SCORE])
+    if candidate is None:
+        raise miss
+    emit("heal", selector=selector, healed=candidate["selector"], score=candidate["score"])
+    return await method(locator.page.locator(candidate["selector"]), *args, **kwargs)
@@ -0,0 +1,391 @@
+"""Excel import throughput: 1k to 500k rows in the agenti_clienti schema.
+
+    python -m harness.import_bench [--sizes 1000,10000,100000,500000] [--firestore]
+
+The web app has no file import on the settings page. Rows reach it through
+``upload-excel-data.js`` (SheetJS, then one Firestore ``writeBatch``), and
+the app then normalises them (``useFirebaseExcelData``), chunks them
+(``useOptimizedExcelData``, mobile config) and loads them into
+``masterDataStore``. This benchmark runs that pipeline in the app's page
+with the app's own ``xlsx`` dependency:
+
+1. an xlsx file is generated here, cached under ``.harness/import_bench``;
+2. it reaches the page through ``set_input_files`` on a file input the
+   harness adds, as a browser upload would;
+3. the page times each stage: ``read``, ``parse``, ``sheet_to_json``,
+   ``normalize``, ``chunks`` (100 rows per chunk, including the per-chunk
+   array copy) and ``store`` (``setMasterData`` with filters and persist);
+4. with ``--firestore``, also ``FirebaseCalendarRepository.saveExcelData``.
+   That call **deletes and rewrites** the ``excelData`` collection, so use
+   it only against a test project or the emulator.
+
+Each size runs in a fresh page. Heap is read from ``performance.memory``
+at the end of every stage; stages run on the main thread, so this is the
+peak of what each stage keeps alive.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from xml.sax.saxutils import escape
+
+from . import config, session
+from .app_metrics import TEST_HOOKS_JS
+from .snapshots import AGENTI_CLIENTI
+
+SIZES = (1_000, 10_000, 100_000, 500_000)
+BENCH_DIR = config.STATE_DIR / "import_bench"
+XLSX_JS = config.REPO_ROOT / "app_vendita" / "node_modules" / "xlsx" / "dist" / "xlsx.full.min.js"
+# EXCEL_DATA_CONFIG.MOBILE in src/utils/platformConfig.ts.
+CHUNK_SIZE = 100
+PROCESSING_DELAY_MS = 10
+# Firestore rejects a writeBatch with more writes than this.
+FIRESTORE_BATCH_LIMIT = 500
+
+COLUMNS = (
+    "Linea",
+    "Codice Area Manager",
+    "Codice Nam",
+    "Codige Agente",
+    "Nome Agente",
+    "Mail Agente",
+    "Cell Agente",
+    "Insegna",
+    "Codice Cliente",
+    "Cliente",
+    "Cap",
+    "Indirizzo",
+    "Provincia",
+    "Codice provincia",
+    "Latitudine",
+    "Longitudine",
+)
+INPUT_ID = "__harness_import"
+HOOKS_READY_JS = "() => !!(window.__appTestHooks && window.__appTestHooks.masterDataStore)"
+LAUNCH_ARGS = ("--enable-precise-memory-info",)
+
+INPUT_JS = """
+(id) => {
+  let input = document.getElementById(id);
+  if (!input) {
+    input = document.createElement('input');
+    input.type = 'file';
+    input.id = id;
+    input.style.display = 'none';
+    document.body.appendChild(input);
+  }
+}
+"""
+
+IMPORT_JS = """
+async ({id, chunkSize, delayMs, firestore}) => {
+  const hooks = window.__appTestHooks || {};
+  const file = document.getElementById(id).files[0];
+  const heap = () => (performance.memory ? performance.memory.usedJSHeapSize : 0);
+  const stages = [];
+  const stage = async (name, fn) => {
+    const t0 = performance.now();
+    try {
+      const out = await fn();
+      stages.push({name, ms: performance.now() - t0, heap: heap()});
+      return out;
+    } catch (e) {
+      stages.push({name, ms: performance.now() - t0, heap: heap(), error: String(e)});
+      throw e;
+    }
+  };
+  // useFirebaseExcelData's normalisation.
+  const normalize = (row, index) => ({
+    id: row.id || `excel_${index}`,
+    linea: row.Linea || '',
+    codiceAreaManager: row['Codice Area Manager'] || '',
+    amCode: row['Codice Area Manager'] || '',
+    codiceNam: row['Codice Nam'] || '',
+    namCode: row['Codice Nam'] || '',
+    codiceAgente: row['Codige Agente'] || '',
+    agenteCode: row['Codige Agente'] || '',
+    nomeAgente: row['Nome Agente'] || '',
+    insegna: row.Insegna || '',
+    insegnaCliente: row.Insegna || '',
+    codiceCliente: String(row['Codice Cliente']) || '',
+    cliente: row.Cliente || '',
+    ...row,
+  });
+  let rows = [];
+  try {
+    const buf = await stage('read', () => file.arrayBuffer());
+    const wb = await stage('parse', () => XLSX.read(buf, {type: 'array'}));
+    rows = await stage('sheet_to_json', () => XLSX.utils.sheet_to_json(wb.Sheets[wb.SheetNames[0]]));
+    const normalized = await stage('normalize', () => rows.map(normalize));
+    // useOptimizedExcelData: push each chunk, then copy the whole array for setState.
+    let waited = 0;
+    await stage('chunks', async () => {
+      const processed = [];
+      let copy = [];
+      for (let i = 0; i < normalized.length; i += chunkSize) {
+        processed.push(...normalized.slice(i, i + chunkSize));
+        copy = [...processed];
+        if (delayMs > 0 && i + chunkSize < normalized.length) {
+          const w0 = performance.now();
+          await new Promise((r) => setTimeout(r, delayMs));
+          waited += performance.now() - w0;
+        }
+      }
+      return copy.length;
+    });
+    stages[stages.length - 1].ms -= waited;
+    stages[stages.length - 1].waitedMs = waited;
+    await stage('store', () => hooks.masterDataStore.getState().setMasterData(normalized));
+    if (firestore) {
+      await stage('firestore', () => new hooks.FirebaseCalendarRepository().saveExcelData(rows));
+    }
+  } catch (e) {
+    // The failing stage carries the error.
+  }
+  return {rows: rows.length, bytes: file.size, stages};
+}
+"""
+
+
+# -- xlsx generation ----------------------------------------------------------
+
+
+def _column(i: int) -> str:
+    name = ""
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        name = chr(65 + r) + name
+    return name
+
+
+def agenti_clienti_rows(n: int) -> Iterator[List[Any]]:
+    """``n`` rows in file column order; copies of the real file get new client codes."""
+    source = json.loads(AGENTI_CLIENTI.read_text(encoding="utf-8"))
+    for i in range(n):
+        row = dict(source[i % len(source)])
+        copy = i // len(source)
+        if copy:
+            row["Codice Cliente"] = int(row.get("Codice Cliente") or 0) + copy * 1_000_000
+            row["Cliente"] = f"{row.get('Cliente', '')} #{copy}"
+        yield [row.get(c) for c in COLUMNS]
+
+
+def write_xlsx(path: Path, header: Sequence[str], rows: Iterator[Sequence[Any]]) -> int:
+    """Minimal single-sheet workbook with shared strings, streamed row by row."""
+    strings: Dict[str, int] = {}
+
+    def cell(ref: str, value: Any) -> str:
+        if value is None or value == "":
+            return ""
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return f'<c r="{ref}"><v>{value}</v></c>'
+        idx = strings.setdefault(str(value), len(strings))
+        return f'<c r="{ref}" t="s"><v>{idx}</v></c>'
+
+    cols = [_column(i) for i in range(len(header))]
+
+    def row(r: int, values: Sequence[Any]) -> bytes:
+        return f'<row r="{r}">{"".join(cell(f"{c}{r}", v) for c, v in zip(cols, values))}</row>'.encode()
+
+    count = 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" '
+            'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            "</Types>",
+        )
+        zf.writestr(
+            "_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>',
+        )
+        zf.writestr(
+            "xl/workbook.xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="Foglio1" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        )
+        zf.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            'Target="worksheets/sheet1.xml"/>'
+            '<Relationship Id="rId2" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" '
+            'Target="sharedStrings.xml"/></Relationships>',
+        )
+        with zf.open("xl/worksheets/sheet1.xml", "w") as f:
+            f.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            f.write(row(1, header))
+            for r, values in enumerate(rows, start=2):
+                f.write(row(r, values))
+                count += 1
+            f.write(b"</sheetData></worksheet>")
+        with zf.open("xl/sharedStrings.xml", "w") as f:
+            f.write(
+                f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                f'count="{len(strings)}" uniqueCount="{len(strings)}">'.encode()
+            )
+            for s in strings:
+                f.write(f'<si><t xml:space="preserve">{escape(s)}</t></si>'.encode())
+            f.write(b"</sst>")
+    tmp.replace(path)
+    return count
+
+
+def fixture_file(rows: int) -> Path:
+    path = BENCH_DIR / f"agenti_clienti_{rows}.xlsx"
+    if not path.exists():
+        write_xlsx(path, COLUMNS, agenti_clienti_rows(rows))
+    return path
+
+
+# -- benchmark ----------------------------------------------------------------
+
+
+@dataclass
+class Stage:
+    name: str
+    ms: float
+    heap: int
+    waited_ms: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class SizeResult:
+    rows: int
+    file_bytes: int
+    stages: List[Stage] = field(default_factory=list)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(s.ms for s in self.stages)
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / (self.total_ms / 1000.0) if self.total_ms else 0.0
+
+    @property
+    def peak_heap(self) -> int:
+        return max((s.heap for s in self.stages), default=0)
+
+    @property
+    def error(self) -> Optional[str]:
+        return next((f"{s.name}: {s.error}" for s in self.stages if s.error), None)
+
+
+async def measure(page: Any, path: Path, firestore: bool) -> SizeResult:
+    await page.evaluate(INPUT_JS, INPUT_ID)
+    await page.set_input_files(f"#{INPUT_ID}", str(path))
+    out = await page.evaluate(
+        IMPORT_JS,
+        {"id": INPUT_ID, "chunkSize": CHUNK_SIZE, "delayMs": PROCESSING_DELAY_MS, "firestore": firestore},
+    )
+    return SizeResult(
+        out["rows"],
+        out["bytes"],
+        [Stage(s["name"], s["ms"], s["heap"], s.get("waitedMs", 0.0), s.get("error")) for s in out["stages"]],
+    )
+
+
+async def run(sizes: Sequence[int], firestore: bool, timeout_s: float) -> List[SizeResult]:
+    if not XLSX_JS.exists():
+        raise SystemExit(f"{XLSX_JS} not found; run npm install in app_vendita")
+    results = []
+    async with session.browser_session(args=LAUNCH_ARGS) as s:
+        await s.context.add_init_script(TEST_HOOKS_JS)
+        for n in sizes:
+            path = fixture_file(n)
+            page = await s.context.new_page()
+            try:
+                await session.open_app(page)
+                await page.wait_for_function(HOOKS_READY_JS)
+                await page.add_script_tag(path=str(XLSX_JS))
+                results.append(await asyncio.wait_for(measure(page, path, firestore), timeout_s))
+            except asyncio.TimeoutError:
+                timeout = Stage("timeout", timeout_s * 1000.0, 0, error="timed out")
+                results.append(SizeResult(n, path.stat().st_size, [timeout]))
+            finally:
+                await page.close()
+    return results
+
+
+def report(results: List[SizeResult]) -> str:
+    names: List[str] = []
+    for r in results:
+        names += [s.name for s in r.stages if s.name not in names]
+    lines = [
+        "| Rows | File MB | "
+        + " | ".join(f"{n} ms" for n in names)
+        + " | Total s | Rows/s | Peak heap MB |",
+        "|---|---|" + "---|" * len(names) + "---|---|---|",
+    ]
+    for r in results:
+        by = {s.name: s for s in r.stages}
+        cells = [
+            "-" if n not in by else ("fail" if by[n].error else f"{by[n].ms:.0f}") for n in names
+        ]
+        lines.append(
+            f"| {r.rows:,} | {r.file_bytes / 1e6:.1f} | " + " | ".join(cells)
+            + f" | {r.total_ms / 1000.0:.1f} | {r.rows_per_s:,.0f} | {r.peak_heap / 1e6:.0f} |"
+        )
+    notes = [f"- {r.rows:,} rows: {r.error}" for r in results if r.error]
+    waits = [f"- {r.rows:,} rows: chunk pauses {s.waited_ms / 1000.0:.1f} s (not in totals)"
+             for r in results for s in r.stages if s.waited_ms]
+    if any(r.rows > FIRESTORE_BATCH_LIMIT and any(s.name == "firestore" for s in r.stages) for r in results):
+        notes.append(
+            f"- saveExcelData uses one writeBatch; Firestore allows {FIRESTORE_BATCH_LIMIT} writes per batch"
+        )
+    if notes or waits:
+        lines += [""] + notes + waits
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.import_bench")
+    parser.add_argument("--sizes", default=",".join(str(n) for n in SIZES), help="comma-separated row counts")
+    parser.add_argument(
+        "--firestore",
+        action="store_true",
+        help="also time saveExcelData (deletes and rewrites excelData: test projects only)",
+    )
+    parser.add_argument("--timeout", type=float, default=900.0, help="seconds per size")
+    args = parser.parse_args(argv)
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    results = asyncio.run(run(sizes, args.firestore, args.timeout))
+    sys.stdout.write(report(results))
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,487 @@
+"""Expected outcome of an agenti_clienti Excel import, row by row.
+
+The import tests (TC009, TC013) upload a file and have nothing to compare
+the result with. This oracle encodes the ``MasterDataRow`` contract
+(``src/data/models/MasterData.ts``) as rules and says, for every row of a
+file, whether the app should import it:
+
+* file level: a readable xlsx whose header has every agenti_clienti
+  column (:data:`harness.export_check.CLIENTS_SCHEMA`); otherwise the whole
+  file is rejected, as TC009's "invalid format";
+* ``Codice Cliente``, ``Cliente`` and ``Codige Agente`` are not empty: the
+  store keys sales points and agents on them (``updateFilters``);
+* ``Cap`` is five digits; numeric cells are zero-padded first, since Excel
+  stores 00118 as 118;
+* ``Latitudine`` and ``Longitudine`` are numbers in range. Empty
+  coordinates are a warning, not a rejection: 10 rows of the real file
+  have none;
+* a ``Codice Cliente`` seen again rejects the earlier rows. The store's
+  sales-point map keeps the last row for a code, so that is the one kept.
+
+Rules run column by column over the whole file, not row by row. The xlsx
+reader pulls only the columns the rules need, straight from the sheet
+XML with a single regex pass that matches all of them::
+
+    verdict = check_file(path)
+    assert verdict.accepts(2) and not verdict.accepts(1000)
+    verdict.import_result()      # shaped like the app's ImportResult
+
+    python -m harness.import_oracle check file.xlsx
+    python -m harness.import_oracle make 1000000 big.xlsx --defect-every 1000
+"""
+
+import argparse
+import gc
+import json
+import re
+import sys
+import time
+import zipfile
+from dataclasses import dataclass, field
+from itertools import compress
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import unescape
+
+from .export_check import CLIENTS_SCHEMA, sheet_part
+
+CODE = "Codice Cliente"
+REQUIRED_VALUES = (CODE, "Cliente", "Codige Agente")
+CAP = "Cap"
+COORDINATES = (("Latitudine", -90.0, 90.0), ("Longitudine", -180.0, 180.0))
+CHECKED = (*REQUIRED_VALUES, CAP, *(name for name, _, _ in COORDINATES))
+
+_CAP = re.compile(r"\d{5}")
+_SI = re.compile(rb"<si>(?:<t(?: [^>]*)?>([^<]*)</t>|(.*?))</si>", re.S)
+_T = re.compile(rb"<t(?: [^>]*)?>([^<]*)</t>")
+_RPH = re.compile(rb"<rPh.*?</rPh>", re.S)
+_ROW = re.compile(rb'<row r="(\d+)"[^>]*>(?=<c)')
+_HEADER = re.compile(rb"<row [^>]*>(.*?)</row>", re.S)
+# Attributes, then the value: self-closing cells have none, and a formula
+# (``<f>``, possibly self-closing when shared) comes before its cached ``<v>``.
+_CELL_BODY = rb'([^>/]*)(?:/>|>(?:<f[^>]*?(?:/>|>[^<]*</f>))?(?:<v>([^<]*)</v>|<is>(.*?)</is>)?)'
+_HEADER_CELL = re.compile(rb'<c r="([A-Z]+)1"' + _CELL_BODY, re.S)
+_ENTITIES = {"&quot;": '"', "&apos;": "'"}
+_CHUNK = 1 << 24
+# Rows per block when splitting matches by column; see _split.
+_SPLIT_ROWS = 64
+
+
+@dataclass
+class ImportVerdict:
+    source: str
+    total_rows: int
+    # Excel row number (header is row 1) -> reasons.
+    rejected: Dict[int, List[str]] = field(default_factory=dict)
+    warnings: Dict[int, List[str]] = field(default_factory=dict)
+    # Set when the whole file should be refused.
+    file_errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def accepted_rows(self) -> int:
+        return 0 if self.file_errors else self.total_rows - len(self.rejected)
+
+    def accepts(self, row: int) -> bool:
+        return not self.file_errors and row not in self.rejected
+
+    def import_result(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """The app's ``ImportResult`` for this file, errors capped at ``limit``."""
+        errors = [
+            {"row": row, "message": "; ".join(reasons)} for row, reasons in sorted(self.rejected.items())
+        ]
+        errors = [{"row": 0, "message": e} for e in self.file_errors] + errors
+        return {
+            "success": not self.file_errors,
+            "totalRows": self.total_rows,
+            "importedRows": self.accepted_rows,
+            "errorRows": self.total_rows - self.accepted_rows,
+            "errors": errors[:limit] if limit is not None else errors,
+            "message": "; ".join(self.file_errors) or f"{self.accepted_rows} righe importate",
+        }
+
+
+# -- rules --------------------------------------------------------------------
+#
+# Each rule takes one column (indexed by Excel row number) and the data row
+# numbers, and returns the rows that break it.
+
+
+def _blank(value: Any) -> bool:
+    return value is None or (value.__class__ is str and not value.strip())
+
+
+def _missing(col: Sequence[Any], rows: Sequence[int]) -> List[int]:
+    # _blank inlined: this runs over every row of several columns.
+    return [r for r in rows if col[r] is None or (col[r].__class__ is str and not col[r].strip())]
+
+
+def _number(value: Any) -> Optional[float]:
+    if value.__class__ in (int, float):
+        return float(value)
+    if value.__class__ is str:
+        try:
+            return float(value.strip().replace(",", "."))
+        except ValueError:
+            return None
+    return None
+
+
+def _bad_coordinate(col: Sequence[Any], rows: Sequence[int], lo: float, hi: float) -> List[int]:
+    bad = []
+    for r in rows:
+        v = col[r]
+        if _blank(v):
+            continue
+        n = _number(v)
+        if n is None or not lo <= n <= hi:
+            bad.append(r)
+    return bad
+
+
+def _cap_text(value: Any) -> str:
+    if value.__class__ is int or (value.__class__ is float and value.is_integer()):
+        return str(int(value)).zfill(5) if 0 <= value <= 99999 else str(value)
+    return str(value).strip()
+
+
+def _bad_cap(col: Sequence[Any], rows: Sequence[int]) -> List[int]:
+    match = _CAP.fullmatch
+    return [r for r in rows if _blank(col[r]) or not match(_cap_text(col[r]))]
+
+
+def _code(value: Any) -> str:
+    # String(row['Codice Cliente']): 199507 and "199507" are the same client.
+    if value.__class__ is float and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _duplicates(col: Sequence[Any], rows: Sequence[int]) -> Dict[int, int]:
+    """Rows whose code appears again later -> the row that is kept."""
+    coded = [(r, _code(col[r])) for r in rows if not _blank(col[r])]
+    last = {code: r for r, code in coded}
+    return {r: last[code] for r, code in coded if last[code] != r}
+
+
+def _apply(
+    source: str,
+    header: Sequence[str],
+    columns: Dict[str, Sequence[Any]],
+    rows: Sequence[int],
+    started: float,
+) -> ImportVerdict:
+    verdict = ImportVerdict(source, len(rows))
+    missing = [c for c in CLIENTS_SCHEMA.columns if c not in header]
+    if missing:
+        verdict.file_errors.append(f"colonne mancanti: {', '.join(missing)}")
+        verdict.seconds = time.perf_counter() - started
+        return verdict
+
+    def reject(bad: Iterable[int], reason: str) -> None:
+        for r in bad:
+            verdict.rejected.setdefault(r, []).append(reason)
+
+    for name in REQUIRED_VALUES:
+        reject(_missing(columns[name], rows), f"{name} mancante")
+    reject(_bad_cap(columns[CAP], rows), "Cap non valido")
+    for name, lo, hi in COORDINATES:
+        reject(_bad_coordinate(columns[name], rows, lo, hi), f"{name} non numerica o fuori range")
+        for r in _missing(columns[name], rows):
+            verdict.warnings.setdefault(r, []).append(f"{name} mancante")
+    for r, kept in _duplicates(columns[CODE], rows).items():
+        verdict.rejected.setdefault(r, []).append(f"{CODE} duplicato (tenuta riga {kept})")
+    verdict.seconds = time.perf_counter() - started
+    return verdict
+
+
+# -- inputs -------------------------------------------------------------------
+
+
+def check_rows(header: Sequence[str], rows: Iterable[Sequence[Any]], source: str = "rows") -> ImportVerdict:
+    """Check in-memory rows; the first one is Excel row 2, as under a header."""
+    started = time.perf_counter()
+    header = list(header)
+    data = list(rows)
+    # Transpose once, indexed by Excel row number like read_columns (1 is the header).
+    columns: Dict[str, Sequence[Any]] = {}
+    for name in CHECKED:
+        if name in header:
+            i = header.index(name)
+            columns[name] = [None, None] + [row[i] if i < len(row) else None for row in data]
+    numbers = [n for n, row in enumerate(data, start=2) if any(not _blank(v) for v in row)]
+    return _apply(source, header, columns, numbers, started)
+
+
+def _shared_strings(zf: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    out = []
+    for plain, rich in _SI.findall(zf.read("xl/sharedStrings.xml")):
+        raw = b"".join(_T.findall(_RPH.sub(b"", rich))) if rich else plain
+        text = raw.decode("utf-8")
+        out.append(unescape(text, _ENTITIES) if "&" in text else text)
+    return out
+
+
+def _cells_pattern(letters: Iterable[str]) -> "re.Pattern[bytes]":
+    """One pattern for the cells of every wanted column; group 1 is the letter."""
+    alternatives = b"|".join(sorted((l.encode() for l in letters), key=len, reverse=True))
+    return re.compile(b'<c r="(' + alternatives + rb')(\d+)"' + _CELL_BODY, re.S)
+
+
+def _cell(attrs: bytes, v: bytes, inline: bytes, strings: List[str]) -> Any:
+    if b't="s"' in attrs:
+        return strings[int(v)] if v else None
+    if b't="inlineStr"' in attrs:
+        text = b"".join(_T.findall(inline)).decode("utf-8")
+        return unescape(text, _ENTITIES) if "&" in text else text
+    if b't="b"' in attrs:
+        return v == b"1"
+    if b't="str"' in attrs or b't="e"' in attrs:
+        text = v.decode("utf-8")
+        return unescape(text, _ENTITIES) if "&" in text else text
+    if not v:
+        return None
+    try:
+        return int(v)
+    except ValueError:
+        return float(v)
+
+
+def _numbers(raw: Sequence[bytes]) -> List[Any]:
+    try:
+        return list(map(int, raw))
+    except ValueError:
+        pass
+    try:
+        return list(map(float, raw))
+    except ValueError:
+        return [_cell(b"", v, b"", []) for v in raw]
+
+
+def _values(
+    matches: List[Tuple[bytes, bytes, bytes, bytes, bytes]], strings: List[str]
+) -> Tuple[List[int], List[Any]]:
+    """Row numbers and values of one column's cells, converted a column at a time.
+
+    Columns are nearly always all shared strings or all numbers; those go
+    through one comprehension instead of a call per cell; a mixed column
+    gets one such batch per kind of cell.
+    """
+    if matches and matches[0][1] == b"1":
+        matches = matches[1:]  # the header cell
+    if not matches:
+        return [], []
+    _, refs, attrs, raw, inline = zip(*matches)
+    rows = list(map(int, refs))
+    kinds = set(attrs)
+    if all(b't="s"' in a for a in kinds):
+        return rows, [strings[int(v)] if v else None for v in raw]
+    if not any(b" t=" in a for a in kinds):
+        return rows, _numbers(raw)
+    # Mixed: convert each kind of cell as a batch, then put them back in order.
+    values: List[Any] = [None] * len(rows)
+    for kind in kinds:
+        mask = list(map(kind.__eq__, attrs))
+        picked = list(compress(raw, mask))
+        if b't="s"' in kind:
+            converted = [strings[int(v)] if v else None for v in picked]
+        elif b" t=" not in kind:
+            converted = _numbers(picked)
+        else:
+            converted = [
+                _cell(kind, v, i, strings) for v, i in zip(picked, compress(inline, mask))
+            ]
+        for pos, value in zip(compress(range(len(rows)), mask), converted):
+            values[pos] = value
+    return rows, values
+
+
+def _split(
+    matches: List[Tuple[bytes, ...]], order: Sequence[bytes], raw: Dict[bytes, List[Tuple[bytes, ...]]]
+) -> None:
+    """Append each match to its column's list.
+
+    Cells come in column order, so within a block of rows that all have
+    every wanted cell the matches cycle through ``order`` and each column
+    is one slice. Blocks with a missing cell are dispatched match by match.
+    """
+    n = len(order)
+    step = n * _SPLIT_ROWS
+    letters = [m[0] for m in matches]
+    for start in range(0, len(matches), step):
+        end = min(start + step, len(matches))
+        phase = order.index(letters[start])
+        slices = [
+            (order[(phase + k) % n], slice(start + k, end, n)) for k in range(min(n, end - start))
+        ]
+        if (end - start) % n == 0 and all(
+            letters[s].count(letter) == len(letters[s]) for letter, s in slices
+        ):
+            for letter, s in slices:
+                raw[letter].extend(matches[s])
+        else:
+            for m in matches[start:end]:
+                raw[m[0]].append(m)
+
+
+def _chunks(fh: Any) -> Iterator[bytes]:
+    """The sheet XML in large pieces, each ending on a row boundary."""
+    tail = b""
+    while True:
+        chunk = fh.read(_CHUNK)
+        if not chunk:
+            if tail:
+                yield tail
+            return
+        buf = tail + chunk
+        cut = buf.rfind(b"</row>")
+        if cut < 0:
+            tail = buf
+            continue
+        yield buf[: cut + 6]
+        tail = buf[cut + 6 :]
+
+
+def read_columns(
+    path: Path, sheet: Optional[str] = None
+) -> Tuple[List[str], Dict[str, List[Any]], List[int]]:
+    """(header, checked columns indexed by Excel row, data row numbers).
+
+    The header row maps names to column letters; the cells of the columns
+    the rules need are then pulled out with one regex pass over every chunk
+    of the sheet, without building an XML tree.
+    """
+    # Millions of match tuples would otherwise trigger full collections over and over.
+    gc.disable()
+    try:
+        return _read_columns(path, sheet)
+    finally:
+        gc.enable()
+
+
+def _read_columns(path: Path, sheet: Optional[str]) -> Tuple[List[str], Dict[str, List[Any]], List[int]]:
+    with zipfile.ZipFile(path) as zf:
+        _, part = sheet_part(zf, sheet)
+        strings = _shared_strings(zf)
+        with zf.open(part) as fh:
+            head = fh.read(1 << 20)
+        first = _HEADER.search(head)
+        header_cells: Dict[str, str] = {}
+        if first:
+            for letter, attrs, v, inline in _HEADER_CELL.findall(first.group(1)):
+                header_cells[letter.decode()] = str(_cell(attrs, v, inline, strings))
+        header = [header_cells[k] for k in sorted(header_cells, key=lambda k: (len(k), k))]
+        wanted = {name: letter.encode() for letter, name in header_cells.items() if name in CHECKED}
+        order = sorted(wanted.values(), key=lambda k: (len(k), k))
+        raw: Dict[bytes, List[Tuple[bytes, ...]]] = {letter: [] for letter in order}
+        numbers: List[int] = []
+        pattern = _cells_pattern(l.decode() for l in order) if order else None
+        with zf.open(part) as fh:
+            for body in _chunks(fh):
+                numbers.extend(map(int, _ROW.findall(body)))
+                if pattern is not None:
+                    _split(pattern.findall(body), order, raw)
+    size = (max(numbers) if numbers else 1) + 1
+    columns: Dict[str, List[Any]] = {}
+    for name, letter in wanted.items():
+        col: List[Any] = [None] * size
+        for r, value in zip(*_values(raw[letter], strings)):
+            col[r] = value
+        columns[name] = col
+    return header, columns, [n for n in numbers if n > 1]
+
+
+def check_file(path: Path, sheet: Optional[str] = None) -> ImportVerdict:
+    started = time.perf_counter()
+    try:
+        header, columns, rows = read_columns(Path(path), sheet)
+    except (zipfile.BadZipFile, KeyError, OSError) as exc:
+        verdict = ImportVerdict(str(path), 0, file_errors=[f"formato file non valido: {exc}"])
+        verdict.seconds = time.perf_counter() - started
+        return verdict
+    return _apply(str(path), header, columns, rows, started)
+
+
+# -- fixtures -----------------------------------------------------------------
+
+DEFECTS: Dict[str, Callable[[Dict[str, Any]], None]] = {
+    "missing_code": lambda row: row.update({CODE: None}),
+    "missing_client": lambda row: row.update({"Cliente": "  "}),
+    "missing_agent": lambda row: row.update({"Codige Agente": ""}),
+    "short_cap": lambda row: row.update({CAP: "7005"}),
+    "text_latitude": lambda row: row.update({"Latitudine": "nord"}),
+    "longitude_range": lambda row: row.update({"Longitudine": 200.5}),
+}
+
+
+def with_defects(rows: Iterable[Sequence[Any]], every: int, header: Sequence[str] = CLIENTS_SCHEMA.columns):
+    """Rows with one defect every ``every`` rows, cycling through :data:`DEFECTS`.
+
+    Every fourth defect slot repeats the previous row's client code instead,
+    so duplicates are covered too.
+    """
+    kinds = list(DEFECTS.values())
+    previous: Optional[Any] = None
+    slot = 0
+    for i, values in enumerate(rows):
+        row = dict(zip(header, values))
+        if every and i % every == every - 1:
+            if slot % 4 == 3 and previous is not None:
+                row[CODE] = previous
+            else:
+                kinds[slot % len(kinds)](row)
+            slot += 1
+        previous = row.get(CODE)
+        yield [row.get(c) for c in header]
+
+
+def report(verdicts: Sequence[ImportVerdict], examples: int = 5) -> str:
+    lines = [
+        "| File | Rows | Accepted | Rejected | Warnings | Check s |",
+        "|---|---|---|---|---|---|",
+    ]
+    for v in verdicts:
+        lines.append(
+            f"| {Path(v.source).name} | {v.total_rows:,} | {v.accepted_rows:,} | "
+            f"{v.total_rows - v.accepted_rows:,} | {len(v.warnings):,} | {v.seconds:.1f} |"
+        )
+    for v in verdicts:
+        shown = v.import_result(limit=examples)["errors"]
+        if shown:
+            lines += ["", f"{Path(v.source).name}:"]
+            lines += [f"- row {e['row']}: {e['message']}" for e in shown]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.import_oracle")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_check = sub.add_parser("check", help="expected outcome of importing each file")
+    p_check.add_argument("files", nargs="+", type=Path)
+    p_check.add_argument("--json", type=Path, help="write every verdict's ImportResult here")
+    p_make = sub.add_parser("make", help="write an agenti_clienti file with known defects")
+    p_make.add_argument("rows", type=int)
+    p_make.add_argument("out", type=Path)
+    p_make.add_argument("--defect-every", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "make":
+        from .import_bench import agenti_clienti_rows, write_xlsx
+
+        rows = with_defects(agenti_clienti_rows(args.rows), args.defect_every)
+        write_xlsx(args.out, CLIENTS_SCHEMA.columns, rows)
+        args.files = [args.out]
+
+    verdicts = [check_file(path) for path in args.files]
+    if getattr(args, "json", None):
+        args.json.write_text(
+            json.dumps({v.source: v.import_result() for v in verdicts}, indent=2), encoding="utf-8"
+        )
+    sys.stdout.write(report(verdicts))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""Step recording for the generated Playwright scripts.
+
+The TestSprite scripts talk to ``playwright.async_api`` directly, so instead
+of rewriting them we wrap the handful of Locator/Page methods they use.
+Every wrapped call becomes one *step* event in the JSONL file named by
+``HARNESS_EVENTS``; the runner turns those into ``steps`` rows. When the
+runner passes a learned timeout table (``HARNESS_TIMEOUTS``) the wrapper
+also replaces the script's fixed ``timeout=`` with the step's own budget,
+and interactions go through :func:`harness.healing.guarded`.
+
+New browser contexts get the app's test-hooks init script and a console
+collector on each page. After each step the app's ``performanceMonitor`` is
+drained (see :mod:`harness.app_metrics`) and the parsed console lines are
+flushed (see :mod:`harness.console_log`). Downloads are saved and their
+workbooks validated (see :mod:`harness.export_check`). With ``HARNESS_SNAPSHOT`` set,
+contexts start from that storage state (see :mod:`harness.snapshots`).
+With ``HARNESS_CAMERA`` set, Chromium gets the fake capture device and each
+context is granted or denied the camera (see :mod:`harness.fake_camera`).
+``HARNESS_NETWORK`` names a network profile applied to every page the
+contexts open (see :mod:`harness.network_profiles`).
+"""
+
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from . import app_metrics, console_log, export_check, fake_camera, healing, network_profiles
+from .config import ENV_CAMERA, ENV_EVENTS, ENV_NETWORK, ENV_SNAPSHOT
+from .healing import FingerprintIndex
+from .results import FAILED, PASSED
+from .timeouts import TimeoutTable
+
+# Methods that represent a user-visible action or assertion read.
+LOCATOR_ACTIONS = (
+    "click",
+    "dblclick",
+    "fill",
+    "type",
+    "press",
+    "check",
+    "uncheck",
+    "hover",
+    "select_option",
+    "set_input_files",
+    "wait_for",
+    "text_content",
+    "inner_text",
+    "all_text_contents",
+    "is_visible",
+    "is_enabled",
+)
+PAGE_ACTIONS = ("goto", "wait_for_load_state", "reload")
+
+
+class EventSink:
+    """Append-only JSONL writer shared by everything in the test process."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fh = open(path, "a", encoding="utf-8") if path else None
+        self._step_idx = 0
+
+    def emit(self, kind: str, **payload: Any) -> None:
+        if self._fh is None:
+            return
+        payload["type"] = kind
+        line = json.dumps(payload, default=str)
+        with self._lock:
+            self._fh.write(line + "\n")
+            self._fh.flush()
+
+    @property
+    def current_step(self) -> Optional[int]:
+        """Index of the most recently started step."""
+        return self._step_idx - 1 if self._step_idx else None
+
+    def next_step(self) -> int:
+        with self._lock:
+            idx = self._step_idx
+            self._step_idx += 1
+            return idx
+
+
+_sink: Optional[EventSink] = None
+_timeouts: Optional[TimeoutTable] = None
+_fingerprints: Optional[FingerprintIndex] = None
+_logs: Optional[console_log.LogCollector] = None
+_downloads: Optional[export_check.DownloadWatcher] = None
+# Network shaper of each open context, when HARNESS_NETWORK is set.
+_shapers: Dict[Any, network_profiles.NetworkShaper] = {}
+
+
+def sink() -> EventSink:
+    global _sink
+    if _sink is None:
+        _sink = EventSink(os.environ.get(ENV_EVENTS))
+    return _sink
+
+
+def timeouts() -> TimeoutTable:
+    global _timeouts
+    if _timeouts is None:
+        _timeouts = TimeoutTable.from_env()
+    return _timeouts
+
+
+def fingerprints() -> FingerprintIndex:
+    global _fingerprints
+    if _fingerprints is None:
+        _fingerprints = FingerprintIndex.from_env()
+    return _fingerprints
+
+
+def logs() -> console_log.LogCollector:
+    global _logs
+    if _logs is None:
+        _logs = console_log.LogCollector(current_step=lambda: sink().current_step)
+    return _logs
+
+
+def downloads() -> export_check.DownloadWatcher:
+    global _downloads
+    if _downloads is None:
+        _downloads = export_check.DownloadWatcher(
+            export_check.downloads_dir(), current_step=lambda: sink().current_step
+        )
+    return _downloads
+
+
+def _attach(page: Any) -> None:
+    logs().attach(page)
+    downloads().attach(page)
+
+
+def selector_of(target: Any) -> str:
+    """Best-effort selector string for a Locator, Page or Frame."""
+    # The async_api wrappers keep the selector on their implementation object.
+    selector = getattr(getattr(target, "_impl_obj", target), "_selector", None)
+    if selector:
+        return str(selector)
+    url = getattr(target, "url", None)
+    return str(url) if isinstance(url, str) else type(target).__name__
+
+
+async def check_selector_of(expected: str = "[data-testid=x]") -> str:
+    """Make sure a real ``page.locator(expected)`` is keyed by ``expected``.
+
+    Step keys, learned timeouts and fingerprints all hang off
+    :func:`selector_of`; if Playwright moves the attribute, every locator
+    step would collapse into ``<action>:Locator``.
+    """
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch()
+        try:
+            page = await browser.new_page()
+            got = selector_of(page.locator(expected))
+        finally:
+            await browser.close()
+    if got != expected:
+        raise AssertionError(f"selector_of(page.locator({expected!r})) returned {got!r}")
+    return got
+
+
+def _wrap(
+    method: Callable,
+    action: str,
+    describe: Callable[[Any, tuple], str],
+    heal: bool = False,
+) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        out = sink()
+        idx = out.next_step()
+        selector = describe(self, args)
+        learned = timeouts().get(action, f"{action}:{selector}")
+        if learned is not None:
+            kwargs["timeout"] = learned
+        started = time.time()
+        t0 = time.perf_counter()
+        status, error = PASSED, ""
+        cancelled = False
+        try:
+            if heal:
+                emit = functools.partial(out.emit, step=idx)
+                return await healing.guarded(
+                    self, selector, method, args, kwargs, fingerprints(), emit
+                )
+            return await method(self, *args, **kwargs)
+        except BaseException as exc:
+            status, error = FAILED, f"{type(exc).__name__}: {exc}"[:500]
+            cancelled = isinstance(exc, asyncio.CancelledError)
+            raise
+        finally:
+            out.emit(
+                "step",
+                idx=idx,
+                action=action,
+                selector=selector,
+                status=status,
+                started_at=started,
+                duration_ms=(time.perf_counter() - t0) * 1000.0,
+                error=error,
+                timeout_ms=kwargs.get("timeout"),
+            )
+            page = app_metrics.page_of(self)
+            if page is not None and not cancelled:
+                await app_metrics.drain(page, functools.partial(out.emit, step=idx))
+            if not cancelled:
+                await logs().flush(out.emit)
+                await downloads().flush(out.emit)
+
+    wrapper.__harness_wrapped__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _locator_target(self: Any, args: tuple) -> str:
+    return selector_of(self)
+
+
+def _page_target(self: Any, args: tuple) -> str:
+    # goto(url) is keyed by the URL, load-state waits by the state name.
+    return str(args[0]) if args else selector_of(self)
+
+
+def _with_test_hooks(method: Callable) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        snapshot = os.environ.get(ENV_SNAPSHOT)
+        if snapshot and kwargs.get("storage_state") is None:
+            kwargs["storage_state"] = snapshot
+        context = await method(self, *args, **kwargs)
+        await context.add_init_script(app_metrics.TEST_HOOKS_JS)
+        camera = os.environ.get(ENV_CAMERA)
+        if camera:
+            await fake_camera.apply(context, camera)
+        network = os.environ.get(ENV_NETWORK)
+        if network:
+            _shapers[context] = network_profiles.NetworkShaper(network_profiles.profile(network))
+        context.on("page", _attach)
+        return context
+
+    wrapper.__harness_wrapped__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _with_fake_camera(method: Callable) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if os.environ.get(ENV_CAMERA) and self.name == "chromium":
+            kwargs["args"] = [*(kwargs.get("args") or ()), *fake_camera.launch_args()]
+        return await method(self, *args, **kwargs)
+
+    wrapper.__harness_wrapped__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _with_network(method: Callable) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        page = await method(self, *args, **kwargs)
+        shaper = _shapers.get(self)
+        if shaper is not None:
+            # Before the script's first goto, so the whole load is throttled.
+            await shaper.attach(page)
+        return page
+
+    wrapper.__harness_wrapped__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _drain_before_close(method: Callable) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        # Metrics recorded after the last step would otherwise be lost.
+        for page in self.pages:
+            if not page.is_closed():
+                await app_metrics.drain(page, functools.partial(sink().emit, step=None))
+        await logs().flush(sink().emit)
+        await downloads().flush(sink().emit)
+        shaper = _shapers.pop(self, None)
+        if shaper is not None:
+            shaper.close()
+        return await method(self, *args, **kwargs)
+
+    wrapper.__harness_wrapped__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def install() -> None:
+    """Patch Playwright's async API in place. Safe to call more than once."""
+    from playwright.async_api import Browser, BrowserContext, BrowserType, Frame, Locator, Page
+
+    for name in LOCATOR_ACTIONS:
+        original = getattr(Locator, name, None)
+        if original is None or getattr(original, "__harness_wrapped__", False):
+            continue
+        heal = name in healing.HEALABLE
+        setattr(Locator, name, _wrap(original, name, _locator_target, heal))
+
+    for cls in (Page, Frame):
+        for name in PAGE_ACTIONS:
+            original = getattr(cls, name, None)
+            if original is None or getattr(original, "__harness_wrapped__", False):
+                continue
+            setattr(cls, name, _wrap(original, name, _page_target))
+
+    for cls, name, patch in (
+        (Browser, "new_context", _with_test_hooks),
+        (BrowserContext, "new_page", _with_network),
+        (BrowserContext, "close", _drain_before_close),
+        (BrowserType, "launch", _with_fake_camera),
+    ):
+        original = getattr(cls, name, None)
+        if original is None or getattr(original, "__harness_wrapped__", False):
+            continue
+        setattr(cls, name, patch(original))
@@ -0,0 +1,405 @@
+"""Concurrent field-agent load: hundreds of browser contexts across processes.
+
+    python -m harness.load --agents 200 --processes 8 --duration 600 [--ramp 120] [--no-writes]
+
+At month-end hundreds of agents use the same backend at once. This
+spreads ``--agents`` simulated agents over ``--processes`` worker
+processes, one headless Chromium each. Every agent replays an agent
+session in its own light browser context (small viewport, no service
+workers, images, fonts or analytics), then starts over until
+``--duration`` runs out:
+
+1. ``login``: open the app and log in as a ``TEST_USERS`` user;
+2. ``open_week``: switch to the week view and wait for the day cells;
+3. ``open_entry``: "+" on a random weekday, wait for ``EntryFormModal``;
+4. ``edit_quantities``: type "Ordinato"/"Venduto" pieces in up to three
+   focus-reference rows;
+5. ``attach_photo``: a 2 MP JPEG through ``PhotoService.selectPhoto`` and
+   ``ImageCompressionService``, then ``FirebasePhotoService.savePhoto``
+   (deleted again), as in :mod:`harness.photo_bench`;
+6. ``save``: "Salva" and wait for the modal to close.
+
+Before each step the agent thinks for a lognormal time (``THINK_S``,
+scaled by ``--think-scale``; 0 replays back to back). Agents start
+evenly over ``--ramp`` seconds. A failed step ends that session; the
+agent starts a new one after its pause.
+
+Workers write one JSONL line per step. The parent merges them into
+throughput, error rate and latency percentiles per step.
+
+The app has no local backend: the emulator switch in
+``core/services/firebase.ts`` is off, so saves and uploads go to the
+configured Firebase project. Point the app at a test project (or the
+emulators in ``firebase.json``) first, or pass ``--no-writes``. That
+option cancels the form instead of saving and compresses the photo
+without uploading it.
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+from . import config, locators, photo_bench, session
+from .app_metrics import TEST_HOOKS_JS
+from .instrument import EventSink
+from .locators import selector
+from .results import read_events
+from .tables import percentile_ms
+
+STEPS = ("login", "open_week", "open_entry", "edit_quantities", "attach_photo", "save")
+# Median seconds and lognormal sigma of the think time before each step.
+THINK_S = {
+    "open_week": (3.0, 0.6),
+    "open_entry": (5.0, 0.7),
+    "edit_quantities": (4.0, 0.5),
+    "attach_photo": (8.0, 0.6),
+    "save": (3.0, 0.5),
+}
+# Between two sessions of the same agent.
+SESSION_PAUSE_S = (20.0, 0.8)
+PHOTO = photo_bench.Photo(2, "jpeg")
+QUANTITY_ROWS = 3
+WORKER_ARGS = ("--disable-gpu", "--mute-audio", "--disable-extensions")
+# Third-party and heavy requests a load context does not need.
+BLOCKED = re.compile(r"google-analytics|googletagmanager|\.(?:png|jpe?g|gif|webp|woff2?|ttf)(?:\?|$)")
+HOOKS_READY_JS = "() => !!(window.__appTestHooks && window.__appTestHooks.PhotoService)"
+
+
+def think(rng: random.Random, step: str, scale: float) -> float:
+    median, sigma = THINK_S.get(step, (0.0, 0.0))
+    if scale <= 0 or median <= 0:
+        return 0.0
+    return rng.lognormvariate(math.log(median), sigma) * scale
+
+
+async def _block(route: Any) -> None:
+    await route.abort()
+
+
+class Agent:
+    """One simulated field agent, replaying sessions in fresh contexts."""
+
+    def __init__(
+        self,
+        index: int,
+        browser: Any,
+        photo: Path,
+        emit: Callable[..., None],
+        writes: bool = True,
+        think_scale: float = 1.0,
+        timeout_s: float = 60.0,
+        seed: int = 0,
+    ):
+        self.index = index
+        self.browser = browser
+        self.photo = photo
+        self.emit = emit
+        self.writes = writes
+        self.think_scale = think_scale
+        self.timeout_s = timeout_s
+        self.rng = random.Random(seed * 100003 + index)
+        self.email, self.password = session.TEST_USERS[index % len(session.TEST_USERS)]
+
+    async def run(self, start_at: float, deadline: float, max_sessions: int = 0) -> None:
+        await asyncio.sleep(max(0.0, start_at - time.time()))
+        n = 0
+        while time.time() < deadline and (not max_sessions or n < max_sessions):
+            await self.session(n, deadline)
+            n += 1
+            median, sigma = SESSION_PAUSE_S
+            if self.think_scale > 0:
+                await asyncio.sleep(self.rng.lognormvariate(math.log(median), sigma) * self.think_scale)
+
+    async def session(self, n: int, deadline: float) -> None:
+        context = await self.browser.new_context(
+            viewport={"width": 1024, "height": 700}, service_workers="block"
+        )
+        try:
+            context.set_default_timeout(self.timeout_s * 1000)
+            await context.add_init_script(TEST_HOOKS_JS)
+            await context.route(BLOCKED, _block)
+            page = await context.new_page()
+            for step in STEPS:
+                delay = think(self.rng, step, self.think_scale)
+                if time.time() + delay > deadline:
+                    return
+                await asyncio.sleep(delay)
+                if not await self._timed(n, step, getattr(self, f"_{step}")(page)):
+                    return
+        finally:
+            await context.close()
+
+    async def _timed(self, n: int, step: str, action: Any) -> bool:
+        started = time.time()
+        t0 = time.perf_counter()
+        error = ""
+        try:
+            await asyncio.wait_for(action, self.timeout_s)
+        except asyncio.TimeoutError:
+            error = f"timed out after {self.timeout_s:g}s"
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {str(exc).splitlines()[0][:200] if str(exc) else ''}"
+        self.emit(
+            "op",
+            agent=self.index,
+            session=n,
+            step=step,
+            started_at=started,
+            ms=(time.perf_counter() - t0) * 1000.0,
+            ok=not error,
+            error=error,
+        )
+        return not error
+
+    async def _login(self, page: Any) -> None:
+        await session.open_app(page, timeout_ms=self.timeout_s * 1000)
+        await session.login(page, self.email, self.password)
+
+    async def _open_week(self, page: Any) -> None:
+        await page.locator(selector("calendar.view_week")).click()
+        await page.locator(selector("calendar.day", index=1)).wait_for()
+
+    async def _open_entry(self, page: Any) -> None:
+        await page.locator(selector("calendar.day_add", index=self.rng.randint(1, 5))).click()
+        await page.locator(selector("entry_form.save")).wait_for()
+
+    async def _edit_quantities(self, page: Any) -> None:
+        rows = await page.locator(locators.REGISTRY["entry_form.ordered_row"].css).count()
+        for i in range(1, min(rows, QUANTITY_ROWS) + 1):
+            await page.locator(selector("entry_form.ordered_row", index=i)).fill(str(self.rng.randint(0, 24)))
+            await page.locator(selector("entry_form.sold_row", index=i)).fill(str(self.rng.randint(0, 12)))
+
+    async def _attach_photo(self, page: Any) -> None:
+        await page.wait_for_function(HOOKS_READY_JS)
+        picked = await photo_bench.pick(page, PHOTO, self.photo, self.timeout_s)
+        if picked.get("canceled"):
+            raise RuntimeError("pick returned no asset")
+        params = {
+            "upload": self.writes,
+            "salesPointId": "harness_load",
+            "calendarDate": time.strftime("%Y-%m-%d"),
+        }
+        out = await page.evaluate(photo_bench.PROCESS_JS, params)
+        if out["error"]:
+            raise RuntimeError(out["error"])
+
+    async def _save(self, page: Any) -> None:
+        button = "entry_form.save" if self.writes else "entry_form.cancel"
+        await page.locator(selector(button)).click()
+        await page.locator(selector("entry_form.save")).wait_for(state="hidden")
+
+
+async def worker(
+    first: int,
+    agents: int,
+    total_agents: int,
+    out: str,
+    photo: Path,
+    start: float,
+    ramp_s: float,
+    deadline: float,
+    max_sessions: int,
+    writes: bool,
+    think_scale: float,
+    timeout_s: float,
+    seed: int,
+) -> None:
+    sink = EventSink(out)
+    async with session.browser_session(args=WORKER_ARGS) as s:
+        crew = [
+            Agent(i, s.browser, photo, sink.emit, writes, think_scale, timeout_s, seed)
+            for i in range(first, first + agents)
+        ]
+        await asyncio.gather(
+            *(a.run(start + ramp_s * a.index / total_agents, deadline, max_sessions) for a in crew)
+        )
+
+
+async def _photo_fixture() -> Path:
+    async with session.browser_session(default_timeout_ms=60000, accept_downloads=True) as s:
+        await session.open_app(s.page)
+        return await photo_bench.fixture(s.page, PHOTO)
+
+
+async def _spawn(args: argparse.Namespace, photo: Path) -> List[dict]:
+    per = [args.agents // args.processes + (1 if i < args.agents % args.processes else 0)
+           for i in range(args.processes)]
+    start = time.time() + 5.0
+    deadline = start + args.ramp + args.duration
+    outs, procs, first = [], [], 0
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(config.SUITE_DIR), env.get("PYTHONPATH")]))
+    for n in per:
+        if not n:
+            continue
+        fd, out = tempfile.mkstemp(prefix="load-", suffix=".jsonl")
+        os.close(fd)
+        outs.append(out)
+        cmd = [
+            sys.executable, "-m", "harness.load", "worker",
+            "--first", str(first), "--agents", str(n), "--total-agents", str(args.agents),
+            "--out", out, "--photo", str(photo), "--start", str(start), "--ramp", str(args.ramp),
+            "--deadline", str(deadline), "--sessions", str(args.sessions),
+            "--think-scale", str(args.think_scale), "--timeout", str(args.timeout), "--seed", str(args.seed),
+        ]
+        if not args.writes:
+            cmd.append("--no-writes")
+        procs.append(await asyncio.create_subprocess_exec(*cmd, cwd=str(config.SUITE_DIR), env=env))
+        first += n
+    codes = await asyncio.gather(*(p.wait() for p in procs))
+    events = []
+    for out, code in zip(outs, codes):
+        events.extend(read_events(Path(out)))
+        os.unlink(out)
+        if code:
+            events.append({"type": "worker_failed", "code": code})
+    return events
+
+
+@dataclass
+class StepStats:
+    step: str
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies_ms) + sum(self.errors.values())
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors.values()) / self.count if self.count else 0.0
+
+
+@dataclass
+class LoadResult:
+    agents: int
+    processes: int
+    wall_s: float
+    steps: Dict[str, StepStats]
+    sessions: int
+    completed: int
+    failed_workers: int = 0
+
+
+def summarize(events: Sequence[dict], agents: int, processes: int) -> LoadResult:
+    steps = {name: StepStats(name) for name in STEPS}
+    ops = [e for e in events if e.get("type") == "op"]
+    for e in ops:
+        stats = steps.setdefault(e["step"], StepStats(e["step"]))
+        if e["ok"]:
+            stats.latencies_ms.append(e["ms"])
+        else:
+            stats.errors[e["error"]] += 1
+    for stats in steps.values():
+        stats.latencies_ms.sort()
+    wall = 0.0
+    if ops:
+        wall = max(e["started_at"] + e["ms"] / 1000.0 for e in ops) - min(e["started_at"] for e in ops)
+    sessions = {(e["agent"], e["session"]) for e in ops}
+    completed = {(e["agent"], e["session"]) for e in ops if e["step"] == STEPS[-1] and e["ok"]}
+    return LoadResult(
+        agents,
+        processes,
+        wall,
+        steps,
+        len(sessions),
+        len(completed),
+        sum(1 for e in events if e.get("type") == "worker_failed"),
+    )
+
+
+def report(result: LoadResult) -> str:
+    minutes = result.wall_s / 60.0 if result.wall_s else 0.0
+    rate = f"{result.completed / minutes:,.1f}" if minutes else "-"
+    lines = [
+        f"{result.agents} agents in {result.processes} processes over {result.wall_s:,.0f} s:"
+        f" {result.sessions} sessions, {result.completed} completed ({rate}/min)"
+        + (f", {result.failed_workers} workers failed" if result.failed_workers else ""),
+        "",
+        "| Step | Ops | Ops/min | Error rate | p50 ms | p90 ms | p99 ms | Max ms |",
+        "|---|---|---|---|---|---|---|---|",
+    ]
+    for stats in result.steps.values():
+        per_min = f"{stats.count / minutes:,.1f}" if minutes else "-"
+        lat = stats.latencies_ms
+        lines.append(
+            f"| {stats.step} | {stats.count} | {per_min} | {stats.error_rate:.1%}"
+            f" | {percentile_ms(lat, 0.5)} | {percentile_ms(lat, 0.9)} | {percentile_ms(lat, 0.99)}"
+            f" | {percentile_ms(lat, 1.0)} |"
+        )
+    errors = sorted(
+        ((n, s.step, msg) for s in result.steps.values() for msg, n in s.errors.items()), reverse=True
+    )
+    if errors:
+        lines += ["", "| Step | Error | Count |", "|---|---|---|"]
+        lines += [f"| {step} | {msg} | {n} |" for n, step, msg in errors[:10]]
+    return "\n".join(lines) + "\n"
+
+
+def _add_load_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--sessions", type=int, default=0, help="max sessions per agent (0: until --duration)"
+    )
+    parser.add_argument("--think-scale", type=float, default=1.0, help="multiplies think times; 0 disables")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds per step")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--no-writes",
+        dest="writes",
+        action="store_false",
+        help="cancel instead of saving and skip the photo upload",
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.load")
+    sub = parser.add_subparsers(dest="command")
+    parser.add_argument("--agents", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--duration", type=float, default=300.0, help="seconds of load after the ramp")
+    parser.add_argument("--ramp", type=float, default=60.0, help="seconds over which agents start")
+    _add_load_options(parser)
+
+    # Internal: one worker process, started by the parent.
+    w = sub.add_parser("worker")
+    for name in ("--first", "--agents", "--total-agents"):
+        w.add_argument(name, type=int, required=True)
+    for name in ("--start", "--ramp", "--deadline"):
+        w.add_argument(name, type=float, required=True)
+    w.add_argument("--out", required=True)
+    w.add_argument("--photo", type=Path, required=True)
+    _add_load_options(w)
+    args = parser.parse_args(argv)
+
+    if args.command == "worker":
+        asyncio.run(
+            worker(
+                args.first, args.agents, args.total_agents, args.out, args.photo, args.start, args.ramp,
+                args.deadline, args.sessions, args.writes, args.think_scale, args.timeout, args.seed,
+            )
+        )
+        return 0
+
+    if args.agents < 1 or args.processes < 1:
+        parser.error("--agents and --processes must be positive")
+    args.processes = min(args.processes, args.agents)
+    photo = asyncio.run(_photo_fixture())
+    events = asyncio.run(_spawn(args, photo))
+    result = summarize(events, args.agents, args.processes)
+    sys.stdout.write(report(result))
+    return 1 if result.failed_workers or not result.completed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
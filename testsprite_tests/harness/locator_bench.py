@@ -0,0 +1,158 @@
+"""Resolution-time benchmark: legacy XPaths vs registry selectors.
+
+    python -m harness.locator_bench [--iterations 200] [--no-login]
+
+Collects every XPath in the suites that has a registry alias, logs in,
+and times both forms of each pair in two ways:
+
+* in-page: ``document.evaluate`` vs ``querySelectorAll`` in a tight loop,
+  i.e. the pure DOM cost without protocol overhead;
+* end-to-end: ``locator.count()`` through Playwright, which is what a
+  script step actually pays.
+"""
+
+import argparse
+import asyncio
+import re
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from . import config, session
+from .locators import REGISTRY, alias_for_xpath
+
+# Matches both live ``locator('xpath=...')`` calls and the ``# xpath=...``
+# comments left behind by harness.migrate_locators.
+XPATH_LITERAL = re.compile(r"""xpath=(?P<xpath>[^'"\s]+)""")
+
+RESOLVE_JS = """
+([pairs, iterations]) => pairs.map(({xpath, css, nth}) => {
+  const byXPath = () => document.evaluate(
+    xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+  ).singleNodeValue;
+  const byCss = () => nth ? document.querySelectorAll(css)[nth - 1] : document.querySelector(css);
+  let t0 = performance.now();
+  for (let i = 0; i < iterations; i++) byXPath();
+  const xpathMs = (performance.now() - t0) / iterations;
+  t0 = performance.now();
+  for (let i = 0; i < iterations; i++) byCss();
+  const cssMs = (performance.now() - t0) / iterations;
+  return {xpathMs, cssMs, xpathFound: !!byXPath(), cssFound: !!byCss()};
+})
+"""
+
+
+@dataclass
+class Pair:
+    xpath: str
+    name: str
+    params: Dict[str, Any]
+
+    @property
+    def css(self) -> str:
+        spec = REGISTRY[self.name]
+        return spec.css.format(**self.params)
+
+    @property
+    def nth(self) -> int:
+        spec = REGISTRY[self.name]
+        return int(self.params[spec.nth_param]) if spec.nth_param else 0
+
+    @property
+    def selector(self) -> str:
+        return REGISTRY[self.name].selector(**self.params)
+
+
+@dataclass
+class PairResult:
+    pair: Pair
+    xpath_dom_us: float
+    css_dom_us: float
+    xpath_found: bool
+    css_found: bool
+    xpath_e2e_ms: float
+    css_e2e_ms: float
+
+
+def collect_pairs(dirs: Sequence[Path] = config.SUITE_DIRS) -> List[Pair]:
+    seen: Dict[str, Pair] = {}
+    for d in dirs:
+        for path in sorted(Path(d).glob("TC*.py")):
+            for m in XPATH_LITERAL.finditer(path.read_text(encoding="utf-8")):
+                xpath = m.group("xpath")
+                alias = alias_for_xpath(xpath)
+                if alias and xpath not in seen:
+                    seen[xpath] = Pair(xpath, *alias)
+    return list(seen.values())
+
+
+async def _e2e_ms(page: Any, selector: str, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        await page.locator(selector).count()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+async def run(pairs: List[Pair], iterations: int, repeats: int, login: bool) -> List[PairResult]:
+    async with session.browser_session() as s:
+        await session.open_app(s.page)
+        if login:
+            await session.login(s.page)
+        payload = [{"xpath": p.xpath, "css": p.css, "nth": p.nth} for p in pairs]
+        dom = await s.page.evaluate(RESOLVE_JS, [payload, iterations])
+        results = []
+        for pair, d in zip(pairs, dom):
+            results.append(
+                PairResult(
+                    pair,
+                    d["xpathMs"] * 1000.0,
+                    d["cssMs"] * 1000.0,
+                    d["xpathFound"],
+                    d["cssFound"],
+                    await _e2e_ms(s.page, "xpath=" + pair.xpath, repeats),
+                    await _e2e_ms(s.page, pair.selector, repeats),
+                )
+            )
+        return results
+
+
+def report(results: List[PairResult]) -> str:
+    lines = [
+        "| Locator | XPath DOM µs | Registry DOM µs | XPath count() ms | Registry count() ms | Found (x/r) |",
+        "|---|---|---|---|---|---|",
+    ]
+    for r in sorted(results, key=lambda r: r.xpath_dom_us, reverse=True):
+        params = ", ".join(f"{k}={v}" for k, v in r.pair.params.items())
+        lines.append(
+            f"| {r.pair.name}({params}) | {r.xpath_dom_us:.1f} | {r.css_dom_us:.1f}"
+            f" | {r.xpath_e2e_ms:.2f} | {r.css_e2e_ms:.2f}"
+            f" | {'y' if r.xpath_found else 'n'}/{'y' if r.css_found else 'n'} |"
+        )
+    if results:
+        x = sum(r.xpath_dom_us for r in results)
+        c = sum(r.css_dom_us for r in results)
+        lines.append("")
+        lines.append(f"Total DOM time per resolution of all pairs: XPath {x:.1f} µs, registry {c:.1f} µs")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.locator_bench")
+    parser.add_argument("--iterations", type=int, default=200, help="in-page loop count")
+    parser.add_argument("--repeats", type=int, default=5, help="count() calls per selector")
+    parser.add_argument("--no-login", action="store_true")
+    args = parser.parse_args(argv)
+
+    pairs = collect_pairs()
+    results = asyncio.run(run(pairs, args.iterations, args.repeats, not args.no_login))
+    sys.stdout.write(report(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Semantic locator registry.
+
+Maps names such as ``entry_form.save`` or ``calendar.cell`` to selectors
+built on the ``testID`` props of the app, which react-native-web renders
+as ``data-testid``. Unlike the generated ``html/body/div[4]/div/...``
+XPaths these survive layout changes and resolve with a single attribute
+lookup.
+
+    from harness.locators import L, selector
+
+    page.locator(selector("entry_form.save"))
+    page.locator(L.calendar.cell("2025-08-04"))
+    page.locator(L.filter_modal.tab(tab="agente"))
+"""
+
+import re
+import string
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class LocatorSpec:
+    name: str
+    css: str
+    # Name of a 1-based index parameter selecting among all matches.
+    nth_param: Optional[str] = None
+    description: str = ""
+
+    @property
+    def params(self) -> List[str]:
+        fields = [f for _, f, _, _ in string.Formatter().parse(self.css) if f]
+        return fields + ([self.nth_param] if self.nth_param else [])
+
+    def selector(self, **params: Any) -> str:
+        missing = [p for p in self.params if p not in params]
+        if missing:
+            raise KeyError(f"{self.name} needs {', '.join(missing)}")
+        css = self.css.format(**params)
+        if self.nth_param:
+            return f":nth-match({css}, {int(params[self.nth_param])})"
+        return css
+
+
+def _testid(value: str) -> str:
+    return f'[data-testid="{value}"]'
+
+
+FILTER_TABS = ("linea", "areaManager", "nam", "agente", "insegna", "codice", "cliente")
+
+_SPECS = [
+    LocatorSpec("app.loading", _testid("initial-loading-screen"), description="InitialLoadingScreen"),
+    LocatorSpec("login.open", _testid("login-open"), description="'Accedi o Registrati'"),
+    LocatorSpec("login.email", _testid("login-email")),
+    LocatorSpec("login.password", _testid("login-password")),
+    LocatorSpec("login.submit", _testid("login-submit")),
+    LocatorSpec("login.cancel", _testid("login-cancel")),
+    LocatorSpec("tabs.calendar", _testid("tab-calendario")),
+    LocatorSpec("tabs.leaderboard", _testid("tab-classifica")),
+    LocatorSpec("tabs.settings", _testid("tab-impostazioni")),
+    LocatorSpec("calendar.view_week", _testid("calendar-view-week")),
+    LocatorSpec("calendar.view_month", _testid("calendar-view-month")),
+    LocatorSpec("calendar.filters_open", _testid("calendar-filters-open")),
+    LocatorSpec("calendar.today", _testid("calendar-today")),
+    LocatorSpec("calendar.cell", _testid("calendar-cell-{date}"), description="date is YYYY-MM-DD"),
+    LocatorSpec("calendar.cell_add", _testid("calendar-cell-{date}-add")),
+    LocatorSpec(
+        "calendar.day",
+        '[data-testid^="calendar-cell-"]:not([data-testid$="-add"])',
+        nth_param="index",
+        description="n-th visible day cell",
+    ),
+    LocatorSpec(
+        "calendar.day_add",
+        '[data-testid^="calendar-cell-"][data-testid$="-add"]',
+        nth_param="index",
+        description="'+' button of the n-th visible day",
+    ),
+    LocatorSpec("entry_form.save", _testid("entry-form-save")),
+    LocatorSpec("entry_form.cancel", _testid("entry-form-cancel")),
+    LocatorSpec("entry_form.close", _testid("entry-form-close")),
+    LocatorSpec("entry_form.delete", _testid("entry-form-delete")),
+    LocatorSpec("entry_form.ordered", _testid("focus-ref-ordered-{code}")),
+    LocatorSpec("entry_form.sold", _testid("focus-ref-sold-{code}")),
+    LocatorSpec(
+        "entry_form.ordered_row",
+        '[data-testid^="focus-ref-ordered-"]',
+        nth_param="index",
+        description="'Ordinato (PZ)' input of the n-th focus reference row",
+    ),
+    LocatorSpec(
+        "entry_form.sold_row",
+        '[data-testid^="focus-ref-sold-"]',
+        nth_param="index",
+        description="'Venduto (PZ)' input of the n-th focus reference row",
+    ),
+    LocatorSpec("filter_modal.confirm", _testid("filter-modal-confirm")),
+    LocatorSpec("filter_modal.cancel", _testid("filter-modal-cancel")),
+    LocatorSpec("filter_modal.reset", _testid("filter-modal-reset")),
+    LocatorSpec("filter_modal.close", _testid("filter-modal-close")),
+    LocatorSpec("filter_modal.search", _testid("filter-modal-search"), description="'Cerca...'"),
+    LocatorSpec("filter_modal.tab", _testid("filter-modal-tab-{tab}"), description=" / ".join(FILTER_TABS)),
+]
+
+REGISTRY: Dict[str, LocatorSpec] = {spec.name: spec for spec in _SPECS}
+
+
+def selector(name: str, **params: Any) -> str:
+    try:
+        spec = REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"unknown locator {name!r}") from None
+    return spec.selector(**params)
+
+
+def locate(target: Any, name: str, **params: Any) -> Any:
+    """``target.locator(...)`` for a Page, Frame or Locator."""
+    return target.locator(selector(name, **params))
+
+
+class _Group:
+    def __init__(self, prefix: str):
+        self._prefix = prefix
+
+    def __getattr__(self, attr: str) -> Any:
+        name = f"{self._prefix}.{attr}"
+        spec = REGISTRY.get(name)
+        if spec is None:
+            raise AttributeError(f"unknown locator {name!r}")
+        if not spec.params:
+            return spec.selector()
+
+        def build(*args: Any, **kwargs: Any) -> str:
+            kwargs.update(zip(spec.params, args))
+            return spec.selector(**kwargs)
+
+        return build
+
+
+class _Registry:
+    def __getattr__(self, group: str) -> _Group:
+        if not any(n.startswith(group + ".") for n in REGISTRY):
+            raise AttributeError(f"unknown locator group {group!r}")
+        return _Group(group)
+
+
+L = _Registry()
+
+
+# -- legacy XPath aliases ---------------------------------------------------
+#
+# The generated scripts address elements by absolute position. Each pattern
+# below was matched against what that position renders in the current app;
+# the migration tool uses them to rewrite scripts. Patterns are anchored and
+# tried in order, so keep longer paths first.
+
+_CAL = r"html/body/div/div/div/div/div/div/div/div/div\[2\]/div/div\[2\]"
+_FORM = r"html/body/div\[4\]/div/div\[2\]/div/div/div"
+_LOGIN = r"html/body/div\[3\]/div/div\[2\]/div/div/div/div"
+_FILTER = _LOGIN + r"/div\[2\]"
+_TABS = r"html/body/div/div/div/div\[2\]/div\[2\]"
+_HEADER = r"html/body/div/div/div/div/div/div/div/div/div/div/div\[2\]"
+
+ParamFn = Callable[[re.Match], Dict[str, Any]]
+
+
+def _n(group: int = 1, offset: int = 0) -> ParamFn:
+    return lambda m: {"index": int(m.group(group) or 1) + offset}
+
+
+XPATH_ALIASES: List[Tuple[re.Pattern, str, Optional[ParamFn]]] = [
+    (re.compile(p + r"$"), name, params)
+    for p, name, params in [
+        (_FORM + r"/div\[2\]/div/div\[3\]/div\[2\]/div\[2\]/div/div\[(\d+)\]/div\[5\]/input", "entry_form.ordered_row", _n(1, -1)),
+        (_FORM + r"/div\[2\]/div/div\[3\]/div\[2\]/div\[2\]/div/div\[(\d+)\]/div\[6\]/input", "entry_form.sold_row", _n(1, -1)),
+        (_FORM + r"/div\[3\]/div\[2\]", "entry_form.save", None),
+        (_FORM + r"/div\[3\]/div(?:\[1\])?", "entry_form.cancel", None),
+        (_FORM + r"/div/div\[3\]", "entry_form.delete", None),
+        (_FORM + r"/div/div(?:\[1\])?", "entry_form.close", None),
+        (_FILTER + r"/div\[5\]/div(?:\[2\])?/div\[2\]", "filter_modal.confirm", None),
+        (_FILTER + r"/div\[5\]/div(?:\[2\])?/div(?:\[1\])?", "filter_modal.cancel", None),
+        (_FILTER + r"/div\[2\]/div/div(?:\[(\d+)\])?", "filter_modal.tab",
+         lambda m: {"tab": FILTER_TABS[int(m.group(1) or 1) - 1]}),
+        (_LOGIN + r"/input", "login.email", None),
+        (_LOGIN + r"/input\[2\]", "login.password", None),
+        (_LOGIN + r"/div\[2\]", "login.submit", None),
+        (_LOGIN + r"/div\[5\]", "login.cancel", None),
+        (r"html/body/div/div/div/div/div\[4\]", "login.open", None),
+        (_CAL + r"/div(?:\[(\d+)\])?/div/div/div\[2\]", "calendar.day_add", _n()),
+        (_CAL + r"/div(?:\[(\d+)\])?", "calendar.day", _n()),
+        (_HEADER + r"/div(?:\[1\])?", "calendar.view_week", None),
+        (_HEADER + r"/div\[2\]", "calendar.view_month", None),
+        (_HEADER + r"/div\[3\]", "calendar.filters_open", None),
+        # Position 2 used to be 'Tag Test'; it now renders 'Classifica'.
+        (_TABS + r"/a(?:\[1\])?", "tabs.calendar", None),
+        (_TABS + r"/a\[2\]", "tabs.leaderboard", None),
+        (_TABS + r"/a\[3\]", "tabs.settings", None),
+    ]
+]
+
+
+def alias_for_xpath(xpath: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Registry name and params for a legacy XPath, if one is known."""
+    xpath = xpath.strip()
+    if xpath.startswith("xpath="):
+        xpath = xpath[len("xpath="):]
+    for pattern, name, params in XPATH_ALIASES:
+        m = pattern.match(xpath)
+        if m:
+            return name, (params(m) if params else {})
+    return None
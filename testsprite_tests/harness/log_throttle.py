@@ -0,0 +1,376 @@
+"""Throttling verifier for ``OptimizedLogger`` (``src/utils/optimizedLogging.ts``).
+
+    python -m harness.log_throttle [--duration 60] [--rate 20] [--no-login]
+
+Logs in, opens the filter modal and types into its search field at
+``--rate`` changes per second, switching tab every ``--tab-every``
+changes. Each change re-runs the ``filteredData`` memo, which is what calls
+``throttledLog`` and ``aggregatedLog``. Console lines are parsed with
+:mod:`harness.console_log` and checked against the app's rules:
+
+* a ``throttledLog`` key (``component_level_message``, as found in the
+  throttle cache) never logs twice within its window;
+* an ``Aggregated: <event>`` line is emitted every 10 events, or after 30 s;
+* the throttle cache and the ``*_aggregated_*`` / ``*_conditional_*_data``
+  globals stay under ``MAX_CACHE_SIZE``. They are sampled every
+  ``--sample-s`` seconds so growth over the run shows up.
+
+Keys that log at a high rate without going through the throttle are listed
+too. The exit code is 1 when a rule is broken, or when no captured line
+matched a throttle cache key and the throttle rule was never checked.
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from . import session
+from .app_metrics import TEST_HOOKS_JS
+from .console_log import LogCollector, LogRecord
+from .locators import FILTER_TABS, selector
+
+# Mirrors optimizedLogging.ts; the hook reports the live values when present.
+LOG_THROTTLE_MS = 5000
+MAX_CACHE_SIZE = 1000
+AGGREGATE_EVERY = 10
+AGGREGATE_WINDOW_MS = 30000
+# Call sites that pass their own window.
+WINDOWS = {
+    "FlatList renderizzata": 10000,
+}
+WINDOW_PREFIXES = {
+    "Performance: ": 2000,
+}
+
+# Console lines reach Python with some jitter; gaps this much shorter than
+# the window still count as throttled.
+TOLERANCE_MS = 250
+# Search strings typed in turn; each differs from the previous one.
+SEARCH_TEXT = ("a", "ab", "abc", "ab", "")
+
+CACHE_JS = """
+() => {
+  const ol = (window.__appTestHooks || {}).optimizedLogging;
+  if (!ol) return null;
+  let aggregated = 0, live = 0, conditional = 0;
+  for (const k of Object.keys(globalThis)) {
+    if (k.includes('_aggregated_')) { aggregated++; if (globalThis[k]) live++; }
+    else if (k.includes('_conditional_') && k.endsWith('_data')) conditional++;
+  }
+  return {throttle: ol.throttleCache.size, aggregated, live, conditional};
+}
+"""
+
+KEYS_JS = """
+() => {
+  const ol = (window.__appTestHooks || {}).optimizedLogging;
+  if (!ol) return null;
+  return {
+    throttle: Array.from(ol.throttleCache.keys()),
+    windowMs: ol.LOG_THROTTLE_MS,
+    maxCacheSize: ol.MAX_CACHE_SIZE,
+  };
+}
+"""
+
+AGGREGATED_PREFIX = "Aggregated: "
+TIMESPAN = re.compile(r"^(\d+)ms$")
+
+
+def window_for(message: str, default_ms: int = LOG_THROTTLE_MS) -> int:
+    if message in WINDOWS:
+        return WINDOWS[message]
+    for prefix, ms in WINDOW_PREFIXES.items():
+        if message.startswith(prefix):
+            return ms
+    return default_ms
+
+
+@dataclass
+class CacheSample:
+    elapsed_s: float
+    throttle: int
+    # ``*_aggregated_*`` globals; ``live`` is the non-null ones. aggregatedLog
+    # resets a key to null instead of deleting it.
+    aggregated: int
+    live: int
+    conditional: int
+
+
+@dataclass
+class KeyRate:
+    key: str
+    lines: int
+    per_s: float
+    window_ms: Optional[int] = None
+    min_gap_ms: Optional[float] = None
+
+    @property
+    def violated(self) -> bool:
+        return (
+            self.window_ms is not None
+            and self.min_gap_ms is not None
+            and self.min_gap_ms < self.window_ms - TOLERANCE_MS
+        )
+
+
+@dataclass
+class AggregateCheck:
+    event: str
+    lines: int
+    events: int = 0
+    # Lines emitted with neither 10 events nor 30 s behind them.
+    early: int = 0
+
+
+@dataclass
+class ThrottleReport:
+    duration_s: float
+    interactions: int
+    lines: int
+    throttled: List[KeyRate] = field(default_factory=list)
+    unthrottled: List[KeyRate] = field(default_factory=list)
+    aggregated: List[AggregateCheck] = field(default_factory=list)
+    samples: List[CacheSample] = field(default_factory=list)
+    max_cache_size: int = MAX_CACHE_SIZE
+    # Keys in the app's throttle cache at the end of the run.
+    throttle_keys: int = 0
+
+    @property
+    def violations(self) -> List[str]:
+        out = []
+        if not self.throttled:
+            # Nothing was checked: either no throttledLog call ran or the
+            # captured lines no longer produce the app's cache keys.
+            out.append(
+                f"no captured log line matched any of the {self.throttle_keys}"
+                " throttle cache key(s); the throttle rule was not checked"
+            )
+        out += [
+            f"{k.key}: {k.min_gap_ms:.0f} ms between lines, window {k.window_ms} ms"
+            for k in self.throttled
+            if k.violated
+        ]
+        out += [
+            f"{a.event}: {a.early} aggregated line(s) before {AGGREGATE_EVERY} events"
+            for a in self.aggregated
+            if a.early
+        ]
+        if self.samples:
+            last = self.samples[-1]
+            for name, size in (("throttle cache", last.throttle), ("aggregated globals", last.aggregated)):
+                if size > self.max_cache_size:
+                    out.append(f"{name}: {size} keys, limit {self.max_cache_size}")
+        return out
+
+
+def _key(r: LogRecord) -> str:
+    """The throttle cache key, ``${component}_${level}_${message}``.
+
+    ``r.message`` is the first console argument only; the ``data`` that
+    ``logger`` passes as a second argument is not part of the key.
+    """
+    return f"{r.module}_{r.level}_{r.message}"
+
+
+def _rate(key: str, times: List[float], duration_s: float, window_ms: Optional[int]) -> KeyRate:
+    gaps = [(b - a) * 1000.0 for a, b in zip(times, times[1:])]
+    return KeyRate(
+        key,
+        len(times),
+        len(times) / duration_s if duration_s else 0.0,
+        window_ms,
+        min(gaps) if gaps else None,
+    )
+
+
+def _aggregate(event: str, records: List[LogRecord]) -> AggregateCheck:
+    check = AggregateCheck(event, len(records))
+    for r in records:
+        payload = r.payload if isinstance(r.payload, dict) else {}
+        total = payload.get("totalEvents")
+        if not isinstance(total, (int, float)):
+            continue
+        check.events += int(total)
+        m = TIMESPAN.match(str(payload.get("timespan", "")))
+        waited = int(m.group(1)) if m else 0
+        if total % AGGREGATE_EVERY and waited <= AGGREGATE_WINDOW_MS:
+            check.early += 1
+    return check
+
+
+def analyze(
+    records: List[LogRecord],
+    throttle_keys: List[str],
+    duration_s: float,
+    interactions: int = 0,
+    samples: Optional[List[CacheSample]] = None,
+    default_window_ms: int = LOG_THROTTLE_MS,
+    max_cache_size: int = MAX_CACHE_SIZE,
+    min_rate: float = 1.0,
+) -> ThrottleReport:
+    """Check captured records against the throttle and aggregation rules."""
+    known = set(throttle_keys)
+    times: Dict[str, List[float]] = defaultdict(list)
+    messages: Dict[str, str] = {}
+    aggregated: Dict[str, List[LogRecord]] = defaultdict(list)
+    for r in records:
+        if r.message.startswith(AGGREGATED_PREFIX):
+            aggregated[f"{r.module}:{r.message[len(AGGREGATED_PREFIX):]}"].append(r)
+        else:
+            times[_key(r)].append(r.logged_at)
+            messages[_key(r)] = r.message
+
+    out = ThrottleReport(
+        duration_s,
+        interactions,
+        len(records),
+        samples=samples or [],
+        max_cache_size=max_cache_size,
+        throttle_keys=len(known),
+    )
+    for key, ts in times.items():
+        if key in known:
+            window = window_for(messages[key], default_window_ms)
+            out.throttled.append(_rate(key, ts, duration_s, window))
+        else:
+            rate = _rate(key, ts, duration_s, None)
+            if rate.per_s >= min_rate:
+                out.unthrottled.append(rate)
+    out.throttled.sort(key=lambda k: -k.per_s)
+    out.unthrottled.sort(key=lambda k: -k.per_s)
+    out.aggregated = sorted((_aggregate(e, rs) for e, rs in aggregated.items()), key=lambda a: -a.lines)
+    return out
+
+
+async def _sample(page: Any, started: float) -> Optional[CacheSample]:
+    raw = await page.evaluate(CACHE_JS)
+    if raw is None:
+        return None
+    elapsed = time.monotonic() - started
+    return CacheSample(elapsed, raw["throttle"], raw["aggregated"], raw["live"], raw["conditional"])
+
+
+async def run(
+    duration_s: float,
+    rate: float,
+    tab_every: int,
+    sample_s: float,
+    login: bool,
+) -> ThrottleReport:
+    collector = LogCollector(capacity=200_000)
+    async with session.browser_session() as s:
+        await s.context.add_init_script(TEST_HOOKS_JS)
+        collector.attach(s.page)
+        await session.open_app(s.page)
+        if login:
+            await session.login(s.page)
+        if await s.page.evaluate(CACHE_JS) is None:
+            raise RuntimeError("optimizedLogging test hook not available; is this a dev or test build?")
+
+        await s.page.locator(selector("calendar.filters_open")).click()
+        search = s.page.locator(selector("filter_modal.search"))
+        await search.wait_for()
+        collector.records.clear()
+        started = time.monotonic()
+        samples = [await _sample(s.page, started)]
+        next_sample = sample_s
+        interactions = 0
+        interval = 1.0 / rate
+        while time.monotonic() - started < duration_s:
+            if tab_every and interactions % tab_every == 0:
+                tab = FILTER_TABS[(interactions // tab_every) % len(FILTER_TABS)]
+                await s.page.locator(selector("filter_modal.tab", tab=tab)).click()
+            await search.fill(SEARCH_TEXT[interactions % len(SEARCH_TEXT)])
+            interactions += 1
+            elapsed = time.monotonic() - started
+            if elapsed >= next_sample:
+                samples.append(await _sample(s.page, started))
+                next_sample += sample_s
+            await asyncio.sleep(max(0.0, interactions * interval - elapsed))
+        duration = time.monotonic() - started
+        samples.append(await _sample(s.page, started))
+        keys = await s.page.evaluate(KEYS_JS)
+        await collector.settle()
+
+    return analyze(
+        list(collector.records),
+        keys["throttle"],
+        duration,
+        interactions,
+        [x for x in samples if x is not None],
+        default_window_ms=keys["windowMs"],
+        max_cache_size=keys["maxCacheSize"],
+    )
+
+
+def _growth(samples: List[CacheSample], attr: str) -> str:
+    """Keys added per minute over the second half of the run."""
+    half = [x for x in samples if x.elapsed_s >= samples[-1].elapsed_s / 2]
+    if len(half) < 2 or half[-1].elapsed_s == half[0].elapsed_s:
+        return "-"
+    added = getattr(half[-1], attr) - getattr(half[0], attr)
+    per_min = added * 60.0 / (half[-1].elapsed_s - half[0].elapsed_s)
+    return f"{per_min:+.1f}/min"
+
+
+def report(r: ThrottleReport, limit: int = 15) -> str:
+    lines = [
+        f"{r.interactions} interactions in {r.duration_s:.0f} s"
+        f" ({r.interactions / r.duration_s if r.duration_s else 0:.1f}/s), {r.lines} log lines",
+        "",
+        "| Throttled key | Window ms | Lines | Lines/s | Min gap ms | OK |",
+        "|---|---|---|---|---|---|",
+    ]
+    for k in r.throttled[:limit]:
+        gap = f"{k.min_gap_ms:.0f}" if k.min_gap_ms is not None else "-"
+        lines.append(
+            f"| {k.key} | {k.window_ms} | {k.lines} | {k.per_s:.2f} | {gap} | {'n' if k.violated else 'y'} |"
+        )
+    if r.aggregated:
+        lines += ["", "| Aggregated event | Lines | Events | Events/line | Early |", "|---|---|---|---|---|"]
+        for a in r.aggregated[:limit]:
+            per_line = a.events / a.lines if a.lines else 0
+            lines.append(f"| {a.event} | {a.lines} | {a.events} | {per_line:.1f} | {a.early} |")
+    if r.unthrottled:
+        lines += ["", "Not throttled, by rate:", "", "| Key | Lines | Lines/s |", "|---|---|---|"]
+        for k in r.unthrottled[:limit]:
+            lines.append(f"| {k.key} | {k.lines} | {k.per_s:.2f} |")
+    if r.samples:
+        first, last = r.samples[0], r.samples[-1]
+        lines += ["", f"| Cache (limit {r.max_cache_size}) | Start | End | Late growth |", "|---|---|---|---|"]
+        for name, attr in (
+            ("throttle cache", "throttle"),
+            ("aggregated globals", "aggregated"),
+            ("conditional globals", "conditional"),
+        ):
+            start, end = getattr(first, attr), getattr(last, attr)
+            lines.append(f"| {name} | {start} | {end} | {_growth(r.samples, attr)} |")
+            if attr == "aggregated":
+                lines.append(f"| of which null | {start - first.live} | {end - last.live} | |")
+    violations = r.violations
+    lines += ["", f"Violations: {len(violations)}"] + [f"- {v}" for v in violations]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.log_throttle")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of interaction")
+    parser.add_argument("--rate", type=float, default=20.0, help="search changes per second")
+    parser.add_argument("--tab-every", type=int, default=10, help="switch tab every N changes (0: never)")
+    parser.add_argument("--sample-s", type=float, default=5.0, help="cache sampling interval")
+    parser.add_argument("--no-login", action="store_true")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args.duration, args.rate, args.tab_every, args.sample_s, not args.no_login))
+    sys.stdout.write(report(result))
+    return 1 if result.violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Rewrite generated scripts from positional XPaths to registry locators.
+
+    python -m harness.migrate_locators            # dry run over both suites
+    python -m harness.migrate_locators --write    # rewrite in place
+
+Only XPaths with a known alias in :data:`harness.locators.XPATH_ALIASES`
+are touched; everything else is listed so new aliases can be added.
+"""
+
+import argparse
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Sequence
+
+from . import config
+from .locators import alias_for_xpath
+
+XPATH_CALL = re.compile(r"""\.locator\((['"])xpath=(?P<xpath>[^'"]+)\1\)""")
+IMPORT_LINE = "from harness.locators import selector\n"
+ANCHOR = "from playwright import async_api\n"
+
+
+@dataclass
+class FileMigration:
+    path: Path
+    source: str
+    rewritten: str
+    replaced: int = 0
+    unknown: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return self.source != self.rewritten
+
+
+def _call(name: str, params: dict) -> str:
+    args = [repr(name)] + [f"{k}={v!r}" for k, v in params.items()]
+    return f".locator(selector({', '.join(args)}))"
+
+
+def migrate_source(path: Path, source: str) -> FileMigration:
+    """Rewrite one script. The old XPath is kept as a trailing comment so
+    the benchmark can still pair it with its registry name."""
+    result = FileMigration(path, source, source)
+    lines = []
+    for line in source.splitlines(keepends=True):
+        legacy: List[str] = []
+
+        def repl(m: re.Match) -> str:
+            alias = alias_for_xpath(m.group("xpath"))
+            if alias is None:
+                result.unknown.append(m.group("xpath"))
+                return m.group(0)
+            legacy.append(m.group("xpath"))
+            return _call(*alias)
+
+        new = XPATH_CALL.sub(repl, line)
+        if legacy:
+            result.replaced += len(legacy)
+            body = new.rstrip("\r\n")
+            eol = new[len(body):]
+            new = body + "".join(f"  # xpath={x}" for x in legacy) + eol
+        lines.append(new)
+
+    text = "".join(lines)
+    if result.replaced and IMPORT_LINE not in text:
+        if ANCHOR in text:
+            text = text.replace(ANCHOR, ANCHOR + IMPORT_LINE, 1)
+        else:
+            text = IMPORT_LINE + text
+    result.rewritten = text
+    return result
+
+
+def migrate(paths: Iterable[Path], write: bool = False) -> List[FileMigration]:
+    results = []
+    for path in paths:
+        source = path.read_text(encoding="utf-8")
+        result = migrate_source(path, source)
+        if write and result.changed:
+            path.write_text(result.rewritten, encoding="utf-8")
+        results.append(result)
+    return results
+
+
+def _scripts(dirs: Sequence[Path]) -> List[Path]:
+    return [p for d in dirs for p in sorted(Path(d).glob("TC*.py"))]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.migrate_locators")
+    parser.add_argument("paths", nargs="*", type=Path, help="scripts (default: both suites)")
+    parser.add_argument("--write", action="store_true", help="rewrite files in place")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or _scripts(config.SUITE_DIRS)
+    results = migrate(paths, write=args.write)
+
+    unknown: Counter = Counter()
+    for r in results:
+        unknown.update(r.unknown)
+        if r.replaced:
+            print(f"{r.path.name}: {r.replaced} locator(s) migrated, {len(r.unknown)} left")
+    total = sum(r.replaced for r in results)
+    print(f"\n{total} XPath locator(s) migrated, {sum(unknown.values())} without alias"
+          f"{'' if args.write else ' (dry run)'}")
+    for xpath, count in unknown.most_common(20):
+        print(f"  {count:3d}  {xpath}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
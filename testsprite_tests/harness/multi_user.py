@@ -0,0 +1,187 @@
+"""Real-time propagation latency between K logged-in users (TC011).
+
+    python -m harness.multi_user [--actors 2,3,4,8] [--edits 20]
+
+TC011 needs two users at once, but every generated script has a single
+browser context. Here one browser holds K contexts, each logged in as a
+user from ``TEST_USERS`` (``setupTestUsers.ts``; with K above four the
+users repeat, one context each). Actor 0 writes, the others observe:
+
+* every observer subscribes with
+  ``FirebaseCalendarRepository.subscribeToEntries``, the ``onSnapshot``
+  listener behind the calendar's real-time sync, filtered on a harness
+  ``userId`` so only the benchmark's entry comes through;
+* the writer creates one entry, then updates its notes ``--edits`` times
+  with ``updateEntry``. Each edit waits until every observer has seen it
+  (or ``--timeout``) before the next one starts;
+* an observer stamps the first snapshot that carries each edit.
+
+Latency is from the start of ``updateEntry`` on the writer to that stamp
+on the observer. All contexts live in one browser on one machine, so the
+pages share a wall clock (``performance.timeOrigin + performance.now()``).
+The table gives the distribution over every (edit, observer) pair for
+each K, plus the writer's own acknowledgement time. The entry is deleted
+at the end of each K.
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Sequence
+
+from . import session
+from .calendar_seed import calendar_entry
+from .firestore_helpers import create_entry, delete_entry
+from .tables import percentile_ms
+
+ACTORS = (2, 3, 4, 8)
+BENCH_SALES_POINT = "harness_multi_user"
+BENCH_USER_ID = "harness_multi_user"
+HOOKS_READY_JS = "() => !!(window.__appTestHooks && window.__appTestHooks.FirebaseCalendarRepository)"
+
+SUBSCRIBE_JS = """
+({userId}) => {
+  const repo = new window.__appTestHooks.FirebaseCalendarRepository();
+  const state = window.__harnessPropagation = {seen: {}, snapshots: 0, unsubscribe: null};
+  state.unsubscribe = repo.subscribeToEntries((entries) => {
+    const now = performance.timeOrigin + performance.now();
+    state.snapshots += 1;
+    for (const e of entries) {
+      const key = `${e.id}:${e.notes}`;
+      if (!(key in state.seen)) state.seen[key] = now;
+    }
+  }, {userId});
+}
+"""
+
+SEEN_JS = "(key) => !!(window.__harnessPropagation && key in window.__harnessPropagation.seen)"
+
+STAMP_JS = """
+(key) => {
+  const state = window.__harnessPropagation;
+  return state && key in state.seen ? state.seen[key] : null;
+}
+"""
+
+UNSUBSCRIBE_JS = """
+() => {
+  const state = window.__harnessPropagation;
+  if (state && state.unsubscribe) state.unsubscribe();
+  window.__harnessPropagation = null;
+}
+"""
+
+EDIT_JS = """
+async ({entry, id, notes}) => {
+  const repo = new window.__appTestHooks.FirebaseCalendarRepository();
+  const started = performance.timeOrigin + performance.now();
+  await repo.updateEntry({...entry, id, date: new Date(entry.date), notes});
+  return {started, ackMs: performance.timeOrigin + performance.now() - started};
+}
+"""
+
+
+@dataclass
+class PropagationResult:
+    actors: int
+    edits: int
+    latencies_ms: List[float] = field(default_factory=list)
+    ack_ms: List[float] = field(default_factory=list)
+    missed: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+async def measure(browser: Any, actors: int, edits: int, timeout_s: float) -> PropagationResult:
+    result = PropagationResult(actors, edits)
+    timeout_ms = timeout_s * 1000
+    logins = (session.logged_in_context(browser, i, timeout_ms, HOOKS_READY_JS) for i in range(actors))
+    opened = await asyncio.gather(*logins, return_exceptions=True)
+    contexts = [o[0] for o in opened if not isinstance(o, BaseException)]
+    try:
+        failed = [o for o in opened if isinstance(o, BaseException)]
+        if failed:
+            result.errors.append(f"login: {type(failed[0]).__name__}: {str(failed[0])[:120]}")
+            return result
+        writer = opened[0][1]
+        observers = [page for _, page in opened[1:]]
+        await asyncio.gather(*(p.evaluate(SUBSCRIBE_JS, {"userId": BENCH_USER_ID}) for p in observers))
+
+        entry = calendar_entry(dt.date.today(), BENCH_SALES_POINT, [], user_id=BENCH_USER_ID)
+        # addEntry stamps these itself; on updateEntry the strings would replace the Timestamps.
+        for key in ("id", "createdAt", "updatedAt"):
+            entry.pop(key)
+        entry_id = await create_entry(writer, entry)
+        try:
+            run_id = f"{time.time():.0f}"
+            for i in range(edits):
+                notes = f"harness multi-user {run_id} edit {i}"
+                key = f"{entry_id}:{notes}"
+                edit = await writer.evaluate(EDIT_JS, {"entry": entry, "id": entry_id, "notes": notes})
+                result.ack_ms.append(edit["ackMs"])
+                await asyncio.gather(
+                    *(p.wait_for_function(SEEN_JS, arg=key, polling=10) for p in observers),
+                    return_exceptions=True,
+                )
+                stamps = await asyncio.gather(*(p.evaluate(STAMP_JS, key) for p in observers))
+                for stamp in stamps:
+                    if stamp is None:
+                        result.missed += 1
+                    else:
+                        result.latencies_ms.append(stamp - edit["started"])
+        finally:
+            await delete_entry(writer, entry_id)
+            await asyncio.gather(*(p.evaluate(UNSUBSCRIBE_JS) for p in observers), return_exceptions=True)
+    except Exception as exc:
+        result.errors.append(f"{type(exc).__name__}: {str(exc)[:120]}")
+    finally:
+        for context in contexts:
+            await context.close()
+    return result
+
+
+async def run(actors: Sequence[int], edits: int, timeout_s: float) -> List[PropagationResult]:
+    results = []
+    async with session.browser_session(default_timeout_ms=timeout_s * 1000) as s:
+        for k in actors:
+            results.append(await measure(s.browser, k, edits, timeout_s))
+    return results
+
+
+def report(results: Sequence[PropagationResult]) -> str:
+    lines = [
+        "| Actors | Observers | Samples | p50 ms | p90 ms | p99 ms | Max ms | Writer ack p50 ms | Missed |",
+        "|---|---|---|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        latency = " | ".join(percentile_ms(r.latencies_ms, q) for q in (0.5, 0.9, 0.99, 1.0))
+        lines.append(
+            f"| {r.actors} | {r.actors - 1} | {len(r.latencies_ms)} | {latency}"
+            f" | {percentile_ms(r.ack_ms, 0.5)} | {r.missed} |"
+        )
+    notes = [f"{r.actors} actors: {e}" for r in results for e in r.errors]
+    if notes:
+        lines.append("")
+        lines.extend(f"* {n}" for n in notes)
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.multi_user")
+    parser.add_argument("--actors", default=",".join(map(str, ACTORS)), help="K values (writer included)")
+    parser.add_argument("--edits", type=int, default=20, help="edits per K")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds per login and per edit")
+    args = parser.parse_args(argv)
+    actors = [int(x) for x in args.actors.split(",") if x.strip()]
+    if any(k < 2 for k in actors):
+        parser.error("every K needs a writer and at least one observer (K >= 2)")
+
+    results = asyncio.run(run(actors, args.edits, args.timeout))
+    sys.stdout.write(report(results))
+    return 1 if any(r.errors or r.missed for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
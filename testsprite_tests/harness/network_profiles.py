@@ -0,0 +1,332 @@
+"""Named network profiles and how save, upload and initial load degrade under them.
+
+    python -m harness.network_profiles [--profiles office_wifi,4g,rural_3g,flaky] [--repeat 3]
+
+Agents in the field wait on Firestore and on ``FirebasePhotoService``
+uploads, while tests run at localhost speed. A profile is applied per page
+with the DevTools protocol (``Network.emulateNetworkConditions``), which
+throttles everything the page sends, including Firestore's WebChannel
+streams and Firebase Auth. ``flaky`` also drops the connection on a fixed
+schedule (online for a few seconds, then offline), so the same outages
+come back on every run.
+
+The benchmark runs once without throttling (``none``) and then once per
+profile, each in a fresh browser context:
+
+* ``load``: ``goto`` until the login button shows up (bundle and app shell);
+* ``calendar``: login until the week view shows up (Auth plus the initial
+  Firestore load);
+* ``save``: ``FirebaseCalendarRepository.addEntry`` until Firestore
+  acknowledges it (median of ``--repeat``; the entries are deleted);
+* ``upload``: ``FirebasePhotoService.savePhoto`` with a generated JPEG of
+  about ``--photo-kb`` (median; the photos are deleted).
+
+Each cell also shows the slowdown against ``none``. ``harness run
+--network PROFILE`` applies a profile to every page the scripts open
+(see :mod:`harness.instrument`).
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import session
+from .app_metrics import TEST_HOOKS_JS
+from .calendar_seed import calendar_entry
+from .locators import selector
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    name: str
+    latency_ms: float
+    download_kbps: float
+    upload_kbps: float
+    connection: str
+    # Seconds online, then seconds offline, repeated for as long as the page lives.
+    outage: Optional[Tuple[float, float]] = None
+
+    def conditions(self, offline: bool = False) -> Dict[str, Any]:
+        """Parameters for ``Network.emulateNetworkConditions``; -1 means unthrottled."""
+        return {
+            "offline": offline,
+            "latency": self.latency_ms,
+            "downloadThroughput": self.download_kbps * 1000 / 8 if self.download_kbps > 0 else -1,
+            "uploadThroughput": self.upload_kbps * 1000 / 8 if self.upload_kbps > 0 else -1,
+            "connectionType": self.connection,
+        }
+
+
+BASELINE = NetworkProfile("none", 0, -1, -1, "none")
+PROFILES = {
+    p.name: p
+    for p in (
+        BASELINE,
+        NetworkProfile("office_wifi", 20, 30000, 10000, "wifi"),
+        NetworkProfile("4g", 80, 9000, 3000, "cellular4g"),
+        NetworkProfile("rural_3g", 400, 400, 150, "cellular3g"),
+        NetworkProfile("flaky", 250, 1600, 750, "cellular3g", outage=(6.0, 2.0)),
+    )
+}
+BENCH_SALES_POINT = "harness_network_bench"
+HOOKS_READY_JS = (
+    "() => !!(window.__appTestHooks && window.__appTestHooks.FirebaseCalendarRepository"
+    " && window.__appTestHooks.FirebasePhotoService)"
+)
+
+SAVE_JS = """
+async (entry) => {
+  const repo = new window.__appTestHooks.FirebaseCalendarRepository();
+  // getEntries reads date back with toDate(), so it must be stored as a Timestamp.
+  const data = {...entry, date: new Date(entry.date)};
+  const t0 = performance.now();
+  const id = await repo.addEntry(data);
+  const ms = performance.now() - t0;
+  await repo.deleteEntry(id);
+  return ms;
+}
+"""
+
+UPLOAD_JS = """
+async ({kb, salesPointId, calendarDate}) => {
+  const {FirebasePhotoService} = window.__appTestHooks;
+  const encode = async (side, quality) => {
+    const canvas = new OffscreenCanvas(side, side);
+    const ctx = canvas.getContext('2d');
+    const img = ctx.createImageData(side, side);
+    let s = 7;
+    for (let i = 0; i < img.data.length; i++) {
+      s = (Math.imul(s, 1664525) + 1013904223) >>> 0;
+      img.data[i] = i % 4 === 3 ? 255 : s >>> 24;
+    }
+    ctx.putImageData(img, 0, 0);
+    const blob = await canvas.convertToBlob({type: 'image/jpeg', quality});
+    const bytes = new Uint8Array(await blob.arrayBuffer());
+    let bin = '';
+    for (let i = 0; i < bytes.length; i += 0x8000) {
+      bin += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+    }
+    return {data: `data:image/jpeg;base64,${btoa(bin)}`, size: bytes.length};
+  };
+  // Noise barely compresses, so the side follows from the target size.
+  const side = Math.max(64, Math.round(Math.sqrt(kb * 1024 / 1.2)));
+  const photo = await encode(side, 0.8);
+  const thumb = await encode(64, 0.6);
+  const now = new Date();
+  const metadata = {
+    id: `photo_harness_${Date.now()}`,
+    fileName: 'harness_network.jpg',
+    dateTaken: now,
+    dateUploaded: now,
+    salesPointId,
+    salesPointName: 'Harness',
+    userId: 'harness',
+    userName: 'harness',
+    calendarDate,
+    platform: 'web',
+    base64Data: photo.data,
+    thumbnail: thumb.data,
+    mimeType: 'image/jpeg',
+    originalSize: photo.size,
+    compressedSize: photo.size,
+    width: side,
+    height: side,
+  };
+  const t0 = performance.now();
+  const id = await FirebasePhotoService.savePhoto(metadata);
+  const ms = performance.now() - t0;
+  await FirebasePhotoService.deletePhoto(id);
+  return {ms, bytes: photo.size};
+}
+"""
+
+
+class NetworkShaper:
+    """Applies one profile to every page it is attached to."""
+
+    def __init__(self, profile: NetworkProfile):
+        self.profile = profile
+        self.offline = False
+        self._sessions: List[Any] = []
+        self._flapping: Optional[asyncio.Future] = None
+
+    async def attach(self, page: Any) -> None:
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Network.enable")
+        await cdp.send("Network.emulateNetworkConditions", self.profile.conditions(self.offline))
+        self._sessions.append(cdp)
+        if self.profile.outage and self._flapping is None:
+            self._flapping = asyncio.ensure_future(self._flap(*self.profile.outage))
+
+    async def _set_offline(self, offline: bool) -> None:
+        self.offline = offline
+        for cdp in list(self._sessions):
+            try:
+                await cdp.send("Network.emulateNetworkConditions", self.profile.conditions(offline))
+            except Exception:
+                # The page is gone; its session goes with it.
+                self._sessions.remove(cdp)
+
+    async def _flap(self, up_s: float, down_s: float) -> None:
+        while True:
+            await asyncio.sleep(up_s)
+            await self._set_offline(True)
+            await asyncio.sleep(down_s)
+            await self._set_offline(False)
+
+    def close(self) -> None:
+        if self._flapping is not None:
+            self._flapping.cancel()
+            self._flapping = None
+
+
+def profile(name: str) -> NetworkProfile:
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"unknown network profile {name!r}; known: {', '.join(PROFILES)}") from None
+
+
+@dataclass
+class ProfileResult:
+    profile: NetworkProfile
+    load_ms: Optional[float] = None
+    calendar_ms: Optional[float] = None
+    save_ms: List[float] = field(default_factory=list)
+    upload_ms: List[float] = field(default_factory=list)
+    upload_bytes: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def value(self, column: str) -> Optional[float]:
+        if column in ("save_ms", "upload_ms"):
+            samples = getattr(self, column)
+            return statistics.median(samples) if samples else None
+        return getattr(self, column)
+
+
+async def _timed(coro: Any, timeout_s: float) -> float:
+    t0 = time.perf_counter()
+    await asyncio.wait_for(coro, timeout_s)
+    return (time.perf_counter() - t0) * 1000.0
+
+
+async def _open_until_login(page: Any, timeout_ms: float) -> None:
+    await session.open_app(page, timeout_ms=timeout_ms)
+    await page.locator(selector("login.open")).wait_for(timeout=timeout_ms)
+
+
+async def measure(
+    network: NetworkProfile, repeat: int, photo_kb: int, timeout_s: float
+) -> ProfileResult:
+    result = ProfileResult(network)
+    shaper = NetworkShaper(network)
+    timeout_ms = timeout_s * 1000
+    day = dt.date.today()
+    entry = calendar_entry(day, BENCH_SALES_POINT, [], user_id="harness", notes="harness network bench")
+    entry.pop("id")
+    upload = {"kb": photo_kb, "salesPointId": BENCH_SALES_POINT, "calendarDate": day.isoformat()}
+    async with session.browser_session(default_timeout_ms=timeout_ms) as s:
+        await s.context.add_init_script(TEST_HOOKS_JS)
+        await shaper.attach(s.page)
+        try:
+            try:
+                result.load_ms = await _timed(_open_until_login(s.page, timeout_ms), timeout_s)
+                result.calendar_ms = await _timed(session.login(s.page, timeout_ms=timeout_ms), timeout_s)
+                await s.page.wait_for_function(HOOKS_READY_JS)
+            except Exception as exc:
+                result.errors.append(f"load: {type(exc).__name__}")
+                return result
+            for _ in range(repeat):
+                try:
+                    result.save_ms.append(await asyncio.wait_for(s.page.evaluate(SAVE_JS, entry), timeout_s))
+                except Exception as exc:
+                    result.errors.append(f"save: {type(exc).__name__}")
+                try:
+                    out = await asyncio.wait_for(s.page.evaluate(UPLOAD_JS, upload), timeout_s)
+                    result.upload_ms.append(out["ms"])
+                    result.upload_bytes = out["bytes"]
+                except Exception as exc:
+                    result.errors.append(f"upload: {type(exc).__name__}")
+        finally:
+            shaper.close()
+    return result
+
+
+async def run(
+    names: Sequence[str], repeat: int, photo_kb: int, timeout_s: float
+) -> List[ProfileResult]:
+    results = []
+    for name in [BASELINE.name, *(n for n in names if n != BASELINE.name)]:
+        results.append(await measure(profile(name), repeat, photo_kb, timeout_s))
+    return results
+
+
+COLUMNS = (
+    ("load_ms", "Load ms"),
+    ("calendar_ms", "Login→calendar ms"),
+    ("save_ms", "Save ms"),
+    ("upload_ms", "Upload ms"),
+)
+
+
+def _cell(value: Optional[float], base: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if not base or base <= 0:
+        return f"{value:,.0f}"
+    return f"{value:,.0f} (×{value / base:.1f})"
+
+
+def report(results: Sequence[ProfileResult]) -> str:
+    header = " | ".join(title for _, title in COLUMNS)
+    lines = [
+        f"| Profile | RTT ms | Down/up kbps | {header} | Errors |",
+        "|---|---|---|" + "---|" * len(COLUMNS) + "---|",
+    ]
+    base = next((r for r in results if r.profile.name == BASELINE.name), None)
+    for r in results:
+        p = r.profile
+        speed = "-" if p.download_kbps < 0 else f"{p.download_kbps:,.0f}/{p.upload_kbps:,.0f}"
+        if p.outage:
+            speed += f", {p.outage[1]:g}s off every {sum(p.outage):g}s"
+        cells = " | ".join(
+            _cell(r.value(col), base.value(col) if base and base is not r else None) for col, _ in COLUMNS
+        )
+        errors = ", ".join(sorted(set(r.errors))) or "-"
+        lines.append(f"| {p.name} | {p.latency_ms:g} | {speed} | {cells} | {errors} |")
+    upload = max((r.upload_bytes for r in results), default=0)
+    if upload:
+        lines.append("")
+        lines.append(f"Photo uploads are {upload / 1024:,.0f} KB; save and upload are medians.")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.network_profiles")
+    parser.add_argument(
+        "--profiles",
+        default=",".join(n for n in PROFILES if n != BASELINE.name),
+        help=f"comma-separated, among {', '.join(PROFILES)} (none always runs first)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="saves and uploads per profile")
+    parser.add_argument("--photo-kb", type=int, default=400, help="size of the uploaded photo")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds per operation")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.profiles.split(",") if n.strip()]
+    unknown = [n for n in names if n not in PROFILES]
+    if unknown:
+        parser.error(f"unknown profiles {unknown}; known: {', '.join(PROFILES)}")
+
+    results = asyncio.run(run(names, args.repeat, args.photo_kb, args.timeout))
+    sys.stdout.write(report(results))
+    return 1 if any(r.errors for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""Offline/reconnect sync timing as the offline queue grows (TC012).
+
+    python -m harness.offline_sync [--edits 1,10,100,1000] [--offline-s 2]
+
+TC012 checks that edits made offline show up after reconnecting, but not
+how long that takes. For each queue size N this logs in once, then:
+
+1. goes offline with ``context.set_offline(True)`` and lets the sync
+   indicator's source see it: ``firebaseCalendarService.checkConnection``,
+   which ``FirebaseSyncIndicator`` shows as "Connesso"/"Disconnesso";
+2. makes N edits with ``FirebaseCalendarRepository.addEntry``, the write
+   behind ``saveCalendarEntry``. Firestore queues them; each promise
+   resolves only when the backend acknowledges that write;
+3. waits ``--offline-s`` seconds and reconnects. Timings start from the
+   page's ``online`` event;
+4. records each write's acknowledgement, polls ``checkConnection`` every
+   ``POLL_MS`` (a user pressing "Riprova") until the indicator would say
+   "Connesso", and queries the backend until all N entries are visible.
+   The query runs in a second context logged in as the same user: the
+   writer's own ``getEntries`` would merge in its pending local writes and
+   see them before the server has them.
+
+Time-to-consistency is reconnect until both the last acknowledgement and
+the backend query agree; throughput is N over the time to the last
+acknowledgement. ``checkConnection`` caches its answer for 30 s, so the
+indicator can trail the data by that much, and it can still say
+"Connesso" while offline (the "Indicator offline" column).
+
+The entries go to the ``harness_offline_sync`` sales point and are deleted
+after each size, once the writes still in flight have settled. They are
+found by querying the sales point for the run's note prefix, so writes
+acknowledged after the reconnect deadline are removed too. The writes go
+to the Firebase project the app is configured for, so run this against a
+test project.
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence
+
+from . import session
+from .app_metrics import TEST_HOOKS_JS
+from .calendar_seed import calendar_entry
+from .tables import ms
+
+EDITS = (1, 10, 100, 1000)
+BENCH_SALES_POINT = "harness_offline_sync"
+POLL_MS = 500
+HOOKS_READY_JS = (
+    "() => !!(window.__appTestHooks && window.__appTestHooks.FirebaseCalendarRepository"
+    " && window.__appTestHooks.firebaseCalendarService)"
+)
+
+OFFLINE_JS = """
+async ({n, entry, prefix, timeoutMs}) => {
+  const hooks = window.__appTestHooks;
+  const repo = new hooks.FirebaseCalendarRepository();
+  const state = window.__harnessOfflineSync = {
+    acks: new Array(n).fill(null), ids: [], errors: [], online: null, indicatorOffline: null,
+  };
+  window.addEventListener('online', () => { state.online = performance.now(); }, {once: true});
+  // What FirebaseSyncIndicator would show on mount while offline.
+  state.indicatorOffline = await Promise.race([
+    hooks.firebaseCalendarService.checkConnection(),
+    new Promise((resolve) => setTimeout(() => resolve(null), timeoutMs)),
+  ]);
+  const t0 = performance.now();
+  state.pending = [];
+  for (let i = 0; i < n; i++) {
+    // Stored as a Date: getEntries reads it back with toDate().
+    const data = {...entry, date: new Date(entry.date), notes: `${prefix} ${i}`};
+    state.pending.push(repo.addEntry(data).then(
+      (id) => { state.acks[i] = performance.now(); state.ids.push(id); },
+      (e) => { state.errors.push(String(e && e.message || e)); },
+    ));
+  }
+  return {enqueueMs: performance.now() - t0, indicatorOffline: state.indicatorOffline};
+}
+"""
+
+RECONNECT_JS = """
+async ({pollMs, timeoutMs, mark}) => {
+  const hooks = window.__appTestHooks;
+  const state = window.__harnessOfflineSync;
+  const start = state.online !== null ? state.online : mark;
+  const deadline = start + timeoutMs;
+  const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+  const out = {indicatorMs: null, startEpoch: performance.timeOrigin + start};
+
+  const indicator = (async () => {
+    while (performance.now() < deadline) {
+      if (await hooks.firebaseCalendarService.checkConnection()) {
+        out.indicatorMs = performance.now() - start;
+        return;
+      }
+      await sleep(pollMs);
+    }
+  })();
+  await Promise.race([Promise.allSettled(state.pending), sleep(Math.max(0, deadline - performance.now()))]);
+  await indicator;
+  out.acks = state.acks.map((t) => (t === null ? null : t - start));
+  out.errors = state.errors.slice(0, 5);
+  out.failed = state.errors.length;
+  return out;
+}
+"""
+
+# Runs in a second logged-in context. The writer's own queries would
+# overlay its pending local writes, so only another client proves the
+# server has them. The target drops when writes fail (see measure).
+VISIBLE_JS = """
+async ({n, salesPointId, prefix, pollMs, timeoutMs}) => {
+  const repo = new window.__appTestHooks.FirebaseCalendarRepository();
+  const deadline = performance.now() + timeoutMs;
+  const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+  window.__harnessVisibleTarget = n;
+  while (performance.now() < deadline) {
+    try {
+      const entries = await repo.getEntries({salesPointId});
+      const seen = entries.filter((e) => typeof e.notes === 'string' && e.notes.startsWith(prefix)).length;
+      if (seen >= window.__harnessVisibleTarget) return performance.timeOrigin + performance.now();
+    } catch (e) {}
+    await sleep(pollMs);
+  }
+  return null;
+}
+"""
+
+# Writes still pending at the reconnect deadline are acknowledged later, so
+# the cleanup waits for them and then deletes by query, not by known ids.
+CLEANUP_JS = """
+async ({salesPointId, prefix, timeoutMs}) => {
+  const repo = new window.__appTestHooks.FirebaseCalendarRepository();
+  const state = window.__harnessOfflineSync;
+  const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+  let unsettled = 0;
+  if (state) {
+    let settled = 0;
+    const done = Promise.allSettled(state.pending.map((p) => p.finally(() => { settled++; })));
+    await Promise.race([done, sleep(timeoutMs)]);
+    unsettled = state.pending.length - settled;
+  }
+  const ids = new Set(state ? state.ids : []);
+  try {
+    const entries = await repo.getEntries({salesPointId});
+    for (const e of entries) {
+      if (typeof e.notes === 'string' && e.notes.startsWith(prefix)) ids.add(e.id);
+    }
+  } catch (e) {}
+  const results = await Promise.allSettled(Array.from(ids).map((id) => repo.deleteEntry(id)));
+  window.__harnessOfflineSync = null;
+  return {failed: results.filter((r) => r.status === 'rejected').length, unsettled};
+}
+"""
+
+
+@dataclass
+class SyncResult:
+    edits: int
+    offline_s: float
+    enqueue_ms: float = 0.0
+    indicator_offline: Optional[bool] = None
+    acks_ms: List[Optional[float]] = field(default_factory=list)
+    indicator_ms: Optional[float] = None
+    visible_ms: Optional[float] = None
+    failed: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def confirmed(self) -> List[float]:
+        return sorted(t for t in self.acks_ms if t is not None)
+
+    @property
+    def last_ack_ms(self) -> Optional[float]:
+        return self.confirmed[-1] if len(self.confirmed) == self.edits else None
+
+    @property
+    def consistent_ms(self) -> Optional[float]:
+        """Reconnect until every write is acknowledged and visible on the backend."""
+        if self.last_ack_ms is None or self.visible_ms is None:
+            return None
+        return max(self.last_ack_ms, self.visible_ms)
+
+    @property
+    def writes_per_s(self) -> Optional[float]:
+        last = self.last_ack_ms
+        return self.edits / (last / 1000.0) if last else None
+
+
+async def measure(
+    page: Any, context: Any, observer: Any, edits: int, offline_s: float, timeout_s: float
+) -> SyncResult:
+    result = SyncResult(edits, offline_s)
+    entry = calendar_entry(dt.date.today(), BENCH_SALES_POINT, [], user_id="harness")
+    entry.pop("id")
+    prefix = f"harness offline sync {edits} {time.time():.0f}"
+    await context.set_offline(True)
+    try:
+        out = await page.evaluate(
+            OFFLINE_JS, {"n": edits, "entry": entry, "prefix": prefix, "timeoutMs": timeout_s * 1000}
+        )
+        result.enqueue_ms = out["enqueueMs"]
+        result.indicator_offline = out["indicatorOffline"]
+        await asyncio.sleep(offline_s)
+    finally:
+        await context.set_offline(False)
+    mark = await page.evaluate("() => performance.now()")
+    visible = asyncio.ensure_future(
+        observer.evaluate(
+            VISIBLE_JS,
+            {
+                "n": edits,
+                "salesPointId": BENCH_SALES_POINT,
+                "prefix": prefix,
+                "pollMs": POLL_MS,
+                "timeoutMs": timeout_s * 1000,
+            },
+        )
+    )
+    out = await page.evaluate(
+        RECONNECT_JS, {"pollMs": POLL_MS, "timeoutMs": timeout_s * 1000, "mark": mark}
+    )
+    result.acks_ms = out["acks"]
+    result.indicator_ms = out["indicatorMs"]
+    result.failed = out["failed"]
+    result.errors = out["errors"]
+    # Failed writes never reach the server; stop waiting for them.
+    await observer.evaluate("(t) => { window.__harnessVisibleTarget = t; }", edits - result.failed)
+    visible_at = await visible
+    if visible_at is not None:
+        result.visible_ms = visible_at - out["startEpoch"]
+    cleanup = await page.evaluate(
+        CLEANUP_JS,
+        {"salesPointId": BENCH_SALES_POINT, "prefix": prefix, "timeoutMs": timeout_s * 1000},
+    )
+    if cleanup["failed"]:
+        result.errors.append(f"{cleanup['failed']} entries not deleted")
+    if cleanup["unsettled"]:
+        result.errors.append(
+            f"{cleanup['unsettled']} writes still pending at cleanup; check {BENCH_SALES_POINT}"
+        )
+    return result
+
+
+async def run(edits: Sequence[int], offline_s: float, timeout_s: float) -> List[SyncResult]:
+    results = []
+    async with session.browser_session(default_timeout_ms=timeout_s * 1000) as s:
+        await s.context.add_init_script(TEST_HOOKS_JS)
+        await session.open_app(s.page)
+        await session.login(s.page)
+        await s.page.wait_for_function(HOOKS_READY_JS)
+        # Same user, own browser context: no share in the writer's offline queue.
+        observer_context, observer = await session.logged_in_context(
+            s.browser, 0, timeout_s * 1000, HOOKS_READY_JS
+        )
+        try:
+            for n in edits:
+                results.append(await measure(s.page, s.context, observer, n, offline_s, timeout_s))
+        finally:
+            await observer_context.close()
+    return results
+
+
+def _indicator(connected: Optional[bool]) -> str:
+    return "-" if connected is None else ("Connesso" if connected else "Disconnesso")
+
+
+def report(results: Sequence[SyncResult]) -> str:
+    lines = [
+        "| Edits | Offline s | Indicator offline | Enqueue ms | First ack ms | p50 ack ms | Last ack ms"
+        " | Backend visible ms | Indicator ms | Consistent ms | Writes/s | Unconfirmed |",
+        "|---|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        acks = r.confirmed
+        wps = "-" if r.writes_per_s is None else f"{r.writes_per_s:,.1f}"
+        lines.append(
+            f"| {r.edits:,} | {r.offline_s:g} | {_indicator(r.indicator_offline)} | {ms(r.enqueue_ms)}"
+            f" | {ms(acks[0] if acks else None)}"
+            f" | {ms(statistics.median(acks) if acks else None)} | {ms(r.last_ack_ms)}"
+            f" | {ms(r.visible_ms)} | {ms(r.indicator_ms)} | {ms(r.consistent_ms)} | {wps}"
+            f" | {r.edits - len(acks)} |"
+        )
+    notes = [f"{r.edits}: {e}" for r in results for e in r.errors]
+    if notes:
+        lines.append("")
+        lines.extend(f"* {n}" for n in notes)
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.offline_sync")
+    parser.add_argument("--edits", default=",".join(map(str, EDITS)), help="offline queue sizes")
+    parser.add_argument("--offline-s", type=float, default=2.0, help="seconds offline after the edits")
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds to wait for consistency")
+    args = parser.parse_args(argv)
+    edits = [int(x) for x in args.edits.split(",") if x.strip()]
+    if any(n < 1 for n in edits):
+        parser.error("queue sizes must be positive")
+
+    results = asyncio.run(run(edits, args.offline_s, args.timeout))
+    sys.stdout.write(report(results))
+    return 0 if all(r.consistent_ms is not None for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,383 @@
+"""Photo pipeline benchmark with generated images from 0.3 to 48 MP.
+
+    python -m harness.photo_bench [--mp 0.3,2,8,12,24,48] [--formats jpeg,png,heic] [--upload]
+
+TC009, TC012 and TC013 attach photos with whatever Chromium happens to
+provide. Here every photo is generated at a known size and goes through
+the same path as a user's pick on web:
+
+1. the image is drawn on an ``OffscreenCanvas`` (gradient, shapes and a
+   sensor-like noise layer, so JPEG sizes resemble real photos), encoded
+   by the browser and saved through a download. Files are cached in
+   ``.harness/photo_bench/``. ``heic`` is the JPEG in an ISO-BMFF
+   ``ftyp heic`` wrapper sent as ``image/heic``: Chromium cannot encode
+   real HEIC, and the point is how the app treats the type;
+2. ``PhotoService.selectPhoto`` opens expo-image-picker's file chooser,
+   which the harness fills with ``set_files`` (``pick``: reading the file
+   and decoding it for its dimensions);
+3. ``PhotoService.validatePhoto`` applies the type and size limits;
+4. ``ImageCompressionService.compressForFirestore`` runs; its two resizes
+   are timed by the app (``image_compress``, ``image_thumbnail`` in
+   ``performanceMonitor``), and the output is checked with
+   ``isValidForFirestore`` (800 KB);
+5. with ``--upload`` (logs in first), ``FirebasePhotoService.savePhoto``
+   is timed and the document is deleted again.
+
+Each photo runs in a fresh page; a stage that hangs is cut off after
+``--timeout`` seconds and reported.
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import config, session
+from .app_metrics import TEST_HOOKS_JS
+from .tables import ms
+
+BENCH_DIR = config.STATE_DIR / "photo_bench"
+MEGAPIXELS = (0.3, 2, 8, 12, 24, 48)
+FORMATS = ("jpeg", "png", "heic")
+# Width x height for each size, at the 4:3 ratio of phone sensors.
+RESOLUTIONS = {
+    0.3: (640, 480),
+    2: (1632, 1224),
+    8: (3264, 2448),
+    12: (4000, 3000),
+    24: (5664, 4248),
+    48: (8000, 6000),
+}
+JPEG_QUALITY = 0.92
+HOOKS_READY_JS = "() => !!(window.__appTestHooks && window.__appTestHooks.PhotoService)"
+BENCH_SALES_POINT = "harness_photo_bench"
+
+GENERATE_JS = """
+async ({width, height, type, quality, seed, name}) => {
+  let s = seed >>> 0 || 1;
+  const rnd = () => ((s = (Math.imul(s, 1664525) + 1013904223) >>> 0) / 4294967296);
+  const canvas = new OffscreenCanvas(width, height);
+  const ctx = canvas.getContext('2d');
+  const g = ctx.createLinearGradient(0, 0, width, height);
+  g.addColorStop(0, `hsl(${rnd() * 360}, 60%, 65%)`);
+  g.addColorStop(1, `hsl(${rnd() * 360}, 50%, 25%)`);
+  ctx.fillStyle = g;
+  ctx.fillRect(0, 0, width, height);
+  const side = Math.min(width, height);
+  for (let i = 0; i < 60; i++) {
+    ctx.fillStyle = `hsla(${rnd() * 360}, 70%, ${25 + rnd() * 50}%, 0.6)`;
+    ctx.beginPath();
+    ctx.arc(rnd() * width, rnd() * height, (0.02 + rnd() * 0.2) * side, 0, 2 * Math.PI);
+    ctx.fill();
+  }
+  // Sensor-like noise: one random tile repeated over the frame.
+  const tile = new OffscreenCanvas(256, 256);
+  const tctx = tile.getContext('2d');
+  const img = tctx.createImageData(256, 256);
+  for (let i = 0; i < img.data.length; i += 4) {
+    const v = rnd() * 255;
+    img.data[i] = img.data[i + 1] = img.data[i + 2] = v;
+    img.data[i + 3] = 48;
+  }
+  tctx.putImageData(img, 0, 0);
+  ctx.fillStyle = ctx.createPattern(tile, 'repeat');
+  ctx.fillRect(0, 0, width, height);
+  const blob = await canvas.convertToBlob({type, quality});
+  const a = document.createElement('a');
+  a.href = URL.createObjectURL(blob);
+  a.download = name;
+  document.body.appendChild(a);
+  a.click();
+  a.remove();
+  setTimeout(() => URL.revokeObjectURL(a.href), 60000);
+  return blob.size;
+}
+"""
+
+PICK_JS = """
+async () => {
+  const hooks = window.__appTestHooks || {};
+  const t0 = performance.now();
+  const result = await hooks.PhotoService.selectPhoto();
+  const ms = performance.now() - t0;
+  const asset = result && result.assets && result.assets[0];
+  // The asset (with its data URI) stays in the page; only its shape comes back.
+  window.__harnessPhoto = asset || null;
+  if (!asset) return {ms, canceled: true};
+  return {
+    ms,
+    width: asset.width,
+    height: asset.height,
+    fileSize: asset.fileSize || 0,
+    mimeType: asset.mimeType || '',
+  };
+}
+"""
+
+PROCESS_JS = """
+async ({upload, salesPointId, calendarDate}) => {
+  const hooks = window.__appTestHooks || {};
+  const {PhotoService, ImageCompressionService, FirebasePhotoService, performanceMonitor} = hooks;
+  const asset = window.__harnessPhoto;
+  const out = {valid: false, error: null, stages: {}};
+  const check = PhotoService.validatePhoto(asset);
+  out.valid = check.valid;
+  if (!check.valid) {
+    out.error = check.error || 'rejected';
+    return out;
+  }
+  const cursor = performanceMonitor ? performanceMonitor.exportMetricsSince(0).cursor : 0;
+  let t0 = performance.now();
+  let c;
+  try {
+    c = await ImageCompressionService.compressForFirestore(asset);
+  } catch (e) {
+    out.error = String(e && e.message || e);
+    return out;
+  }
+  out.stages.compress_total = performance.now() - t0;
+  if (performanceMonitor) {
+    for (const m of performanceMonitor.exportMetricsSince(cursor).metrics) {
+      if (m.name === 'image_compress' || m.name === 'image_thumbnail') out.stages[m.name] = m.value;
+    }
+  }
+  const prefix = 'data:image/jpeg;base64,'.length;
+  out.compressedSize = c.compressedSize;
+  out.thumbnailBytes = Math.floor((c.thumbnail.length - prefix) * 0.75);
+  out.outWidth = c.width;
+  out.outHeight = c.height;
+  out.firestoreOk = ImageCompressionService.isValidForFirestore(c.compressedSize);
+  if (upload && out.firestoreOk) {
+    const now = new Date();
+    const metadata = {
+      id: `photo_harness_${Date.now()}`,
+      fileName: asset.fileName || 'harness.jpg',
+      dateTaken: now,
+      dateUploaded: now,
+      salesPointId,
+      salesPointName: 'Harness',
+      userId: 'harness',
+      userName: 'harness',
+      calendarDate,
+      platform: 'web',
+      base64Data: c.base64Data,
+      thumbnail: c.thumbnail,
+      mimeType: asset.mimeType || 'image/jpeg',
+      originalSize: asset.fileSize || 0,
+      compressedSize: c.compressedSize,
+      width: c.width,
+      height: c.height,
+    };
+    t0 = performance.now();
+    try {
+      const id = await FirebasePhotoService.savePhoto(metadata);
+      out.stages.upload = performance.now() - t0;
+      await FirebasePhotoService.deletePhoto(id);
+    } catch (e) {
+      out.error = `upload: ${e && e.message || e}`;
+    }
+  }
+  return out;
+}
+"""
+
+
+@dataclass(frozen=True)
+class Photo:
+    megapixels: float
+    fmt: str
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return RESOLUTIONS[self.megapixels]
+
+    @property
+    def name(self) -> str:
+        w, h = self.size
+        return f"photo_{w}x{h}.{'jpg' if self.fmt == 'jpeg' else self.fmt}"
+
+    @property
+    def mime(self) -> str:
+        return f"image/{self.fmt}"
+
+
+@dataclass
+class PhotoResult:
+    photo: Photo
+    file_bytes: int = 0
+    pick_ms: Optional[float] = None
+    valid: Optional[bool] = None
+    stages: Dict[str, float] = field(default_factory=dict)
+    compressed_bytes: Optional[int] = None
+    thumbnail_bytes: Optional[int] = None
+    firestore_ok: Optional[bool] = None
+    error: Optional[str] = None
+
+    @property
+    def outcome(self) -> str:
+        if self.error and self.valid is False:
+            return f"rejected: {self.error}"
+        if self.error:
+            return f"error: {self.error}"
+        if self.firestore_ok is False:
+            return "over Firestore limit"
+        return "ok"
+
+
+def heic_like(jpeg: bytes) -> bytes:
+    """``jpeg`` behind an ISO-BMFF ``ftyp heic`` box, the way HEIC files start."""
+    ftyp = struct.pack(">I4s4sI8s", 24, b"ftyp", b"heic", 0, b"mif1heic")
+    return ftyp + struct.pack(">I4s", 8 + len(jpeg), b"mdat") + jpeg
+
+
+async def fixture(page: Any, photo: Photo, seed: int = 7) -> Path:
+    """Generate (once) the file for ``photo`` with the browser's own encoders."""
+    path = BENCH_DIR / photo.name
+    if path.exists():
+        return path
+    if photo.fmt == "heic":
+        jpeg = await fixture(page, Photo(photo.megapixels, "jpeg"), seed)
+        path.write_bytes(heic_like(jpeg.read_bytes()))
+        return path
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    w, h = photo.size
+    params = {
+        "width": w,
+        "height": h,
+        "type": photo.mime,
+        "quality": JPEG_QUALITY,
+        "seed": seed,
+        "name": photo.name,
+    }
+    async with page.expect_download(timeout=300000) as info:
+        await page.evaluate(GENERATE_JS, params)
+    download = await info.value
+    tmp = path.with_suffix(".tmp")
+    await download.save_as(str(tmp))
+    tmp.replace(path)
+    return path
+
+
+async def pick(page: Any, photo: Photo, path: Path, timeout_s: float) -> Dict[str, Any]:
+    task: Optional[asyncio.Future] = None
+    try:
+        # The chooser is intercepted only while a waiter is registered, so start the pick inside.
+        async with page.expect_file_chooser(timeout=timeout_s * 1000) as info:
+            task = asyncio.ensure_future(page.evaluate(PICK_JS))
+        chooser = await info.value
+        if photo.fmt == "heic":
+            # Sent with its declared type; Playwright would guess from the extension.
+            await chooser.set_files({"name": path.name, "mimeType": photo.mime, "buffer": path.read_bytes()})
+        else:
+            await chooser.set_files(str(path))
+        return await asyncio.wait_for(task, timeout_s)
+    finally:
+        if task is not None and not task.done():
+            task.cancel()
+
+
+async def measure(
+    page: Any, photo: Photo, path: Path, upload: bool, timeout_s: float
+) -> PhotoResult:
+    result = PhotoResult(photo, path.stat().st_size)
+    try:
+        picked = await pick(page, photo, path, timeout_s)
+    except asyncio.TimeoutError:
+        result.error = "pick timed out"
+        return result
+    result.pick_ms = picked["ms"]
+    if picked.get("canceled"):
+        result.error = "pick returned no asset"
+        return result
+    params = {
+        "upload": upload,
+        "salesPointId": BENCH_SALES_POINT,
+        "calendarDate": dt.date.today().isoformat(),
+    }
+    try:
+        out = await asyncio.wait_for(page.evaluate(PROCESS_JS, params), timeout_s)
+    except asyncio.TimeoutError:
+        result.error = "processing timed out"
+        return result
+    result.valid = out["valid"]
+    result.stages = out["stages"]
+    result.error = out["error"]
+    result.compressed_bytes = out.get("compressedSize")
+    result.thumbnail_bytes = out.get("thumbnailBytes")
+    result.firestore_ok = out.get("firestoreOk")
+    return result
+
+
+async def run(
+    megapixels: Sequence[float], formats: Sequence[str], upload: bool, timeout_s: float
+) -> List[PhotoResult]:
+    photos = [Photo(mp, fmt) for mp in megapixels for fmt in formats]
+    results = []
+    async with session.browser_session(default_timeout_ms=30000, accept_downloads=True) as s:
+        await s.context.add_init_script(TEST_HOOKS_JS)
+        await session.open_app(s.page)
+        if upload:
+            await session.login(s.page)
+        for photo in photos:
+            path = await fixture(s.page, photo)
+            page = await s.context.new_page()
+            try:
+                await session.open_app(page)
+                await page.wait_for_function(HOOKS_READY_JS)
+                results.append(await measure(page, photo, path, upload, timeout_s))
+            finally:
+                await page.close()
+    return results
+
+
+def _kb(value: Optional[int]) -> str:
+    return "-" if value is None else f"{value / 1024:,.0f}"
+
+
+def report(results: Sequence[PhotoResult]) -> str:
+    lines = [
+        "| MP | Format | File MB | Pick ms | Compress ms | Thumbnail ms | Output KB | Thumb KB"
+        " | Upload ms | Outcome |",
+        "|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        lines.append(
+            f"| {r.photo.megapixels:g} | {r.photo.fmt} | {r.file_bytes / 1e6:.1f} | {ms(r.pick_ms)}"
+            f" | {ms(r.stages.get('image_compress'))} | {ms(r.stages.get('image_thumbnail'))}"
+            f" | {_kb(r.compressed_bytes)} | {_kb(r.thumbnail_bytes)} | {ms(r.stages.get('upload'))}"
+            f" | {r.outcome} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.photo_bench")
+    parser.add_argument("--mp", default=",".join(f"{mp:g}" for mp in MEGAPIXELS), help="megapixel sizes")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="jpeg, png and/or heic")
+    parser.add_argument(
+        "--upload",
+        action="store_true",
+        help="log in and time FirebasePhotoService.savePhoto (the document is deleted afterwards)",
+    )
+    parser.add_argument("--timeout", type=float, default=180.0, help="seconds per stage")
+    args = parser.parse_args(argv)
+
+    megapixels = [float(x) if "." in x else int(x) for x in args.mp.split(",") if x.strip()]
+    unknown = [mp for mp in megapixels if mp not in RESOLUTIONS]
+    if unknown:
+        parser.error(f"no resolution for {unknown}; known: {', '.join(f'{mp:g}' for mp in RESOLUTIONS)}")
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    if any(f not in FORMATS for f in formats):
+        parser.error(f"formats must be among {', '.join(FORMATS)}")
+
+    results = asyncio.run(run(megapixels, formats, args.upload, args.timeout))
+    sys.stdout.write(report(results))
+    return 1 if any(r.outcome.startswith("error") for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""Count React renders per component through the DevTools global hook.
+
+:meth:`RenderCounter.attach` adds an init script that installs a minimal
+``__REACT_DEVTOOLS_GLOBAL_HOOK__`` before the app loads. On every commit
+the hook walks the updated part of the fiber tree and appends one record
+per component that actually rendered (name id, self duration) to a ring
+buffer of typed arrays inside the page. Nothing crosses the protocol until
+an interaction is measured, and then only the per-component aggregate:
+
+    renders = RenderCounter()
+    await renders.attach(context)
+    ...
+    async with renders.measure(page, "type quantity",
+                               budgets={"CustomCalendarCell": 0}) as r:
+        await elem.fill("5")
+    r.count("EntryFormModal")
+
+A component over its budget raises :class:`RenderBudgetExceeded` listing
+the offenders, which is how a broken ``React.memo`` comparator or an
+unstable callback shows up.
+"""
+
+import contextlib
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple
+
+# Records kept in the page. One interaction rarely produces more than a few
+# thousand; older records are overwritten and reported as lost.
+CAPACITY = 50_000
+
+# Components the reports list first.
+WATCHED = ("CustomCalendarCell", "WeekCalendar", "EntryFormModal", "MemoizedWeekCalendar")
+
+HOOK_JS = """
+((capacity) => {
+  if (window.__harnessRenders) return;
+  // FunctionComponent, ClassComponent, ForwardRef, SimpleMemoComponent.
+  // MemoComponent (14) is skipped: its child fiber is the real component.
+  const COMPONENT_TAGS = new Set([0, 1, 11, 15]);
+  const PERFORMED_WORK = 1;
+  const names = [];
+  const ids = new Map();
+  const comp = new Int32Array(capacity);
+  const dur = new Float32Array(capacity);
+  let seq = 0;
+  let commits = 0;
+
+  const nameOf = (f) => {
+    const t = f.type;
+    if (!t) return null;
+    if (f.tag === 11) return t.displayName || (t.render && (t.render.displayName || t.render.name)) || null;
+    return t.displayName || t.name || null;
+  };
+  const nameId = (name) => {
+    let id = ids.get(name);
+    if (id === undefined) { id = names.length; names.push(name); ids.set(name, id); }
+    return id;
+  };
+  const flagsOf = (f) => (f.flags !== undefined ? f.flags : f.effectTag) || 0;
+
+  const walk = (root) => {
+    const stack = [root];
+    while (stack.length) {
+      const f = stack.pop();
+      const prev = f.alternate;
+      if (COMPONENT_TAGS.has(f.tag) && (prev === null || flagsOf(f) & PERFORMED_WORK)) {
+        const name = nameOf(f);
+        if (name) {
+          // actualDuration is only filled in by dev and profiling builds.
+          let self = f.actualDuration || 0;
+          for (let c = f.child; c; c = c.sibling) self -= c.actualDuration || 0;
+          const i = seq % capacity;
+          comp[i] = nameId(name);
+          dur[i] = self > 0 ? self : 0;
+          seq++;
+        }
+      }
+      // Same child pointer as last commit: the whole subtree bailed out.
+      if (prev && prev.child === f.child) continue;
+      for (let c = f.child; c; c = c.sibling) stack.push(c);
+    }
+  };
+
+  const existing = window.__REACT_DEVTOOLS_GLOBAL_HOOK__;
+  const onCommit = (id, root) => {
+    commits++;
+    try { walk(root.current); } catch (e) { /* never break the app */ }
+  };
+  if (existing) {
+    const previous = existing.onCommitFiberRoot;
+    existing.onCommitFiberRoot = function (id, root, ...rest) {
+      onCommit(id, root);
+      return previous && previous.call(this, id, root, ...rest);
+    };
+  } else {
+    const hook = {
+      renderers: new Map(),
+      supportsFiber: true,
+      isDisabled: false,
+      inject(renderer) {
+        const id = hook.renderers.size + 1;
+        hook.renderers.set(id, renderer);
+        return id;
+      },
+      onCommitFiberRoot: onCommit,
+      onCommitFiberUnmount() {},
+      onPostCommitFiberRoot() {},
+      onScheduleFiberRoot() {},
+      setStrictMode() {},
+      checkDCE() {},
+    };
+    window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = hook;
+  }
+
+  window.__harnessRenders = {
+    cursor: () => [seq, commits],
+    since([start, startCommits]) {
+      const from = Math.max(start, seq - capacity);
+      const agg = {};
+      for (let s = from; s < seq; s++) {
+        const i = s % capacity;
+        const name = names[comp[i]];
+        const a = agg[name] || (agg[name] = [0, 0]);
+        a[0] += 1;
+        a[1] += dur[i];
+      }
+      return {components: agg, commits: commits - startCommits, lost: from - start};
+    },
+  };
+})
+"""
+
+CURSOR_JS = "() => window.__harnessRenders ? window.__harnessRenders.cursor() : null"
+
+# Let pending commits land (two frames) before aggregating.
+READ_JS = """
+async (cursor) => {
+  await new Promise((r) => requestAnimationFrame(() => requestAnimationFrame(r)));
+  return window.__harnessRenders.since(cursor);
+}
+"""
+
+
+class RenderBudgetExceeded(AssertionError):
+    def __init__(self, label: str, offenders: List[Tuple[str, int, int]]):
+        self.label = label
+        self.offenders = offenders
+        listed = ", ".join(f"{name} {count}/{budget}" for name, count, budget in offenders)
+        super().__init__(f"render budget exceeded during {label!r}: {listed}")
+
+
+@dataclass
+class ComponentRenders:
+    name: str
+    count: int
+    duration_ms: float
+
+
+@dataclass
+class InteractionRenders:
+    label: str
+    commits: int = 0
+    components: Dict[str, ComponentRenders] = field(default_factory=dict)
+    # Records overwritten in the ring buffer before they could be read.
+    lost: int = 0
+
+    def count(self, name: str) -> int:
+        c = self.components.get(name)
+        return c.count if c else 0
+
+    def over_budget(self, budgets: Mapping[str, int]) -> List[Tuple[str, int, int]]:
+        return [
+            (name, self.count(name), budget)
+            for name, budget in budgets.items()
+            if self.count(name) > budget
+        ]
+
+    def check(self, budgets: Mapping[str, int]) -> None:
+        offenders = self.over_budget(budgets)
+        if offenders:
+            raise RenderBudgetExceeded(self.label, offenders)
+
+
+class RenderCounter:
+    def __init__(self, capacity: int = CAPACITY):
+        self.capacity = capacity
+        self.interactions: List[InteractionRenders] = []
+
+    async def attach(self, target: Any) -> "RenderCounter":
+        """Install the hook on a BrowserContext or Page before it loads the app."""
+        await target.add_init_script(f"({HOOK_JS})({int(self.capacity)})")
+        return self
+
+    @contextlib.asynccontextmanager
+    async def measure(
+        self,
+        page: Any,
+        label: str,
+        budgets: Optional[Mapping[str, int]] = None,
+    ) -> AsyncIterator[InteractionRenders]:
+        result = InteractionRenders(label)
+        cursor = await page.evaluate(CURSOR_JS)
+        if cursor is None:
+            raise RuntimeError("render hook not installed; call attach() before page load")
+        yield result
+        raw = await page.evaluate(READ_JS, cursor)
+        result.commits = raw["commits"]
+        result.lost = raw["lost"]
+        result.components = {
+            name: ComponentRenders(name, count, duration)
+            for name, (count, duration) in raw["components"].items()
+        }
+        self.interactions.append(result)
+        if budgets:
+            result.check(budgets)
+
+    def report(self, limit: int = 10) -> str:
+        lines = ["| Interaction | Commits | Component | Renders | Self ms |", "|---|---|---|---|---|"]
+        for r in self.interactions:
+            ranked = sorted(
+                r.components.values(),
+                key=lambda c: (c.name not in WATCHED, -c.count),
+            )
+            for c in ranked[:limit]:
+                lines.append(f"| {r.label} | {r.commits} | {c.name} | {c.count} | {c.duration_ms:.1f} |")
+            if r.lost:
+                lines.append(f"| {r.label} | | ({r.lost} records lost) | | |")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,584 @@
+"""SQLite-backed store for test runs and the steps recorded inside them."""
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .config import RESULTS_DB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL,
+    test_id TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    app_commit TEXT NOT NULL,
+    lane TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT NOT NULL DEFAULT '',
+    started_at REAL NOT NULL,
+    duration_ms REAL NOT NULL,
+    app_metrics_dropped INTEGER NOT NULL DEFAULT 0,
+    logs_dropped INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_test ON runs (test_id, app_commit, started_at);
+
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    step_key TEXT NOT NULL,
+    action TEXT NOT NULL,
+    selector TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration_ms REAL NOT NULL,
+    error TEXT NOT NULL DEFAULT '',
+    timeout_ms REAL,
+    PRIMARY KEY (run_id, idx)
+);
+CREATE INDEX IF NOT EXISTS steps_key ON steps (step_key);
+
+-- Keyed per test: the same positional XPath can mean different screens.
+CREATE TABLE IF NOT EXISTS fingerprints (
+    test_id TEXT NOT NULL,
+    selector TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (test_id, selector)
+);
+
+CREATE TABLE IF NOT EXISTS heals (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    step_idx INTEGER NOT NULL,
+    selector TEXT NOT NULL,
+    healed_selector TEXT NOT NULL,
+    score REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS heals_selector ON heals (selector);
+
+CREATE TABLE IF NOT EXISTS app_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    step_idx INTEGER,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    value REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS app_metrics_run ON app_metrics (run_id, step_idx);
+
+CREATE TABLE IF NOT EXISTS logs (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    step_idx INTEGER,
+    level TEXT NOT NULL,
+    module TEXT NOT NULL,
+    message TEXT NOT NULL,
+    payload TEXT,
+    logged_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logs_run ON logs (run_id, step_idx);
+
+-- Exact line counts; logs only holds what fit in the ring buffer.
+CREATE TABLE IF NOT EXISTS log_volume (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    step_idx INTEGER,
+    module TEXT NOT NULL,
+    level TEXT NOT NULL,
+    lines INTEGER NOT NULL
+);
+
+-- Files downloaded during a run, with what the streaming validator saw.
+CREATE TABLE IF NOT EXISTS downloads (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    step_idx INTEGER,
+    filename TEXT NOT NULL,
+    path TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    rows INTEGER,
+    columns TEXT NOT NULL,
+    errors TEXT NOT NULL
+);
+
+-- One row per batch: getting the dev server ready, kept apart from test time.
+CREATE TABLE IF NOT EXISTS dev_server (
+    batch_id TEXT PRIMARY KEY,
+    app_commit TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    up_ms REAL,
+    build_ms REAL,
+    cached_ms REAL,
+    bundle_bytes INTEGER,
+    tests_ms REAL,
+    error TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS quarantine (
+    test_id TEXT PRIMARY KEY,
+    score REAL NOT NULL,
+    since REAL NOT NULL,
+    reason TEXT NOT NULL DEFAULT ''
+);
+"""
+
+# Columns added after the first release, applied to older databases.
+MIGRATIONS = (
+    ("steps", "timeout_ms", "REAL"),
+    ("runs", "app_metrics_dropped", "INTEGER NOT NULL DEFAULT 0"),
+    ("runs", "logs_dropped", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+PASSED = "PASSED"
+FAILED = "FAILED"
+
+# Selectors that are only a Playwright type name. Older runs recorded every
+# locator step this way, so such a key does not identify a step.
+TYPE_NAME_SELECTORS = frozenset({"Locator", "FrameLocator", "ElementHandle", "Page", "Frame"})
+
+
+def is_type_name(selector: str) -> bool:
+    return selector in TYPE_NAME_SELECTORS
+
+
+@dataclass
+class StepRecord:
+    idx: int
+    action: str
+    selector: str
+    status: str
+    started_at: float
+    duration_ms: float
+    error: str = ""
+    timeout_ms: Optional[float] = None
+
+    @property
+    def step_key(self) -> str:
+        return f"{self.action}:{self.selector}"
+
+
+@dataclass
+class HealRecord:
+    step_idx: int
+    selector: str
+    healed_selector: str
+    score: float
+
+
+@dataclass
+class AppMetricRecord:
+    # None for metrics drained when the context closed, after the last step.
+    step_idx: Optional[int]
+    name: str
+    category: str
+    unit: str
+    value: float
+    recorded_at: float
+
+
+@dataclass
+class LogLine:
+    step_idx: Optional[int]
+    level: str
+    module: str
+    message: str
+    logged_at: float
+    payload: Any = None
+
+
+@dataclass
+class LogVolume:
+    step_idx: Optional[int]
+    module: str
+    level: str
+    lines: int
+
+
+@dataclass
+class DownloadRecord:
+    step_idx: Optional[int]
+    filename: str
+    path: str
+    bytes: int
+    # None when the file is not a workbook.
+    rows: Optional[int]
+    columns: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class DevServerRecord:
+    batch_id: str
+    app_commit: str
+    # "started", "attached", or "failed" when the server never got ready
+    # (``error`` then names the requested --dev-server mode and the reason).
+    mode: str
+    started_at: float
+    up_ms: Optional[float] = None
+    build_ms: Optional[float] = None
+    cached_ms: Optional[float] = None
+    bundle_bytes: Optional[int] = None
+    # Wall time of the tests that ran against the server.
+    tests_ms: Optional[float] = None
+    error: str = ""
+
+
+@dataclass
+class RunRecord:
+    batch_id: str
+    test_id: str
+    attempt: int
+    app_commit: str
+    lane: str
+    status: str
+    started_at: float
+    duration_ms: float
+    error: str = ""
+    steps: List[StepRecord] = field(default_factory=list)
+    # Selector -> element fingerprint captured during the run.
+    fingerprints: Dict[str, dict] = field(default_factory=dict)
+    heals: List[HealRecord] = field(default_factory=list)
+    app_metrics: List[AppMetricRecord] = field(default_factory=list)
+    app_metrics_dropped: int = 0
+    logs: List[LogLine] = field(default_factory=list)
+    log_volume: List[LogVolume] = field(default_factory=list)
+    logs_dropped: int = 0
+    downloads: List[DownloadRecord] = field(default_factory=list)
+    id: Optional[int] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.status == PASSED
+
+
+class ResultsStore:
+    """Thin wrapper around the results database.
+
+    The store is append-only for runs and steps; analysis modules
+    (flakiness, timeouts, ...) read from it and never mutate history.
+    """
+
+    def __init__(self, path: Path = RESULTS_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        for table, column, decl in MIGRATIONS:
+            existing = {r["name"] for r in self.conn.execute(f"PRAGMA table_info({table})")}
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+        # Older databases keyed fingerprints by selector alone; rebuild the
+        # table so each test keeps its own rows (existing rows stay with the
+        # test that wrote them last).
+        pk = {r["name"]: r["pk"] for r in self.conn.execute("PRAGMA table_info(fingerprints)")}
+        if not pk.get("test_id"):
+            self.conn.execute("ALTER TABLE fingerprints RENAME TO fingerprints_old")
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(
+                "INSERT INTO fingerprints (test_id, selector, fingerprint, updated_at)"
+                " SELECT test_id, selector, fingerprint, updated_at FROM fingerprints_old"
+            )
+            self.conn.execute("DROP TABLE fingerprints_old")
+        # Recorded under a type name, one element stood in for every locator.
+        self.conn.execute(
+            f"DELETE FROM fingerprints WHERE selector IN ({', '.join('?' * len(TYPE_NAME_SELECTORS))})",
+            sorted(TYPE_NAME_SELECTORS),
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- writes ---------------------------------------------------------
+
+    def add_run(self, run: RunRecord) -> int:
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (batch_id, test_id, attempt, app_commit, lane,"
+                " status, error, started_at, duration_ms, app_metrics_dropped, logs_dropped)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run.batch_id,
+                    run.test_id,
+                    run.attempt,
+                    run.app_commit,
+                    run.lane,
+                    run.status,
+                    run.error,
+                    run.started_at,
+                    run.duration_ms,
+                    run.app_metrics_dropped,
+                    run.logs_dropped,
+                ),
+            )
+            run.id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT INTO steps (run_id, idx, step_key, action, selector,"
+                " status, started_at, duration_ms, error, timeout_ms)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run.id,
+                        s.idx,
+                        s.step_key,
+                        s.action,
+                        s.selector,
+                        s.status,
+                        s.started_at,
+                        s.duration_ms,
+                        s.error,
+                        s.timeout_ms,
+                    )
+                    for s in run.steps
+                ],
+            )
+            self.conn.executemany(
+                "INSERT INTO heals (run_id, step_idx, selector, healed_selector, score)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(run.id, h.step_idx, h.selector, h.healed_selector, h.score) for h in run.heals],
+            )
+            self.conn.executemany(
+                "INSERT INTO app_metrics (run_id, step_idx, name, category, unit, value, recorded_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run.id, m.step_idx, m.name, m.category, m.unit, m.value, m.recorded_at)
+                    for m in run.app_metrics
+                ],
+            )
+            self.conn.executemany(
+                "INSERT INTO logs (run_id, step_idx, level, module, message, payload, logged_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run.id,
+                        line.step_idx,
+                        line.level,
+                        line.module,
+                        line.message,
+                        None if line.payload is None else json.dumps(line.payload, default=str),
+                        line.logged_at,
+                    )
+                    for line in run.logs
+                ],
+            )
+            self.conn.executemany(
+                "INSERT INTO log_volume (run_id, step_idx, module, level, lines)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(run.id, v.step_idx, v.module, v.level, v.lines) for v in run.log_volume],
+            )
+            self.conn.executemany(
+                "INSERT INTO downloads (run_id, step_idx, filename, path, bytes, rows, columns, errors)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run.id,
+                        d.step_idx,
+                        d.filename,
+                        d.path,
+                        d.bytes,
+                        d.rows,
+                        json.dumps(d.columns),
+                        json.dumps(d.errors),
+                    )
+                    for d in run.downloads
+                ],
+            )
+            # Only a passing run proves the captured elements were the right ones.
+            if run.passed and run.fingerprints:
+                self.conn.executemany(
+                    "INSERT INTO fingerprints (test_id, selector, fingerprint, updated_at)"
+                    " VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (test_id, selector) DO UPDATE SET"
+                    " fingerprint = excluded.fingerprint, updated_at = excluded.updated_at",
+                    [
+                        (run.test_id, sel, json.dumps(fp), run.started_at)
+                        for sel, fp in run.fingerprints.items()
+                        if not is_type_name(sel)
+                    ],
+                )
+        assert run.id is not None
+        return run.id
+
+    def add_dev_server(self, record: DevServerRecord) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO dev_server (batch_id, app_commit, mode, started_at, up_ms,"
+                " build_ms, cached_ms, bundle_bytes, tests_ms, error)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.batch_id,
+                    record.app_commit,
+                    record.mode,
+                    record.started_at,
+                    record.up_ms,
+                    record.build_ms,
+                    record.cached_ms,
+                    record.bundle_bytes,
+                    record.tests_ms,
+                    record.error,
+                ),
+            )
+
+    def set_quarantine(self, test_id: str, score: float, reason: str) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO quarantine (test_id, score, since, reason)"
+                " VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (test_id) DO UPDATE SET score = excluded.score,"
+                " reason = excluded.reason",
+                (test_id, score, time.time(), reason),
+            )
+
+    def release_quarantine(self, test_id: str) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM quarantine WHERE test_id = ?", (test_id,))
+
+    # -- reads ----------------------------------------------------------
+
+    def runs(self, test_id: Optional[str] = None) -> Iterator[sqlite3.Row]:
+        if test_id is None:
+            sql, args = "SELECT * FROM runs ORDER BY started_at", ()
+        else:
+            sql = "SELECT * FROM runs WHERE test_id = ? ORDER BY started_at"
+            args = (test_id,)
+        yield from self.conn.execute(sql, args)
+
+    def steps(self, run_id: int) -> List[sqlite3.Row]:
+        return list(
+            self.conn.execute(
+                "SELECT * FROM steps WHERE run_id = ? ORDER BY idx", (run_id,)
+            )
+        )
+
+    def step_rows(self) -> Iterator[sqlite3.Row]:
+        """All steps joined with the test and commit of their run."""
+        yield from self.conn.execute(
+            "SELECT r.test_id, r.app_commit, s.* FROM steps s"
+            " JOIN runs r ON r.id = s.run_id ORDER BY s.started_at"
+        )
+
+    def fingerprint_index(self) -> Dict[str, Dict[str, dict]]:
+        """Test id -> selector -> fingerprint entry."""
+        index: Dict[str, Dict[str, dict]] = {}
+        for row in self.conn.execute("SELECT * FROM fingerprints"):
+            if is_type_name(row["selector"]):
+                continue
+            index.setdefault(row["test_id"], {})[row["selector"]] = {
+                "selector": row["selector"],
+                "fingerprint": json.loads(row["fingerprint"]),
+                "updated_at": row["updated_at"],
+            }
+        return index
+
+    def heal_summary(self) -> List[sqlite3.Row]:
+        return list(
+            self.conn.execute(
+                "SELECT r.test_id, h.selector, h.healed_selector, COUNT(*) AS heals,"
+                " AVG(h.score) AS score, MAX(r.started_at) AS last_seen"
+                " FROM heals h JOIN runs r ON r.id = h.run_id"
+                " GROUP BY r.test_id, h.selector, h.healed_selector"
+                " ORDER BY heals DESC"
+            )
+        )
+
+    def app_metric_rows(self, test_id: Optional[str] = None) -> List[sqlite3.Row]:
+        sql = "SELECT r.test_id, m.* FROM app_metrics m JOIN runs r ON r.id = m.run_id"
+        args: tuple = ()
+        if test_id is not None:
+            sql += " WHERE r.test_id = ?"
+            args = (test_id,)
+        return list(self.conn.execute(sql + " ORDER BY m.recorded_at", args))
+
+    def render_by_step(self, test_id: Optional[str] = None) -> List[sqlite3.Row]:
+        """Render metrics attributed to the step that triggered them."""
+        sql = (
+            "SELECT r.test_id, s.step_key, COUNT(*) AS renders, SUM(m.value) AS render_ms"
+            " FROM app_metrics m JOIN runs r ON r.id = m.run_id"
+            " JOIN steps s ON s.run_id = m.run_id AND s.idx = m.step_idx"
+            " WHERE m.category = 'render'"
+        )
+        args: tuple = ()
+        if test_id is not None:
+            sql += " AND r.test_id = ?"
+            args = (test_id,)
+        sql += " GROUP BY r.test_id, s.step_key ORDER BY render_ms DESC"
+        return list(self.conn.execute(sql, args))
+
+    def log_volume_rows(self, test_id: Optional[str] = None) -> List[sqlite3.Row]:
+        """Lines per (run, step, module) with the step's key and duration."""
+        sql = (
+            "SELECT r.test_id, v.run_id, v.step_idx, v.module, SUM(v.lines) AS lines,"
+            " s.step_key, s.duration_ms"
+            " FROM log_volume v JOIN runs r ON r.id = v.run_id"
+            " LEFT JOIN steps s ON s.run_id = v.run_id AND s.idx = v.step_idx"
+        )
+        args: tuple = ()
+        if test_id is not None:
+            sql += " WHERE r.test_id = ?"
+            args = (test_id,)
+        sql += " GROUP BY v.run_id, v.step_idx, v.module"
+        return list(self.conn.execute(sql, args))
+
+    def log_lines(
+        self, test_id: Optional[str] = None, level: Optional[str] = None
+    ) -> List[sqlite3.Row]:
+        sql = "SELECT r.test_id, l.* FROM logs l JOIN runs r ON r.id = l.run_id WHERE 1 = 1"
+        args: List[Any] = []
+        if test_id is not None:
+            sql += " AND r.test_id = ?"
+            args.append(test_id)
+        if level is not None:
+            sql += " AND l.level = ?"
+            args.append(level)
+        return list(self.conn.execute(sql + " ORDER BY l.logged_at", args))
+
+    def downloads(self, test_id: Optional[str] = None) -> List[sqlite3.Row]:
+        sql = "SELECT r.test_id, d.* FROM downloads d JOIN runs r ON r.id = d.run_id"
+        args: tuple = ()
+        if test_id is not None:
+            sql += " WHERE r.test_id = ?"
+            args = (test_id,)
+        return list(self.conn.execute(sql + " ORDER BY d.run_id, d.step_idx", args))
+
+    def dev_server_rows(self, limit: int = 20) -> List[sqlite3.Row]:
+        return list(
+            self.conn.execute("SELECT * FROM dev_server ORDER BY started_at DESC LIMIT ?", (limit,))
+        )
+
+    def quarantined(self) -> dict:
+        return {
+            row["test_id"]: dict(row)
+            for row in self.conn.execute("SELECT * FROM quarantine")
+        }
+
+
+def read_events(path: Path) -> List[dict]:
+    """Parse the JSONL event file written by an instrumented test process."""
+    events = []
+    try:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A process killed mid-write leaves a truncated last line.
+                    continue
+    except FileNotFoundError:
+        pass
+    return events
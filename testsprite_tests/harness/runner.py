@@ -0,0 +1,338 @@
+"""Run generated TestSprite scripts and record the results.
+
+Tests are split into two lanes that run side by side:
+
+* ``blocking``: normal tests; any failure after retries fails the run;
+* ``quarantine``: tests flagged by :mod:`harness.flaky`; they still run
+  and feed history, but never affect the exit status.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import config, dev_server, fake_camera, flaky, healing, timeouts
+from .results import (
+    FAILED,
+    PASSED,
+    AppMetricRecord,
+    DevServerRecord,
+    DownloadRecord,
+    HealRecord,
+    LogLine,
+    LogVolume,
+    ResultsStore,
+    RunRecord,
+    StepRecord,
+    read_events,
+)
+
+BLOCKING = "blocking"
+QUARANTINE = "quarantine"
+
+SCRIPT_TIMEOUT_S = 600.0
+
+
+@dataclass
+class TestScript:
+    test_id: str
+    path: Path
+
+
+def discover(dirs: Iterable[Path] = config.SUITE_DIRS, pattern: str = "TC*.py") -> List[TestScript]:
+    scripts = []
+    for d in dirs:
+        for path in sorted(Path(d).glob(pattern)):
+            scripts.append(TestScript(path.stem, path))
+    return scripts
+
+
+def _steps_from(events: List[dict]) -> List[StepRecord]:
+    return [
+        StepRecord(
+            idx=e["idx"],
+            action=e["action"],
+            selector=e["selector"],
+            status=e["status"],
+            started_at=e["started_at"],
+            duration_ms=e["duration_ms"],
+            error=e.get("error", ""),
+            timeout_ms=e.get("timeout_ms"),
+        )
+        for e in events
+        if e.get("type") == "step"
+    ]
+
+
+def _heals_from(events: List[dict]) -> List[HealRecord]:
+    return [
+        HealRecord(e["step"], e["selector"], e["healed"], e["score"])
+        for e in events
+        if e.get("type") == "heal"
+    ]
+
+
+def _fingerprints_from(events: List[dict]) -> Dict[str, dict]:
+    return {e["selector"]: e["fingerprint"] for e in events if e.get("type") == "fingerprint"}
+
+
+def _app_metrics_from(events: List[dict]) -> Tuple[List[AppMetricRecord], int]:
+    metrics, dropped = [], 0
+    for e in events:
+        if e.get("type") != "app_metrics":
+            continue
+        dropped += e.get("dropped", 0)
+        metrics.extend(
+            # The app reports epoch milliseconds; the store uses seconds.
+            AppMetricRecord(e["step"], name, category, unit, value, ts / 1000.0)
+            for name, category, unit, value, ts in e["metrics"]
+        )
+    return metrics, dropped
+
+
+def _logs_from(events: List[dict]) -> Tuple[List[LogLine], List[LogVolume], int]:
+    lines: List[LogLine] = []
+    volume: List[LogVolume] = []
+    dropped = 0
+    for e in events:
+        if e.get("type") != "logs":
+            continue
+        dropped += e.get("dropped", 0)
+        lines.extend(
+            LogLine(r["step"], r["level"], r["module"], r["message"], r["logged_at"], r.get("payload"))
+            for r in e["records"]
+        )
+        volume.extend(LogVolume(*v) for v in e["volume"])
+    return lines, volume, dropped
+
+
+def _downloads_from(events: List[dict]) -> List[DownloadRecord]:
+    return [
+        DownloadRecord(
+            e["step"], e["filename"], e["path"], e["bytes"], e["rows"], e["columns"], e["errors"]
+        )
+        for e in events
+        if e.get("type") == "download"
+    ]
+
+
+def _error_tail(stderr: bytes, lines: int = 5) -> str:
+    text = stderr.decode("utf-8", "replace").strip().splitlines()
+    return "\n".join(text[-lines:])
+
+
+class Runner:
+    def __init__(
+        self,
+        store: ResultsStore,
+        workers: int = 4,
+        quarantine_workers: int = 2,
+        retries: int = 1,
+        timeout_s: float = SCRIPT_TIMEOUT_S,
+        adaptive_timeouts: bool = True,
+        snapshot: Optional[Path] = None,
+        camera: bool = False,
+        network: Optional[str] = None,
+    ):
+        self.store = store
+        self.retries = retries
+        self.timeout_s = timeout_s
+        self.batch_id = uuid.uuid4().hex[:12]
+        self.app_commit = config.app_commit()
+        self._slots = {
+            BLOCKING: asyncio.Semaphore(workers),
+            QUARANTINE: asyncio.Semaphore(quarantine_workers),
+        }
+        # Learned once per batch so every attempt in it sees the same budgets.
+        self.timeouts_file: Optional[Path] = None
+        if adaptive_timeouts:
+            self.timeouts_file = timeouts.save(timeouts.learn(store))
+        self.fingerprints_file = healing.save_index(store.fingerprint_index())
+        # Storage state every browser context of the batch starts from.
+        self.snapshot = snapshot
+        # Fake camera device; the clip is written here so scripts never race on it.
+        self.camera = camera
+        if camera:
+            fake_camera.ensure()
+        self.network = network
+
+    def _env(self, script: TestScript, events_path: str) -> Dict[str, str]:
+        env = dict(os.environ)
+        pythonpath = [str(config.SUITE_DIR)]
+        if env.get("PYTHONPATH"):
+            pythonpath.append(env["PYTHONPATH"])
+        env["PYTHONPATH"] = os.pathsep.join(pythonpath)
+        env[config.ENV_EVENTS] = events_path
+        env[config.ENV_TEST_ID] = script.test_id
+        if self.timeouts_file is not None:
+            env[config.ENV_TIMEOUTS] = str(self.timeouts_file)
+        env[config.ENV_FINGERPRINTS] = str(self.fingerprints_file)
+        if self.snapshot is not None:
+            env[config.ENV_SNAPSHOT] = str(self.snapshot)
+        if self.camera:
+            env[config.ENV_CAMERA] = fake_camera.policy_for(script.test_id)
+        if self.network:
+            env[config.ENV_NETWORK] = self.network
+        return env
+
+    async def _attempt(self, script: TestScript, lane: str, attempt: int) -> RunRecord:
+        fd, events_path = tempfile.mkstemp(prefix=f"{script.test_id}-", suffix=".jsonl")
+        os.close(fd)
+        started = time.time()
+        t0 = time.perf_counter()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-m",
+                "harness.bootstrap",
+                str(script.path),
+                cwd=str(script.path.parent),
+                env=self._env(script, events_path),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await asyncio.wait_for(proc.communicate(), self.timeout_s)
+                status = PASSED if proc.returncode == 0 else FAILED
+                error = "" if status == PASSED else _error_tail(stderr)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                status, error = FAILED, f"timed out after {self.timeout_s:.0f}s"
+            events = read_events(Path(events_path))
+        finally:
+            os.unlink(events_path)
+
+        app_metrics, dropped = _app_metrics_from(events)
+        logs, log_volume, logs_dropped = _logs_from(events)
+        run = RunRecord(
+            batch_id=self.batch_id,
+            test_id=script.test_id,
+            attempt=attempt,
+            app_commit=self.app_commit,
+            lane=lane,
+            status=status,
+            started_at=started,
+            duration_ms=(time.perf_counter() - t0) * 1000.0,
+            error=error,
+            steps=_steps_from(events),
+            fingerprints=_fingerprints_from(events),
+            heals=_heals_from(events),
+            app_metrics=app_metrics,
+            app_metrics_dropped=dropped,
+            logs=logs,
+            log_volume=log_volume,
+            logs_dropped=logs_dropped,
+            downloads=_downloads_from(events),
+        )
+        self.store.add_run(run)
+        return run
+
+    async def _run_one(self, script: TestScript, lane: str) -> RunRecord:
+        async with self._slots[lane]:
+            run = await self._attempt(script, lane, 0)
+            for attempt in range(1, self.retries + 1):
+                if run.passed:
+                    break
+                run = await self._attempt(script, lane, attempt)
+            return run
+
+    async def run(self, scripts: Sequence[TestScript]) -> Dict[str, List[RunRecord]]:
+        quarantined = self.store.quarantined()
+        lanes: Dict[str, List[TestScript]] = {BLOCKING: [], QUARANTINE: []}
+        for script in scripts:
+            lanes[QUARANTINE if script.test_id in quarantined else BLOCKING].append(script)
+
+        tasks = {
+            lane: [asyncio.ensure_future(self._run_one(s, lane)) for s in members]
+            for lane, members in lanes.items()
+        }
+        results = {lane: list(await asyncio.gather(*ts)) for lane, ts in tasks.items()}
+        return results
+
+
+def run_suite(
+    dirs: Iterable[Path] = config.SUITE_DIRS,
+    pattern: str = "TC*.py",
+    workers: int = 4,
+    quarantine_workers: int = 2,
+    retries: int = 1,
+    store: Optional[ResultsStore] = None,
+    adaptive_timeouts: bool = True,
+    snapshot: Optional[Path] = None,
+    camera: bool = False,
+    network: Optional[str] = None,
+    serve: str = "auto",
+) -> int:
+    """Run the suite, refresh quarantine and return a process exit code.
+
+    ``serve`` is a :mod:`harness.dev_server` mode: the dev server is made
+    ready before the first script starts and its timings are stored apart
+    from the tests'.
+    """
+    own_store = store is None
+    store = store or ResultsStore()
+    try:
+        runner = Runner(
+            store,
+            workers,
+            quarantine_workers,
+            retries,
+            adaptive_timeouts=adaptive_timeouts,
+            snapshot=snapshot,
+            camera=camera,
+            network=network,
+        )
+        try:
+            with dev_server.serve(serve) as ready:
+                t0 = time.perf_counter()
+                results = asyncio.run(runner.run(discover(dirs, pattern)))
+                tests_ms = (time.perf_counter() - t0) * 1000.0
+        except dev_server.DevServerError as exc:
+            print(f"dev server not ready: {exc}", file=sys.stderr)
+            error = f"--dev-server {serve}: {exc}"[:500]
+            store.add_dev_server(
+                DevServerRecord(runner.batch_id, runner.app_commit, "failed", time.time(), error=error)
+            )
+            return 1
+        if ready is not None:
+            store.add_dev_server(
+                DevServerRecord(
+                    runner.batch_id,
+                    runner.app_commit,
+                    ready.mode,
+                    ready.started_at,
+                    ready.up_ms,
+                    ready.build_ms,
+                    ready.cached_ms,
+                    ready.bundle_bytes,
+                    tests_ms,
+                )
+            )
+            print(f"{ready.summary()}; tests took {tests_ms / 1000:.1f}s")
+        changes = flaky.update_quarantine(store)
+
+        for lane, runs in results.items():
+            failed = [r for r in runs if not r.passed]
+            print(f"[{lane}] {len(runs) - len(failed)}/{len(runs)} passed")
+            for r in failed:
+                print(f"  FAILED {r.test_id}: {r.error.splitlines()[-1] if r.error else ''}")
+        for run in (r for runs in results.values() for r in runs):
+            for h in run.heals:
+                print(f"healed {run.test_id} step {h.step_idx}: {h.selector} -> {h.healed_selector}"
+                      f" (score {h.score:.2f})")
+        for test_id in changes["added"]:
+            print(f"quarantined: {test_id}")
+        for test_id in changes["released"]:
+            print(f"released from quarantine: {test_id}")
+
+        return 1 if any(not r.passed for r in results[BLOCKING]) else 0
+    finally:
+        if own_store:
+            store.close()
@@ -0,0 +1,105 @@
+"""Browser sessions for harness tools that drive the app themselves.
+
+Mirrors the launch setup of the generated scripts so measurements taken
+here are comparable with theirs.
+"""
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional, Sequence, Tuple
+
+from .app_metrics import TEST_HOOKS_JS
+from .config import BASE_URL
+
+LAUNCH_ARGS = (
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--ipc=host",
+)
+
+# Mirrors DEMO_USER in app_vendita/src/utils/testCredentials.ts.
+DEMO_EMAIL = "demo@testsprite.com"
+DEMO_PASSWORD = "TestSprite123!"
+# Mirrors TEST_USERS in app_vendita/src/utils/setupTestUsers.ts (created by createTestUsers()).
+TEST_USERS = (
+    (DEMO_EMAIL, DEMO_PASSWORD),
+    ("userA@example.com", "UserAPassword123"),
+    ("userB@example.com", "UserBPassword123"),
+    ("agent@testsprite.com", "AgentTest123!"),
+)
+
+
+@dataclass
+class Session:
+    playwright: Any
+    browser: Any
+    context: Any
+    page: Any
+
+
+@asynccontextmanager
+async def browser_session(
+    headless: bool = True,
+    args: Sequence[str] = (),
+    default_timeout_ms: float = 5000,
+    **context_options: Any,
+) -> AsyncIterator[Session]:
+    from playwright.async_api import async_playwright
+
+    pw = await async_playwright().start()
+    browser = context = None
+    try:
+        browser = await pw.chromium.launch(
+            headless=headless, args=[*LAUNCH_ARGS, *args]
+        )
+        context = await browser.new_context(**context_options)
+        context.set_default_timeout(default_timeout_ms)
+        page = await context.new_page()
+        yield Session(pw, browser, context, page)
+    finally:
+        if context:
+            await context.close()
+        if browser:
+            await browser.close()
+        await pw.stop()
+
+
+async def open_app(page: Any, url: str = BASE_URL, timeout_ms: float = 30000) -> None:
+    await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+
+
+async def login(
+    page: Any,
+    email: str = DEMO_EMAIL,
+    password: str = DEMO_PASSWORD,
+    timeout_ms: Optional[float] = None,
+) -> None:
+    """Log in through LoginModal and wait for the calendar to show up."""
+    from .locators import selector
+
+    await page.locator(selector("login.open")).click(timeout=timeout_ms)
+    await page.locator(selector("login.email")).fill(email, timeout=timeout_ms)
+    await page.locator(selector("login.password")).fill(password, timeout=timeout_ms)
+    await page.locator(selector("login.submit")).click(timeout=timeout_ms)
+    await page.locator(selector("calendar.view_week")).wait_for(timeout=timeout_ms or 30000)
+
+
+async def logged_in_context(
+    browser: Any, user: int, timeout_ms: float, ready_js: Optional[str] = None
+) -> Tuple[Any, Any]:
+    """(context, page) of a new context logged in as ``TEST_USERS[user]``.
+
+    Users repeat past the end of ``TEST_USERS``. The context gets the test
+    hooks; with ``ready_js`` the call also waits until it is true, for the
+    hooks the caller needs.
+    """
+    email, password = TEST_USERS[user % len(TEST_USERS)]
+    context = await browser.new_context()
+    context.set_default_timeout(timeout_ms)
+    await context.add_init_script(TEST_HOOKS_JS)
+    page = await context.new_page()
+    await open_app(page)
+    await login(page, email, password, timeout_ms)
+    if ready_js:
+        await page.wait_for_function(ready_js)
+    return context, page
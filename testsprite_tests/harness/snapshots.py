@@ -0,0 +1,354 @@
+"""Prebuilt browser-storage snapshots for large-dataset scenarios.
+
+    python -m harness.snapshots build [NAME ...] [--force]
+    python -m harness.snapshots list
+
+The app persists its Zustand stores to ``localStorage``
+(``utils/storageAdapter.ts`` on web, ``master-data-storage`` through
+Zustand's default storage). A snapshot is that storage captured after the
+fixture data went through the stores' own actions (``setMasterData``,
+``setEntries``), so derived slices such as the master-data filters are the
+app's, not ours. Snapshots are Playwright ``storage_state`` files cached
+under ``.harness/snapshots`` and keyed by app commit and fixture hash.
+They are rebuilt only when either changes.
+
+    context = await browser.new_context(storage_state=str(ensure("clients-25k")))
+    # or, for a context that already exists:
+    await apply_snapshot(context, "clients-25k")
+
+``harness run --snapshot NAME`` starts every script's contexts from it.
+
+Calendar entries are persisted too, but ``MainCalendarPage`` replaces them
+with the Firestore result once the initial load completes.
+``entries-12m`` therefore measures warm start with a large
+``calendar-storage``. To get entries into the grid, use
+:mod:`harness.calendar_seed` after login.
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import hashlib
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import config, session
+from .app_metrics import TEST_HOOKS_JS
+from .calendar_seed import generate_entries
+
+SNAPSHOT_DIR = config.STATE_DIR / "snapshots"
+AGENTI_CLIENTI = config.REPO_ROOT / "app_vendita" / "agenti_clienti_luglio25_completo_mail_cell.json"
+LISTINO = config.REPO_ROOT / "app_vendita" / "listino_luglio25.json"
+
+# Fixed timestamps keep the fixture hash stable between builds.
+FIXTURE_TIME = "2025-07-01T00:00:00.000Z"
+FOCUS_REFERENCES = 5
+# Marks a context that already got a snapshot through apply_snapshot().
+APPLIED_KEY = "__harnessSnapshot"
+
+
+class SnapshotError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class SnapshotSpec:
+    name: str
+    description: str
+    clients: int = 0
+    months: int = 0
+
+
+SNAPSHOTS: Dict[str, SnapshotSpec] = {
+    s.name: s
+    for s in (
+        SnapshotSpec("empty", "fresh install: whatever the app persists on its own"),
+        SnapshotSpec("clients-2564", "master data from agenti_clienti_luglio25", clients=2564),
+        SnapshotSpec("clients-25k", "master data replicated to 25,000 clients", clients=25_000),
+        SnapshotSpec(
+            "entries-12m",
+            "2564 clients plus 12 months of entries for the first one",
+            clients=2564,
+            months=12,
+        ),
+    )
+}
+
+BUILD_JS = """
+async ({masterData, entries, salesPointId}) => {
+  const hooks = window.__appTestHooks || {};
+  const toDate = (v) => (v ? new Date(v) : v);
+  const persisted = (key, slice) => {
+    try {
+      const v = JSON.parse(localStorage.getItem(key));
+      return v && v.state && Array.isArray(v.state[slice]) ? v.state[slice].length : 0;
+    } catch (e) { return 0; }
+  };
+  try {
+    if (masterData.length) hooks.masterDataStore.getState().setMasterData(masterData);
+    if (entries.length) {
+      const calendar = hooks.calendarStore.getState();
+      calendar.setEntries(entries.map((e) => ({
+        ...e, date: toDate(e.date), createdAt: toDate(e.createdAt), updatedAt: toDate(e.updatedAt),
+      })));
+      calendar.updateFilters({salesPointId});
+    }
+  } catch (e) {
+    return {error: String(e)};
+  }
+  // storageAdapter writes through AsyncStorage, which is asynchronous.
+  for (let i = 0; i < 50; i++) {
+    if (persisted('master-data-storage', 'masterData') === masterData.length
+        && persisted('calendar-storage', 'entries') === entries.length) break;
+    await new Promise((r) => setTimeout(r, 100));
+  }
+  const sizes = {};
+  for (let i = 0; i < localStorage.length; i++) {
+    const k = localStorage.key(i);
+    sizes[k] = localStorage.getItem(k).length;
+  }
+  return {
+    sizes,
+    masterData: persisted('master-data-storage', 'masterData'),
+    entries: persisted('calendar-storage', 'entries'),
+  };
+}
+"""
+
+# Counts after the app rehydrated from a snapshot.
+HYDRATED_JS = """
+async () => {
+  const hooks = window.__appTestHooks || {};
+  for (let i = 0; i < 100 && !(hooks.masterDataStore && hooks.calendarStore); i++) {
+    await new Promise((r) => setTimeout(r, 100));
+  }
+  const md = hooks.masterDataStore && hooks.masterDataStore.persist;
+  if (md && !md.hasHydrated()) await new Promise((r) => md.onFinishHydration(r));
+  return {
+    masterData: hooks.masterDataStore ? hooks.masterDataStore.getState().masterData.length : null,
+    filters: hooks.masterDataStore ? hooks.masterDataStore.getState().filters.salesPoints.length : null,
+  };
+}
+"""
+
+APPLY_JS = """
+(([origin, id, items]) => {
+  if (location.origin !== origin) return;
+  try {
+    if (localStorage.getItem('%s') === id) return;
+    for (const [k, v] of items) localStorage.setItem(k, v);
+    localStorage.setItem('%s', id);
+  } catch (e) { /* quota: the app starts cold */ }
+})
+""" % (APPLIED_KEY, APPLIED_KEY)
+
+
+# -- fixtures ---------------------------------------------------------------
+
+
+def _master_row(i: int, row: Dict[str, Any], copy: int) -> Dict[str, Any]:
+    """One MasterDataRow from an agenti_clienti row; copies get new client codes."""
+    code = str(row.get("Codice Cliente", ""))
+    name = row.get("Cliente", "")
+    if copy:
+        code, name = f"{code}-{copy}", f"{name} #{copy}"
+    return {
+        "id": f"md_{i}",
+        "linea": row.get("Linea", ""),
+        "codiceAreaManager": row.get("Codice Area Manager", ""),
+        "codiceNam": row.get("Codice Nam", ""),
+        "codiceAgente": row.get("Codige Agente", ""),
+        "nomeAgente": row.get("Nome Agente", ""),
+        "mailAgente": row.get("Mail Agente", ""),
+        "cellAgente": str(row.get("Cell Agente", "")),
+        "insegna": row.get("Insegna", ""),
+        "codiceCliente": code,
+        "cliente": name,
+        "cap": str(row.get("Cap", "")),
+        "indirizzo": row.get("Indirizzo", ""),
+        "provincia": row.get("Provincia", ""),
+        "codiceProvincia": row.get("Codice provincia", ""),
+        "latitudine": row.get("Latitudine", 0),
+        "longitudine": row.get("Longitudine", 0),
+        "createdAt": FIXTURE_TIME,
+        "updatedAt": FIXTURE_TIME,
+    }
+
+
+def master_data(clients: int) -> List[Dict[str, Any]]:
+    source = json.loads(AGENTI_CLIENTI.read_text(encoding="utf-8"))
+    return [_master_row(i, source[i % len(source)], i // len(source)) for i in range(clients)]
+
+
+def focus_reference_ids(n: int = FOCUS_REFERENCES) -> List[str]:
+    listino = json.loads(LISTINO.read_text(encoding="utf-8"))
+    return [str(item["COD."]) for item in listino if item.get("COD.") is not None][:n]
+
+
+def calendar_entries(months: int, sales_point_id: str, today: Optional[dt.date] = None) -> List[Dict[str, Any]]:
+    """``months`` whole months ending with the current one, so the calendar opens on data."""
+    today = today or dt.date.today()
+    start = today.replace(day=1)
+    for _ in range(months - 1):
+        start = (start - dt.timedelta(days=1)).replace(day=1)
+    end = (today.replace(day=28) + dt.timedelta(days=4)).replace(day=1)
+    return generate_entries(start, (end - start).days, sales_point_id, focus_reference_ids())
+
+
+@dataclass
+class Fixture:
+    master_data: List[Dict[str, Any]]
+    entries: List[Dict[str, Any]]
+    sales_point_id: str
+
+    @property
+    def digest(self) -> str:
+        blob = json.dumps(asdict(self), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(blob).hexdigest()
+
+
+def fixture(spec: SnapshotSpec) -> Fixture:
+    rows = master_data(spec.clients) if spec.clients else []
+    sales_point = rows[0]["codiceCliente"] if rows else ""
+    entries = calendar_entries(spec.months, sales_point) if spec.months else []
+    return Fixture(rows, entries, sales_point)
+
+
+# -- cache ------------------------------------------------------------------
+
+
+def snapshot_path(name: str, digest: str, commit: Optional[str] = None) -> Path:
+    commit = commit or config.app_commit()
+    return SNAPSHOT_DIR / f"{name}-{commit[:12]}-{digest[:12]}.json"
+
+
+def _meta_path(path: Path) -> Path:
+    return path.with_suffix(".meta.json")
+
+
+async def build(spec: SnapshotSpec, fix: Fixture, path: Path, base_url: str = config.BASE_URL) -> Dict[str, Any]:
+    """Load the app in a fresh context, push the fixture through the stores and save the storage."""
+    t0 = time.perf_counter()
+    async with session.browser_session(default_timeout_ms=30000) as s:
+        await s.context.add_init_script(TEST_HOOKS_JS)
+        await session.open_app(s.page, base_url)
+        await s.page.wait_for_function("() => window.__appTestHooks && window.__appTestHooks.masterDataStore")
+        out = await s.page.evaluate(
+            BUILD_JS,
+            {"masterData": fix.master_data, "entries": fix.entries, "salesPointId": fix.sales_point_id},
+        )
+        if "error" in out:
+            raise SnapshotError(f"{spec.name}: {out['error']}")
+        for slice, want in (("masterData", len(fix.master_data)), ("entries", len(fix.entries))):
+            if out[slice] != want:
+                total = sum(out["sizes"].values())
+                raise SnapshotError(
+                    f"{spec.name}: {out[slice]}/{want} {slice} persisted"
+                    f" ({total:,} chars in localStorage; over the quota?)"
+                )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        await s.context.storage_state(path=str(tmp))
+        os.replace(tmp, path)
+
+    # Prove the snapshot starts warm before anyone relies on it.
+    async with session.browser_session(default_timeout_ms=30000, storage_state=str(path)) as s:
+        await s.context.add_init_script(TEST_HOOKS_JS)
+        await session.open_app(s.page, base_url)
+        hydrated = await s.page.evaluate(HYDRATED_JS)
+    if hydrated["masterData"] != len(fix.master_data):
+        raise SnapshotError(f"{spec.name}: app rehydrated {hydrated['masterData']}/{len(fix.master_data)} rows")
+
+    meta = {
+        "name": spec.name,
+        "app_commit": config.app_commit(),
+        "fixture": fix.digest,
+        "built_at": time.time(),
+        "build_s": time.perf_counter() - t0,
+        "sizes": out["sizes"],
+        "master_data": len(fix.master_data),
+        "entries": len(fix.entries),
+        "sales_points": hydrated["filters"],
+    }
+    _meta_path(path).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return meta
+
+
+def ensure(name: str, force: bool = False) -> Path:
+    """Path of a current snapshot, building it first if needed."""
+    try:
+        spec = SNAPSHOTS[name]
+    except KeyError:
+        raise SnapshotError(f"unknown snapshot {name!r}; known: {', '.join(SNAPSHOTS)}") from None
+    fix = fixture(spec)
+    path = snapshot_path(name, fix.digest)
+    if force or not path.exists():
+        asyncio.run(build(spec, fix, path))
+    return path
+
+
+async def apply_snapshot(context: Any, name: str, path: Optional[Path] = None) -> None:
+    """Load a snapshot into an existing context before its pages load the app.
+
+    Applied once per context; later navigations see whatever the app wrote.
+    Prefer ``new_context(storage_state=...)``, which skips the init script.
+    """
+    path = path or await asyncio.get_running_loop().run_in_executor(None, ensure, name)
+    state = json.loads(Path(path).read_text(encoding="utf-8"))
+    for origin in state.get("origins", []):
+        items = [[i["name"], i["value"]] for i in origin.get("localStorage", [])]
+        await context.add_init_script(f"({APPLY_JS})({json.dumps([origin['origin'], Path(path).stem, items])})")
+
+
+def cached() -> List[Dict[str, Any]]:
+    out = []
+    for meta in sorted(SNAPSHOT_DIR.glob("*.meta.json")):
+        try:
+            out.append(json.loads(meta.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return out
+
+
+def report(metas: List[Dict[str, Any]]) -> str:
+    lines = [
+        "| Snapshot | App commit | Fixture | Clients | Entries | localStorage chars | Built in |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for m in metas:
+        lines.append(
+            f"| {m['name']} | {m['app_commit'][:12]} | {m['fixture'][:12]} | {m['master_data']}"
+            f" | {m['entries']} | {sum(m['sizes'].values()):,} | {m['build_s']:.1f} s |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.snapshots")
+    sub = parser.add_subparsers(dest="command", required=True)
+    b = sub.add_parser("build", help="build missing snapshots")
+    b.add_argument("names", nargs="*", help=f"default: all ({', '.join(SNAPSHOTS)})")
+    b.add_argument("--force", action="store_true", help="rebuild even if cached")
+    sub.add_parser("list", help="cached snapshots")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        sys.stdout.write(report(cached()))
+        return 0
+    failed = 0
+    for name in args.names or list(SNAPSHOTS):
+        try:
+            print(f"{name}: {ensure(name, args.force)}")
+        except SnapshotError as e:
+            print(f"{name}: FAILED {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""Cold-start and time-to-interactive profile of the app.
+
+    python -m harness.startup [--loads 10] [--modes cold,warm] [--no-trace]
+
+The generated scripts navigate with ``wait_until="commit"`` and then sleep
+3 s per frame, so they never say how long the app takes to start. This
+logs in once, so the Firebase session sits in the context's IndexedDB,
+then loads the app ``--loads`` times in a new page per load:
+
+* **cold**: the browser cache is cleared and disabled for the page over
+  CDP (``Network.clearBrowserCache``, ``Network.setCacheDisabled``), so
+  every byte of the bundle comes from the dev server again;
+* **warm**: one unrecorded load fills the cache, then the loads reuse it.
+
+For every load it records, in ms from navigation start:
+
+* navigation timing: TTFB, DOMContentLoaded, load, first contentful paint;
+* the JS bundle (Metro's ``*.bundle`` scripts): download from resource
+  timing, and parse/compile and evaluation from a CDP trace of the load
+  (``v8.compile`` and ``EvaluateScript`` events for the bundle URLs);
+* ``InitialLoadingScreen``: from its first appearance until it is gone
+  for good, auth check and bootstrapping overlay included;
+* first calendar paint: the frame after the first day cell is added;
+* first cell clickable: the first frame in which the centre of that cell
+  hit-tests to the cell itself, the "receives events" check Playwright's
+  ``click()`` waits for. Until then the loading overlay covers it.
+
+The page side is an init script with a ``MutationObserver``; the trace
+adds some overhead of its own, so ``--no-trace`` gives cleaner timings
+without the parse/eval columns. The dev server serves an unminified
+development bundle, the one the scripts test against.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import session
+from .config import BASE_URL
+from .locators import REGISTRY, selector
+from .tables import ms
+from .timeouts import percentile
+
+MODES = ("cold", "warm")
+TRACE_CATEGORIES = ["devtools.timeline", "v8"]
+BUNDLE_MARK = ".bundle"
+
+# (key, label, what it is); every value is in ms.
+METRICS = (
+    ("ttfb", "TTFB", "since navigation start"),
+    ("dom_content_loaded", "DOMContentLoaded", "since navigation start"),
+    ("load", "load event", "since navigation start"),
+    ("fcp", "First contentful paint", "since navigation start"),
+    ("bundle_download", "Bundle download", "duration"),
+    ("bundle_compile", "Bundle parse/compile", "duration, trace"),
+    ("bundle_eval", "Bundle evaluation", "duration, trace"),
+    ("loading_screen", "InitialLoadingScreen", "duration"),
+    ("loading_done", "InitialLoadingScreen gone", "since navigation start"),
+    ("calendar_paint", "First calendar paint", "since navigation start"),
+    ("interactive", "First cell clickable", "since navigation start"),
+)
+
+OBSERVER_JS = """
+(() => {
+  if (window.__harnessStartup) return;
+  const LOADING = %(loading)s;
+  const CELL = %(cell)s;
+  const marks = window.__harnessStartup = {
+    loadingShown: null, loadingHidden: null, firstCell: null, calendarPaint: null, interactive: null,
+  };
+  const hittable = (el) => {
+    const r = el.getBoundingClientRect();
+    if (!r.width || !r.height) return false;
+    const x = r.left + r.width / 2;
+    const y = r.top + r.height / 2;
+    if (x < 0 || y < 0 || x > innerWidth || y > innerHeight) return false;
+    const hit = document.elementFromPoint(x, y);
+    return !!hit && el.contains(hit);
+  };
+  const poll = () => {
+    const cell = document.querySelector(CELL);
+    if (cell && hittable(cell)) {
+      marks.interactive = performance.now();
+      return;
+    }
+    requestAnimationFrame(poll);
+  };
+  const check = () => {
+    const now = performance.now();
+    if (document.querySelector(LOADING)) {
+      if (marks.loadingShown === null) marks.loadingShown = now;
+      marks.loadingHidden = null;
+    } else if (marks.loadingShown !== null && marks.loadingHidden === null) {
+      marks.loadingHidden = now;
+    }
+    if (marks.firstCell === null && document.querySelector(CELL)) {
+      marks.firstCell = now;
+      requestAnimationFrame(() => {
+        marks.calendarPaint = performance.now();
+        poll();
+      });
+    }
+  };
+  new MutationObserver(check).observe(document, {childList: true, subtree: true});
+})();
+"""
+
+READY_JS = """
+() => {
+  const m = window.__harnessStartup;
+  return !!m && m.interactive !== null && (m.loadingShown === null || m.loadingHidden !== null);
+}
+"""
+
+READ_JS = """
+(mark) => {
+  const nav = performance.getEntriesByType('navigation')[0] || {};
+  const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+  const bundles = performance.getEntriesByType('resource')
+    .filter((r) => r.initiatorType === 'script' && r.name.includes(mark))
+    .map((r) => ({url: r.name, start: r.startTime, end: r.responseEnd, bytes: r.transferSize || 0,
+                  decoded: r.decodedBodySize || 0}));
+  return {
+    nav: {
+      ttfb: nav.responseStart, domContentLoaded: nav.domContentLoadedEventEnd, load: nav.loadEventEnd || null,
+    },
+    fcp: fcp ? fcp.startTime : null,
+    bundles,
+    marks: window.__harnessStartup,
+  };
+}
+"""
+
+
+@dataclass
+class Load:
+    mode: str
+    index: int
+    values: Dict[str, Optional[float]] = field(default_factory=dict)
+    bundle_bytes: int = 0
+    bundle_decoded: int = 0
+    error: Optional[str] = None
+
+
+def trace_costs(trace: Dict[str, Any], urls: Sequence[str]) -> Dict[str, float]:
+    """Compile and evaluation ms for the scripts in ``urls`` from a Chrome trace.
+
+    ``v8.compile`` can nest inside ``EvaluateScript``; nested compile time is
+    counted as compile only.
+    """
+    wanted = set(urls)
+    compiles, evals = [], []
+    for event in trace.get("traceEvents", []):
+        if event.get("ph") != "X" or "dur" not in event:
+            continue
+        data = (event.get("args") or {}).get("data") or {}
+        url = data.get("url") or data.get("fileName")
+        if url not in wanted:
+            continue
+        span = (event["ts"], event["ts"] + event["dur"])
+        if event.get("name") == "v8.compile":
+            compiles.append(span)
+        elif event.get("name") == "EvaluateScript":
+            evals.append(span)
+    compile_us = sum(end - start for start, end in compiles)
+    nested_us = sum(
+        end - start for start, end in compiles if any(s <= start and end <= e for s, e in evals)
+    )
+    eval_us = sum(end - start for start, end in evals) - nested_us
+    return {"bundle_compile": compile_us / 1000.0, "bundle_eval": eval_us / 1000.0}
+
+
+def _values(raw: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    nav, marks = raw["nav"], raw["marks"] or {}
+    bundles = raw["bundles"]
+    download = max(b["end"] for b in bundles) - min(b["start"] for b in bundles) if bundles else None
+    shown, hidden = marks.get("loadingShown"), marks.get("loadingHidden")
+    return {
+        "ttfb": nav["ttfb"],
+        "dom_content_loaded": nav["domContentLoaded"],
+        "load": nav["load"],
+        "fcp": raw["fcp"],
+        "bundle_download": download,
+        "loading_screen": hidden - shown if shown is not None and hidden is not None else None,
+        "loading_done": hidden,
+        "calendar_paint": marks.get("calendarPaint"),
+        "interactive": marks.get("interactive"),
+    }
+
+
+def observer_script() -> str:
+    """``OBSERVER_JS`` with the loading-screen and day-cell selectors filled in."""
+    return OBSERVER_JS % {
+        "loading": json.dumps(selector("app.loading")),
+        # The plain CSS: :nth-match() is Playwright-only.
+        "cell": json.dumps(REGISTRY["calendar.day"].css),
+    }
+
+
+async def measure(
+    browser: Any, context: Any, mode: str, index: int, url: str, trace: bool, timeout_s: float
+) -> Load:
+    load = Load(mode, index)
+    page = await context.new_page()
+    tracing = False
+    try:
+        if mode == "cold":
+            cdp = await context.new_cdp_session(page)
+            await cdp.send("Network.enable")
+            await cdp.send("Network.clearBrowserCache")
+            await cdp.send("Network.setCacheDisabled", {"cacheDisabled": True})
+        if trace:
+            await browser.start_tracing(page=page, categories=TRACE_CATEGORIES)
+            tracing = True
+        await page.goto(url, wait_until="commit", timeout=timeout_s * 1000)
+        await page.wait_for_function(READY_JS, timeout=timeout_s * 1000)
+        raw = await page.evaluate(READ_JS, BUNDLE_MARK)
+        load.values = _values(raw)
+        load.bundle_bytes = sum(b["bytes"] for b in raw["bundles"])
+        load.bundle_decoded = sum(b["decoded"] for b in raw["bundles"])
+        if tracing:
+            tracing = False
+            events = json.loads(await browser.stop_tracing())
+            load.values.update(trace_costs(events, [b["url"] for b in raw["bundles"]]))
+    except Exception as exc:
+        load.error = f"{type(exc).__name__}: {str(exc)[:120]}"
+    finally:
+        if tracing:
+            await browser.stop_tracing()
+        await page.close()
+    return load
+
+
+async def run(modes: Sequence[str], loads: int, url: str, trace: bool, timeout_s: float) -> List[Load]:
+    results: List[Load] = []
+    observer = observer_script()
+    async with session.browser_session(default_timeout_ms=timeout_s * 1000) as s:
+        await session.open_app(s.page, url)
+        await session.login(s.page, timeout_ms=timeout_s * 1000)
+        await s.context.add_init_script(observer)
+        for mode in modes:
+            if mode == "warm":
+                await measure(s.browser, s.context, mode, -1, url, False, timeout_s)
+            for i in range(loads):
+                results.append(await measure(s.browser, s.context, mode, i, url, trace, timeout_s))
+    return results
+
+
+def _stats(loads: Sequence[Load], key: str) -> List[Optional[float]]:
+    values = sorted(v for v in (load.values.get(key) for load in loads) if v is not None)
+    if not values:
+        return [None, None, None]
+    return [percentile(values, 0.5), percentile(values, 0.9), values[-1]]
+
+
+def report(results: Sequence[Load], modes: Sequence[str]) -> str:
+    header = "| Metric | Measured |" + "".join(f" {m} p50 | {m} p90 | {m} max |" for m in modes)
+    lines = [header, "|---|---|" + "---|---|---|" * len(modes)]
+    by_mode = {m: [r for r in results if r.mode == m and r.error is None] for m in modes}
+    for key, label, what in METRICS:
+        cells = [ms(v) for m in modes for v in _stats(by_mode[m], key)]
+        lines.append(f"| {label} | {what} | " + " | ".join(cells) + " |")
+    lines.append("")
+    for m in modes:
+        ok = by_mode[m]
+        sizes = sorted(r.bundle_bytes for r in ok)
+        decoded = max((r.bundle_decoded for r in ok), default=0)
+        transferred = f"{sizes[len(sizes) // 2] / 1024:,.0f} KiB" if sizes else "-"
+        lines.append(
+            f"* {m}: {len(ok)} loads, bundle {decoded / 1024:,.0f} KiB decoded,"
+            f" {transferred} transferred (median)"
+        )
+    errors = [f"{r.mode} #{r.index}: {r.error}" for r in results if r.error]
+    lines.extend(f"* {e}" for e in errors)
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.startup")
+    parser.add_argument("--loads", type=int, default=10, help="recorded loads per mode")
+    parser.add_argument("--modes", default=",".join(MODES), help="cold and/or warm")
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--no-trace", action="store_true", help="skip the CDP trace (no parse/eval timings)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds per load")
+    args = parser.parse_args(argv)
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    if not modes or any(m not in MODES for m in modes):
+        parser.error(f"--modes takes {', '.join(MODES)}")
+    if args.loads < 1:
+        parser.error("--loads must be positive")
+
+    results = asyncio.run(run(modes, args.loads, args.url, not args.no_trace, args.timeout))
+    sys.stdout.write(report(results, modes))
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""Zustand store snapshots and diffs computed inside the page.
+
+Development and test builds expose ``calendarStore``, ``filtersStore``,
+``masterDataStore`` and ``focusReferencesStore`` on
+``window.__appTestHooks`` (see ``src/utils/testHooks.ts``). The probe keeps a
+reference to each store's previous state in the page. Zustand updates are
+immutable, so an unchanged slice is the same object and diffing is mostly
+reference comparisons. Only the diff crosses the protocol: slice names,
+array counts (added/removed/changed by ``id``), changed object keys and
+approximate JSON sizes. The 2564-row master data never does.
+
+    probe = StoreProbe()
+    await probe.attach(context)
+    ...
+    await probe.step(page, "open app")         # baseline
+    await elem.click()
+    diff = await probe.step(page, "save entry")
+    diff.assert_changed({"calendarStore": {"entries", "lastSyncTimestamp"}})
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+from .app_metrics import TEST_HOOKS_JS
+
+STORES = ("calendarStore", "filtersStore", "masterDataStore", "focusReferencesStore")
+
+# Keys reported per changed array, enough to see what moved.
+SAMPLE = 10
+
+PROBE_JS = """
+(sample) => {
+  const sizeOf = (v) => { try { return JSON.stringify(v).length; } catch (e) { return 0; } };
+  const isPlain = (v) => v !== null && typeof v === 'object' && !Array.isArray(v) && !(v instanceof Date);
+  const keyOf = (item, i) => {
+    if (item !== null && typeof item === 'object') {
+      const k = item.id !== undefined ? item.id : item.codice !== undefined ? item.codice : item.code;
+      if (k !== undefined) return k;
+    }
+    return i;
+  };
+  const small = (v) => {
+    if (v instanceof Date) return v.toISOString();
+    if (v === null || typeof v !== 'object') return v;
+    return Array.isArray(v) ? `[${v.length}]` : `{${Object.keys(v).length}}`;
+  };
+  const diffArray = (a, b) => {
+    const before = new Map();
+    a.forEach((x, i) => before.set(keyOf(x, i), x));
+    let added = 0, changed = 0, bytes = 0, kept = 0;
+    const keys = [];
+    b.forEach((x, i) => {
+      const k = keyOf(x, i);
+      if (!before.has(k)) added++;
+      else if (before.get(k) !== x) changed++;
+      else { kept++; return; }
+      bytes += sizeOf(x);
+      if (keys.length < sample) keys.push(String(k));
+    });
+    return {added, changed, removed: a.length - kept - changed, bytes, keys};
+  };
+  const diffValue = (a, b) => {
+    if (Array.isArray(a) && Array.isArray(b)) {
+      return {kind: 'array', from: a.length, to: b.length, ...diffArray(a, b)};
+    }
+    if (isPlain(a) && isPlain(b)) {
+      const keys = [...new Set([...Object.keys(a), ...Object.keys(b)])].filter((k) => a[k] !== b[k]);
+      return {kind: 'object', keys, bytes: keys.reduce((n, k) => n + sizeOf(b[k]), 0)};
+    }
+    if (a instanceof Date && b instanceof Date && a.getTime() === b.getTime()) return null;
+    return {kind: 'value', from: small(a), to: small(b), bytes: sizeOf(b)};
+  };
+  const shape = (state) => {
+    const out = {};
+    for (const [k, v] of Object.entries(state)) {
+      if (typeof v === 'function') continue;
+      out[k] = Array.isArray(v) ? {type: 'array', len: v.length}
+        : isPlain(v) ? {type: 'object', len: Object.keys(v).length}
+        : {type: v === null ? 'null' : v instanceof Date ? 'date' : typeof v};
+    }
+    return out;
+  };
+
+  window.__harnessStoreProbe = {
+    prev: {},
+    updates: {},
+    subscribed: new Set(),
+    stores() {
+      const hooks = window.__appTestHooks || {};
+      return Object.keys(hooks).filter((k) => hooks[k] && typeof hooks[k].getState === 'function');
+    },
+    step(names) {
+      const hooks = window.__appTestHooks || {};
+      const out = {};
+      for (const name of names) {
+        const store = hooks[name];
+        if (!store) continue;
+        if (!this.subscribed.has(name)) {
+          this.subscribed.add(name);
+          this.updates[name] = 0;
+          store.subscribe(() => { this.updates[name]++; });
+        }
+        const state = store.getState();
+        const prev = this.prev[name];
+        const slices = {};
+        if (prev && prev !== state) {
+          for (const k of new Set([...Object.keys(prev), ...Object.keys(state)])) {
+            if (typeof state[k] === 'function' || prev[k] === state[k]) continue;
+            const d = diffValue(prev[k], state[k]);
+            if (d) slices[k] = d;
+          }
+        }
+        out[name] = {baseline: !prev, updates: this.updates[name], slices};
+        this.prev[name] = state;
+        this.updates[name] = 0;
+      }
+      return out;
+    },
+    shape(names) {
+      const hooks = window.__appTestHooks || {};
+      const out = {};
+      for (const name of names) if (hooks[name]) out[name] = shape(hooks[name].getState());
+      return out;
+    },
+  };
+}
+"""
+
+STEP_JS = """
+([probeJs, sample, names]) => {
+  if (!window.__appTestHooks) return null;
+  if (!window.__harnessStoreProbe) (0, eval)(probeJs)(sample);
+  return window.__harnessStoreProbe.step(names);
+}
+"""
+
+SHAPE_JS = """
+(names) => window.__appTestHooks && window.__harnessStoreProbe
+  ? window.__harnessStoreProbe.shape(names) : null
+"""
+
+
+@dataclass
+class SliceDiff:
+    store: str
+    slice: str
+    kind: str
+    # Approximate JSON size of what changed.
+    bytes: int = 0
+    # Arrays, matched by id/codice/code or position.
+    before_len: Optional[int] = None
+    after_len: Optional[int] = None
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    keys: List[str] = field(default_factory=list)
+    # Primitive values, or a "[n]" / "{n}" placeholder.
+    before: Any = None
+    after: Any = None
+
+    @property
+    def wasted(self) -> bool:
+        """A new array with exactly the same elements: a re-render for nothing."""
+        return self.kind == "array" and not (self.added or self.removed or self.changed)
+
+
+@dataclass
+class StoreDiff:
+    label: str
+    # set() calls seen per store since the previous step.
+    updates: Dict[str, int] = field(default_factory=dict)
+    slices: List[SliceDiff] = field(default_factory=list)
+    # Stores seen for the first time: no diff yet.
+    baseline: Set[str] = field(default_factory=set)
+
+    def changed(self) -> Dict[str, Set[str]]:
+        out: Dict[str, Set[str]] = {}
+        for s in self.slices:
+            out.setdefault(s.store, set()).add(s.slice)
+        return out
+
+    def get(self, store: str, slice: str) -> Optional[SliceDiff]:
+        return next((s for s in self.slices if s.store == store and s.slice == slice), None)
+
+    @property
+    def bytes(self) -> int:
+        return sum(s.bytes for s in self.slices)
+
+    def assert_changed(self, expected: Mapping[str, Iterable[str]]) -> None:
+        """Exactly these slices changed; stores not listed must not change."""
+        want = {store: set(slices) for store, slices in expected.items() if slices}
+        got = self.changed()
+        if got != want:
+            lines = []
+            for store in sorted(set(got) | set(want)):
+                extra = got.get(store, set()) - want.get(store, set())
+                missing = want.get(store, set()) - got.get(store, set())
+                if extra:
+                    lines.append(f"{store}: unexpected {', '.join(sorted(extra))}")
+                if missing:
+                    lines.append(f"{store}: unchanged {', '.join(sorted(missing))}")
+            raise AssertionError(f"store changes after {self.label!r} differ: " + "; ".join(lines))
+
+    def assert_unchanged(self, *stores: str) -> None:
+        touched = sorted(set(stores or self.changed()) & set(self.changed()))
+        if touched:
+            raise AssertionError(
+                f"stores changed after {self.label!r}: "
+                + "; ".join(f"{s}: {', '.join(sorted(self.changed()[s]))}" for s in touched)
+            )
+
+
+def _diff(label: str, raw: Dict[str, Any]) -> StoreDiff:
+    out = StoreDiff(label)
+    for store, d in raw.items():
+        out.updates[store] = d["updates"]
+        if d["baseline"]:
+            out.baseline.add(store)
+        for name, s in d["slices"].items():
+            out.slices.append(
+                SliceDiff(
+                    store,
+                    name,
+                    s["kind"],
+                    bytes=s.get("bytes", 0),
+                    before_len=s["from"] if s["kind"] == "array" else None,
+                    after_len=s["to"] if s["kind"] == "array" else None,
+                    added=s.get("added", 0),
+                    removed=s.get("removed", 0),
+                    changed=s.get("changed", 0),
+                    keys=list(s.get("keys", [])),
+                    before=s["from"] if s["kind"] == "value" else None,
+                    after=s["to"] if s["kind"] == "value" else None,
+                )
+            )
+    return out
+
+
+class StoreProbe:
+    def __init__(self, stores: Iterable[str] = STORES, sample: int = SAMPLE):
+        self.stores = tuple(stores)
+        self.sample = sample
+        self.history: List[StoreDiff] = []
+
+    async def attach(self, target: Any) -> "StoreProbe":
+        """Make sure the app exposes its stores; harmless under ``harness run``."""
+        await target.add_init_script(TEST_HOOKS_JS)
+        return self
+
+    async def step(self, page: Any, label: str) -> StoreDiff:
+        """Diff every store against the previous call; the first call is the baseline."""
+        raw = await page.evaluate(STEP_JS, [PROBE_JS, self.sample, list(self.stores)])
+        if raw is None:
+            raise RuntimeError("app test hooks not available; is this a dev or test build?")
+        diff = _diff(label, raw)
+        self.history.append(diff)
+        return diff
+
+    async def shape(self, page: Any) -> Dict[str, Dict[str, dict]]:
+        """Type and length of every data slice, e.g. ``{"masterDataStore": {"masterData": {...}}}``."""
+        return await page.evaluate(SHAPE_JS, list(self.stores)) or {}
+
+    def report(self) -> str:
+        lines = ["| Step | Store | Slice | Updates | Change | Bytes |", "|---|---|---|---|---|---|"]
+        for d in self.history:
+            for s in d.slices:
+                if s.kind == "array":
+                    change = f"{s.before_len}->{s.after_len} (+{s.added} -{s.removed} ~{s.changed})"
+                    if s.wasted:
+                        change += " new array, same items"
+                elif s.kind == "object":
+                    change = "keys " + ", ".join(s.keys)
+                else:
+                    change = f"{s.before!r} -> {s.after!r}"
+                lines.append(
+                    f"| {d.label} | {s.store} | {s.slice} | {d.updates.get(s.store, 0)} | {change} | {s.bytes} |"
+                )
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,14 @@
+"""Cells shared by the harness's Markdown report tables."""
+
+from typing import List, Optional
+
+from .timeouts import percentile
+
+
+def ms(value: Optional[float]) -> str:
+    """Milliseconds with thousands separators; ``-`` when not measured."""
+    return "-" if value is None else f"{value:,.0f}"
+
+
+def percentile_ms(values: List[float], q: float) -> str:
+    return ms(percentile(sorted(values), q) if values else None)
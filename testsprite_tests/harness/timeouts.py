@@ -0,0 +1,139 @@
+"""Per-step timeouts learned from observed durations.
+
+The generated scripts pass ``timeout=5000`` to every action and
+``timeout=10000`` to ``goto``. Here each step key (action + selector) gets
+its own budget: a high percentile of its passing durations, scaled and
+padded, clamped to a sane range. Steps with too little history keep the
+timeout the script asked for, and so do keys whose selector is only a type
+name (recorded before locators were keyed by their selector).
+"""
+
+import json
+import math
+import os
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import ENV_TIMEOUTS, STATE_DIR
+from .results import PASSED, ResultsStore, is_type_name
+
+TIMEOUTS_FILE = STATE_DIR / "timeouts.json"
+
+PERCENTILE = 0.99
+MULTIPLIER = 1.5
+MARGIN_MS = 250.0
+MIN_TIMEOUT_MS = 1000.0
+MAX_TIMEOUT_MS = 60000.0
+MIN_SAMPLES = 5
+# Only the most recent samples count, so a faster app lowers budgets too.
+WINDOW = 200
+
+# Actions whose Playwright signature takes a ``timeout`` keyword.
+TIMEOUT_ACTIONS = frozenset(
+    {
+        "click",
+        "dblclick",
+        "fill",
+        "type",
+        "press",
+        "check",
+        "uncheck",
+        "hover",
+        "select_option",
+        "set_input_files",
+        "wait_for",
+        "text_content",
+        "inner_text",
+        "goto",
+        "wait_for_load_state",
+        "reload",
+    }
+)
+
+
+@dataclass
+class StepTimeout:
+    step_key: str
+    samples: int
+    p50_ms: float
+    pct_ms: float
+    timeout_ms: float
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        raise ValueError("percentile of empty list")
+    rank = max(1, math.ceil(q * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def learn(
+    store: ResultsStore,
+    q: float = PERCENTILE,
+    multiplier: float = MULTIPLIER,
+    margin_ms: float = MARGIN_MS,
+    min_samples: int = MIN_SAMPLES,
+) -> Dict[str, StepTimeout]:
+    durations: Dict[str, List[float]] = defaultdict(list)
+    for row in store.step_rows():
+        if is_type_name(row["selector"]):
+            continue
+        if row["status"] == PASSED and row["action"] in TIMEOUT_ACTIONS:
+            durations[row["step_key"]].append(row["duration_ms"])
+
+    learned = {}
+    for key, values in durations.items():
+        values = sorted(values[-WINDOW:])
+        if len(values) < min_samples:
+            continue
+        pct = percentile(values, q)
+        timeout = min(max(pct * multiplier + margin_ms, MIN_TIMEOUT_MS), MAX_TIMEOUT_MS)
+        learned[key] = StepTimeout(
+            key, len(values), percentile(values, 0.5), pct, round(timeout)
+        )
+    return learned
+
+
+def save(learned: Dict[str, StepTimeout], path: Path = TIMEOUTS_FILE) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({k: asdict(v) for k, v in learned.items()}, fh, indent=1)
+    return path
+
+
+class TimeoutTable:
+    """Lookup used inside the test process by :mod:`harness.instrument`."""
+
+    def __init__(self, table: Optional[Dict[str, float]] = None):
+        self.table = table or {}
+
+    @classmethod
+    def from_env(cls) -> "TimeoutTable":
+        path = os.environ.get(ENV_TIMEOUTS)
+        if not path:
+            return cls()
+        try:
+            with open(path, encoding="utf-8") as fh:
+                raw = json.load(fh)
+        except (OSError, ValueError):
+            return cls()
+        return cls({k: v["timeout_ms"] for k, v in raw.items()})
+
+    def get(self, action: str, step_key: str) -> Optional[float]:
+        if action not in TIMEOUT_ACTIONS or is_type_name(step_key.partition(":")[2]):
+            return None
+        return self.table.get(step_key)
+
+
+def report(learned: Dict[str, StepTimeout], limit: int = 50) -> str:
+    rows = sorted(learned.values(), key=lambda t: t.timeout_ms, reverse=True)
+    lines = ["| Step | Samples | p50 ms | High pct ms | Timeout ms |", "|---|---|---|---|---|"]
+    for t in rows[:limit]:
+        lines.append(
+            f"| `{t.step_key}` | {t.samples} | {t.p50_ms:.0f} | {t.pct_ms:.0f}"
+            f" | {t.timeout_ms:.0f} |"
+        )
+    return "\n".join(lines) + "\n"